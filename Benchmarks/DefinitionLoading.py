@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+import os
+import sys
+import time
+
+FlowGeneratorPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FlowGenerator")
+sys.path.insert(0, FlowGeneratorPath)
+from Sources import DefinitionLoader
+
+
+# Builds a platform as FlowGenerator.py previously did (reading and exec'ing every script into a shared namespace)
+def legacyLoad(SetupScript, AppScript, AllocScript, ReferenceClock=100):
+
+    ScriptGlobals = {"ReferenceClock": ReferenceClock}
+
+    for ScriptPath in ("Setups/" + SetupScript, "Applications/" + AppScript, "AllocationMaps/" + AllocScript):
+        with open(os.path.join(FlowGeneratorPath, ScriptPath + ".py")) as Script:
+            exec(Script.read(), ScriptGlobals)
+
+    Setup = ScriptGlobals["Setup"]
+    for Application in ScriptGlobals["Applications"]:
+        Setup.addApplication(Application)
+    Setup.setAllocationMap(ScriptGlobals["AllocationMap"])
+
+    return Setup
+
+
+def loaderLoad(SetupScript, AppScript, AllocScript, ReferenceClock=100):
+    return DefinitionLoader.loadFlow(SetupScript, AppScript, AllocScript, ReferenceClock, Root=FlowGeneratorPath)[0]
+
+
+# Times loading given flow Repeats times in the same process with both loaders, returns a list of result rows
+def benchmark(SetupScript="H33_100", AppScript="PIP", AllocScript="PIP_default", Repeats=200):
+
+    Results = []
+
+    for LoaderName, load in (("exec", legacyLoad), ("loader", loaderLoad)):
+
+        startTime = time.perf_counter()
+        for r in range(Repeats):
+            Setup = load(SetupScript, AppScript, AllocScript)
+        elapsedTime = time.perf_counter() - startTime
+
+        Results.append({"Benchmark": "DefinitionLoading", "Loader": LoaderName, "Setup": SetupScript,
+                        "AmountOfPEs": Setup.AmountOfPEs, "Repeats": Repeats, "Seconds": elapsedTime / Repeats})
+
+    return Results
+
+
+# Expects as (optional) arguments: $1 = setup script ; $2 = application script ; $3 = allocation map script
+def main():
+
+    Results = benchmark(*sys.argv[1:4])
+
+    print("\n\tPlatform loading (" + Results[0]["Setup"] + ", " + str(Results[0]["AmountOfPEs"]) + " PEs, " +
+          str(Results[0]["Repeats"]) + " loads)")
+    for Row in Results:
+        print(Row["Loader"].ljust(9) + "{:12.1f}".format(Row["Seconds"] * 1e6) + " us per load")
+
+    print("\nLoader is " + "{:.1f}".format(Results[0]["Seconds"] / Results[1]["Seconds"]) + "x faster")
+    print("")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FlowGenerator"))
+from Sources import LoadEstimator
+from ThreadMapping import makeSyntheticProblem
+
+
+# Times analytical load estimation of synthetic square platforms, returns a list of result rows
+def benchmark(Dimensions, AmountOfTargets=4):
+
+    Results = []
+
+    for Dimension in Dimensions:
+
+        Setup, Synthetic = makeSyntheticProblem(Dimension, Dimension * Dimension, AmountOfTargets)
+        Setup.setAllocationMap({i: Thread for i, Thread in enumerate(Synthetic.Threads)})
+        Setup.mapToPlatform(Seed=0)
+
+        startTime = time.perf_counter()
+        Estimator = LoadEstimator.LoadEstimator(Setup).estimate()
+        Estimate = Estimator.toDict()
+        elapsedTime = time.perf_counter() - startTime
+
+        Results.append({"Benchmark": "LoadEstimation", "AmountOfPEs": Dimension * Dimension,
+                        "AmountOfFlows": len(Estimate["Flows"]), "AmountOfLinks": len(Estimate["Links"]),
+                        "MaxUtilization": Estimate["Links"][0]["Utilization"], "Seconds": elapsedTime})
+
+    return Results
+
+
+# Expects as (optional) arguments: $1 = amount of targets per thread
+def main():
+
+    AmountOfTargets = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    Results = benchmark([8, 16, 32], AmountOfTargets=AmountOfTargets)
+
+    print("\n\tAnalytical load estimation (" + str(AmountOfTargets) + " targets per thread)")
+    for Row in Results:
+        print(str(Row["AmountOfPEs"]).rjust(6) + " PEs " + str(Row["AmountOfFlows"]).rjust(7) + " flows " +
+              str(Row["AmountOfLinks"]).rjust(7) + " links " + "{:8.1f}".format(Row["MaxUtilization"] * 100) +
+              " % busiest link " + "{:9.1f}".format(Row["Seconds"] * 1000) + " ms")
+    print("")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LogParser"))
+import LogParser
+
+
+# Writes InLog<i>.txt and OutLog<i>.txt files of a synthetic run at given path, with ~1% of the messages never reaching
+# their target. Out logs are ordered by output timestamp and In logs by input timestamp, as written by a simulation.
+# Returns the amount of lines written
+def writeSyntheticLogFiles(Path, AmountOfPEs, AmountOfMessages, Seed=0, DropRate=0.01):
+
+    rng = random.Random(Seed)
+
+    InEntries = [[] for i in range(AmountOfPEs)]
+    OutLines = [[] for i in range(AmountOfPEs)]
+    Clocks = [0 for i in range(AmountOfPEs)]
+
+    for i in range(AmountOfMessages):
+
+        source = rng.randrange(AmountOfPEs)
+        target = rng.randrange(AmountOfPEs)
+        Clocks[source] += rng.randint(1, 300)
+        outputTimestamp = Clocks[source]
+
+        OutLines[source].append(str(target) + " " + str(source) + " 126 " + str(outputTimestamp) + "\n")
+
+        if rng.random() >= DropRate:
+            InEntries[target].append((outputTimestamp + rng.randint(20, 2000), source, outputTimestamp))
+
+    for i in range(AmountOfPEs):
+
+        with open(os.path.join(Path, LogParser.getLogFileName("OutLog", i)), 'w') as OutLogFile:
+            OutLogFile.writelines(OutLines[i])
+
+        with open(os.path.join(Path, LogParser.getLogFileName("InLog", i)), 'w') as InLogFile:
+            InLogFile.writelines(str(i) + " " + str(source) + " 126 " + str(outputTimestamp) + " " +
+                                 str(inputTimestamp) + "\n" for inputTimestamp, source, outputTimestamp in
+                                 sorted(InEntries[i]))
+
+    return AmountOfMessages + sum(len(Entries) for Entries in InEntries)
+
+
+# Matches logs of the working directory one In log shard at a time, as the default back end of LogParser.main does
+def matchShards(amountOfPEs, Statistics):
+
+    OutEntries = [[] for i in range(amountOfPEs)]
+    for i in range(amountOfPEs):
+        for target, Entries in LogParser.loadOutLogShard(i).items():
+            OutEntries[target].extend(Entries)
+
+    for target in range(amountOfPEs):
+        for src, tgt, hits, misses, avgLatency, Distribution in LogParser.matchInLogShard(target, OutEntries[target]):
+            Statistics.addFlow(src, tgt, hits, misses, avgLatency, Distribution)
+
+
+# Matches logs of the working directory on a pool of processes
+def matchInParallel(amountOfPEs, Statistics):
+    LogParser.matchLogsInParallel(amountOfPEs, Statistics, min(4, os.cpu_count() or 1))
+
+
+# Matches logs of the working directory with NumPy arrays
+def matchColumns(amountOfPEs, Statistics):
+
+    import ColumnarLogs
+
+    InLog, OutLog = ColumnarLogs.loadLogs(amountOfPEs)
+    for src, tgt, hits, misses, avgLatency, Distribution in zip(*ColumnarLogs.computeFlowStatistics(
+            amountOfPEs, InLog, OutLog, Statistics.histogramWidth)):
+        Statistics.addFlow(int(src), int(tgt), int(hits), int(misses), float(avgLatency), Distribution)
+
+
+# Times every LogParser back end (reading and matching log files) for every amount of messages, returns a list of
+# result rows. The columnar back end is skipped if NumPy is not installed
+def benchmark(Sizes, AmountOfPEs=64):
+
+    Backends = [("shards", matchShards), ("stream", LogParser.streamLogs), ("parallel", matchInParallel)]
+
+    try:
+        import numpy
+        Backends.append(("columnar", matchColumns))
+    except ImportError:
+        pass
+
+    Results = []
+    WorkingDirectory = os.getcwd()
+
+    for AmountOfMessages in Sizes:
+
+        with tempfile.TemporaryDirectory() as LogPath:
+
+            AmountOfLines = writeSyntheticLogFiles(LogPath, AmountOfPEs, AmountOfMessages)
+
+            # Log file names are relative to the working directory, as for LogParser.main
+            os.chdir(LogPath)
+
+            try:
+
+                for BackendName, match in Backends:
+
+                    Statistics = LogParser.PlatformStatistics()
+
+                    startTime = time.perf_counter()
+                    match(AmountOfPEs, Statistics)
+                    elapsedTime = time.perf_counter() - startTime
+
+                    Results.append({"Benchmark": "LogFileMatching", "Backend": BackendName, "AmountOfPEs": AmountOfPEs,
+                                    "AmountOfLines": AmountOfLines, "Seconds": elapsedTime,
+                                    "Hits": sum(Flow.hitCount for Flow in Statistics.Flows.values()),
+                                    "NanosecondsPerLine": (elapsedTime * 1e9) / AmountOfLines})
+
+            finally:
+                os.chdir(WorkingDirectory)
+
+    return Results
+
+
+# Expects as (optional) arguments: $1 = amount of messages ; $2 = amount of PEs
+def main():
+
+    AmountOfMessages = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    AmountOfPEs = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    Results = benchmark([AmountOfMessages // 4, AmountOfMessages], AmountOfPEs=AmountOfPEs)
+
+    print("\n\tLog file matching (" + str(AmountOfPEs) + " PEs)")
+    for Row in Results:
+        print(Row["Backend"].ljust(9) + str(Row["AmountOfLines"]).rjust(9) + " lines " +
+              "{:10.3f}".format(Row["Seconds"]) + " s " + "{:10.1f}".format(Row["NanosecondsPerLine"]) + " ns/line")
+    print("")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
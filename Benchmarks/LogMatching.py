@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LogParser"))
+import LogParser
+
+
+# Builds In and Out Log objects for a synthetic run, with ~1% of the messages never reaching their target
+def makeSyntheticLogs(AmountOfPEs, AmountOfMessages, Seed=0, DropRate=0.01):
+
+    rng = random.Random(Seed)
+
+    InLogs = [LogParser.Log("Input") for i in range(AmountOfPEs)]
+    OutLogs = [LogParser.Log("Output") for i in range(AmountOfPEs)]
+    Clocks = [0 for i in range(AmountOfPEs)]
+
+    for i in range(AmountOfMessages):
+
+        source = rng.randrange(AmountOfPEs)
+        target = rng.randrange(AmountOfPEs)
+        Clocks[source] += rng.randint(1, 300)
+        outputTimestamp = Clocks[source]
+
+        OutLogs[source].addEntry(LogParser.Message(str(target) + " " + str(source) + " 126 " + str(outputTimestamp)))
+
+        if rng.random() >= DropRate:
+            inputTimestamp = outputTimestamp + rng.randint(20, 2000)
+            InLogs[target].addEntry(LogParser.Message(str(target) + " " + str(source) + " 126 " + str(outputTimestamp) + " " + str(inputTimestamp)))
+
+    return InLogs, OutLogs
+
+
+# Nested scan previously used by LogParser.main (every Out log entry is compared to every entry of its target In log)
+def legacyMatch(InLogs, OutLogs):
+
+    hits = 0
+    misses = 0
+
+    for currentOutLog in OutLogs:
+
+        for currentOutEntry in currentOutLog.Entries:
+
+            for currentInEntry in InLogs[currentOutEntry.TargetID].Entries:
+
+                if currentOutEntry == currentInEntry:
+                    hits += 1
+                    break
+
+            else:
+                misses += 1
+
+    return hits, misses
+
+
+# Hash join used by LogParser.main (In logs are indexed once, each Out log entry is a single lookup)
+def indexedMatch(InLogs, OutLogs):
+
+    hits = 0
+    misses = 0
+
+    InLogIndexes = [LogParser.InLogIndex() for i in range(len(InLogs))]
+    for i in range(len(InLogs)):
+        InLogIndexes[i].addLog(InLogs[i])
+
+    for currentOutLog in OutLogs:
+
+        for currentOutEntry in currentOutLog.Entries:
+
+            if InLogIndexes[currentOutEntry.TargetID].popMatch(currentOutEntry) is not None:
+                hits += 1
+            else:
+                misses += 1
+
+    return hits, misses
+
+
+# Times given matcher for every log size, returns a list of result rows
+def benchmark(Sizes, AmountOfPEs=16, Repeats=3, IncludeLegacy=False):
+
+    Matchers = [("indexed", indexedMatch)]
+    if IncludeLegacy:
+        Matchers.append(("legacy", legacyMatch))
+
+    Results = []
+
+    for AmountOfMessages in Sizes:
+
+        InLogs, OutLogs = makeSyntheticLogs(AmountOfPEs, AmountOfMessages)
+        AmountOfLines = sum(len(Log.Entries) for Log in InLogs) + sum(len(Log.Entries) for Log in OutLogs)
+
+        for MatcherName, Matcher in Matchers:
+
+            bestTime = None
+            for r in range(Repeats):
+                startTime = time.perf_counter()
+                hits, misses = Matcher(InLogs, OutLogs)
+                elapsedTime = time.perf_counter() - startTime
+                bestTime = elapsedTime if bestTime is None else min(bestTime, elapsedTime)
+
+            Results.append({"Benchmark": "LogMatching", "Matcher": MatcherName, "AmountOfPEs": AmountOfPEs,
+                            "AmountOfLines": AmountOfLines, "Hits": hits, "Misses": misses, "Seconds": bestTime,
+                            "NanosecondsPerLine": (bestTime * 1e9) / AmountOfLines})
+
+    return Results
+
+
+# Expects as (optional) arguments: $1 = amount of PEs ; $2 = "legacy" to also time the nested scan
+def main():
+
+    AmountOfPEs = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    IncludeLegacy = len(sys.argv) > 2 and sys.argv[2] == "legacy"
+
+    # The nested scan is quadratic, so it is only timed on the smaller sizes
+    Results = benchmark([50000, 100000, 200000, 400000, 800000], AmountOfPEs=AmountOfPEs)
+    if IncludeLegacy:
+        Results += benchmark([5000, 10000, 20000], AmountOfPEs=AmountOfPEs, Repeats=1, IncludeLegacy=True)[1::2]
+
+    print("\n\tLog matching (" + str(AmountOfPEs) + " PEs)")
+    for Row in Results:
+        print(Row["Matcher"].ljust(8) + str(Row["AmountOfLines"]).rjust(9) + " lines " +
+              "{:10.4f}".format(Row["Seconds"]) + " s " + "{:10.1f}".format(Row["NanosecondsPerLine"]) + " ns/line")
+
+    # A linear matcher keeps a constant cost per line as the logs grow
+    Indexed = [Row for Row in Results if Row["Matcher"] == "indexed"]
+    print("\nCost per line growth (largest/smallest log, indexed): " +
+          "{:.2f}".format(Indexed[-1]["NanosecondsPerLine"] / Indexed[0]["NanosecondsPerLine"]) + "x")
+    print("")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+import os
+import sys
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FlowGenerator"))
+from Sources import PlatformComposer, AppComposer
+
+
+# Returns a copy of a slotted class whose objects keep their attributes in a per-object dict, as they previously did
+def unslotted(SlottedClass):
+
+    Namespace = {name: value for name, value in SlottedClass.__dict__.items()
+                 if name != "__slots__" and name not in SlottedClass.__slots__}
+
+    return type(SlottedClass.__name__, SlottedClass.__bases__, Namespace)
+
+
+# Returns ( PE, Injector, Application, Thread, Target ) classes, either slotted or dict-backed
+def getModelClasses(Slotted):
+
+    Classes = (PlatformComposer.PE, PlatformComposer.Injector, AppComposer.Application, AppComposer.Thread,
+               AppComposer.Target)
+
+    return Classes if Slotted else tuple(unslotted(Class) for Class in Classes)
+
+
+# Builds every model object of a synthetic platform with AmountOfPEs PEs, each thread sending to AmountOfTargets random
+# threads. Returns the objects, so they stay alive while memory is measured
+def makeModelObjects(Classes, AmountOfPEs, AmountOfTargets, Seed=0):
+
+    PE, Injector, Application, Thread, Target = Classes
+    rng = random.Random(Seed)
+
+    # Injector.__init__ looks target PEs up through the platform of each thread's application
+    Setup = PlatformComposer.Platform((1, 1), ReferenceClock=100)
+    Synthetic = Application(AppName="Synthetic")
+    Synthetic.AppID = 0
+    Synthetic.ParentPlatform = Setup
+
+    Threads = [Thread() for i in range(AmountOfPEs)]
+    for i, NewThread in enumerate(Threads):
+        NewThread.ThreadID = i
+        NewThread.ParentApplication = Synthetic
+        Synthetic.Threads.append(NewThread)
+
+    for NewThread in Threads:
+        for TargetThread in rng.sample(Threads, AmountOfTargets):
+            NewThread.addTarget(Target(TargetThread=TargetThread, Bandwidth=rng.randint(32, 64)))
+
+    Setup.AllocationMap = {i: NewThread for i, NewThread in enumerate(Threads)}
+    Setup.indexAllocationMap()
+
+    PEs = [PE(PEPos=i, AppID=0, ThreadID=i, InjectorClockPeriod=100) for i in range(AmountOfPEs)]
+    Injectors = [Injector(PEPos=i, Thread=Threads[i], InjectorClockPeriod=100) for i in range(AmountOfPEs)]
+
+    return Synthetic, PEs, Injectors
+
+
+# Measures memory taken by model objects with and without slots, returns a list of result rows
+def benchmark(Sizes, AmountOfTargets=4):
+
+    Results = []
+
+    for AmountOfPEs in Sizes:
+
+        for ModelName, Slotted in (("dict", False), ("slots", True)):
+
+            Classes = getModelClasses(Slotted)
+
+            tracemalloc.start()
+            Objects = makeModelObjects(Classes, AmountOfPEs, AmountOfTargets)
+            totalMemory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            # Size of the bare objects (attribute values, shared by both models, are left out)
+            Synthetic, PEs, Injectors = Objects
+            ObjectSizes = {
+                "PE": objectSize(PEs[0]),
+                "Injector": objectSize(Injectors[0]),
+                "Thread": objectSize(Synthetic.Threads[0]),
+                "Target": objectSize(Synthetic.Threads[0].Targets[0])
+            }
+
+            Results.append({"Benchmark": "ModelFootprint", "Model": ModelName, "AmountOfPEs": AmountOfPEs,
+                            "AmountOfTargets": AmountOfTargets, "TotalBytes": totalMemory,
+                            "BytesPerPE": totalMemory / AmountOfPEs, "ObjectBytes": ObjectSizes})
+
+            del Objects, Synthetic, PEs, Injectors
+
+    return Results
+
+
+# Returns size of an object, including its attribute dict if it has one
+def objectSize(Object):
+
+    size = sys.getsizeof(Object)
+
+    if hasattr(Object, "__dict__"):
+        size += sys.getsizeof(Object.__dict__)
+
+    return size
+
+
+# Expects as (optional) arguments: $1 = amount of targets per thread
+def main():
+
+    AmountOfTargets = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    Results = benchmark([1000, 10000, 40000], AmountOfTargets=AmountOfTargets)
+
+    print("\n\tModel object footprint (" + str(AmountOfTargets) + " targets per thread)")
+    for Row in Results:
+        print(Row["Model"].ljust(6) + str(Row["AmountOfPEs"]).rjust(7) + " PEs " +
+              "{:9.2f}".format(Row["TotalBytes"] / (1 << 20)) + " MB " +
+              "{:9.1f}".format(Row["BytesPerPE"]) + " B/PE   " +
+              "  ".join(name + " " + str(size) + " B" for name, size in Row["ObjectBytes"].items()))
+
+    Dict, Slots = Results[-2], Results[-1]
+    print("\nLargest platform: " + "{:.1f}".format(100 * (1 - Slots["TotalBytes"] / Dict["TotalBytes"])) +
+          "% less memory with slots")
+    print("")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+import os
+import sys
+import math
+import time
+import random
+
+FlowGeneratorPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FlowGenerator")
+sys.path.insert(0, FlowGeneratorPath)
+from Sources import PlatformComposer
+
+
+# Platform updating every PEPos value each time a structure is added, with the walk previously used by
+# Platform.updatePEAddresses (addresses of every setup are checked by FlowGenerator/Tests/test_PEAddressing.py)
+class LegacyPlatform(PlatformComposer.Platform):
+
+    def addStructure(self, NewStructure, WrapperLocationInBaseNoc: tuple):
+
+        PlatformComposer.Platform.addStructure(self, NewStructure, WrapperLocationInBaseNoc)
+        self.legacyUpdatePEAddresses()
+        self.AddressesOutdated = False
+
+    def legacyUpdatePEAddresses(self):
+
+        SquareNoCBound = math.ceil(math.sqrt(self.AmountOfPEs))
+
+        # Set NoC 1st of wrapper PE addresses
+        x_base = 0
+        y_base = 0
+        for i in range(self.BaseNoCDimensions[0] * self.BaseNoCDimensions[1]):
+
+            PEPos = (y_base * SquareNoCBound) + x_base
+            self._WrapperAddresses[PEPos] = (y_base * self.BaseNoCDimensions[0]) + x_base
+
+            if isinstance(self.BaseNoC[x_base][y_base], PlatformComposer.PE):
+
+                self.BaseNoC[x_base][y_base].PEPos = PEPos
+                self._PEs[PEPos] = self.BaseNoC[x_base][y_base]
+
+            elif isinstance(self.BaseNoC[x_base][y_base], PlatformComposer.Structure):
+
+                self.BaseNoC[x_base][y_base].PEs[0].PEPos = PEPos
+                self._PEs[PEPos] = self.BaseNoC[x_base][y_base].PEs[0]
+
+            if x_base == self.BaseNoCDimensions[0] - 1:
+                x_base = 0
+                y_base += 1
+            else:
+                x_base += 1
+
+        # Set Remaining PEs on wrapper
+        x_base = 0
+        y_base = 0
+        x_square = 0
+        y_square = self.BaseNoCDimensions[1]
+        x_square_limit = self.BaseNoCDimensions[0]
+        y_square_limit = self.BaseNoCDimensions[1]
+        for i in range(self.BaseNoCDimensions[0] * self.BaseNoCDimensions[1]):
+
+            if isinstance(self.BaseNoC[x_base][y_base], PlatformComposer.Structure):
+
+                for j in range(len(self.BaseNoC[x_base][y_base].PEs) - 1):
+
+                    PEPos = (y_square * SquareNoCBound) + x_square
+                    self.BaseNoC[x_base][y_base].PEs[j + 1].PEPos = PEPos
+                    self._WrapperAddresses[PEPos] = (y_base * self.BaseNoCDimensions[0]) + x_base
+                    self._PEs[PEPos] = self.BaseNoC[x_base][y_base].PEs[j + 1]
+
+                    if x_square == x_square_limit and y_square == 0:
+                        x_square = 0
+                        x_square_limit += 1
+                        y_square_limit += 1
+                        y_square = y_square_limit
+                    elif x_square < x_square_limit:
+                        x_square += 1
+                    elif y_square > 0:
+                        y_square -= 1
+
+            if x_base == self.BaseNoCDimensions[0] - 1:
+                x_base = 0
+                y_base += 1
+            else:
+                x_base += 1
+
+
+# Builds a platform with given structures, reading its PEs so addresses are set
+def buildPlatform(PlatformClass, BaseNoCDimensions, Structures):
+
+    Setup = PlatformClass(BaseNoCDimensions, ReferenceClock=100)
+
+    for StructureType, AmountOfPEs, WrapperLocation in Structures:
+        NewStructure = PlatformComposer.Bus(AmountOfPEs) if StructureType == "Bus" else \
+            PlatformComposer.Crossbar(AmountOfPEs)
+        Setup.addStructure(NewStructure=NewStructure, WrapperLocationInBaseNoc=WrapperLocation)
+
+    Setup.PEs
+
+    return Setup
+
+
+# Returns structures of a synthetic Dimension x Dimension base NoC with AmountOfWrappers buses and crossbars
+def makeSyntheticStructures(Dimension, AmountOfWrappers, Seed=0):
+
+    rng = random.Random(Seed)
+    Locations = rng.sample([(x, y) for y in range(Dimension) for x in range(Dimension)], AmountOfWrappers)
+
+    return [(rng.choice(("Bus", "Crossbar")), rng.randint(3, 15), Location) for Location in Locations]
+
+
+# Times lazy addressing and the legacy walk on a synthetic platform. Returns a list of result rows
+def benchmark(Dimension=16, AmountOfWrappers=48, Repeats=5):
+
+    Structures = makeSyntheticStructures(Dimension, AmountOfWrappers)
+    Results = []
+
+    for AddressingName, PlatformClass in (("eager", LegacyPlatform), ("lazy", PlatformComposer.Platform)):
+
+        bestTime = None
+        for r in range(Repeats):
+            startTime = time.perf_counter()
+            Setup = buildPlatform(PlatformClass, (Dimension, Dimension), Structures)
+            elapsedTime = time.perf_counter() - startTime
+            bestTime = elapsedTime if bestTime is None else min(bestTime, elapsedTime)
+
+        Results.append({"Benchmark": "PEAddressing", "Addressing": AddressingName, "AmountOfPEs": Setup.AmountOfPEs,
+                        "AmountOfWrappers": AmountOfWrappers, "Seconds": bestTime})
+
+    return Results
+
+
+# Expects as (optional) arguments: $1 = base NoC dimension ; $2 = amount of wrappers
+def main():
+
+    Dimension = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    AmountOfWrappers = int(sys.argv[2]) if len(sys.argv) > 2 else 48
+    Results = benchmark(Dimension, AmountOfWrappers)
+
+    print("\n\tPlatform build (" + str(Dimension) + "x" + str(Dimension) + " base NoC, " + str(AmountOfWrappers) +
+          " wrappers, " + str(Results[0]["AmountOfPEs"]) + " PEs)")
+    for Row in Results:
+        print(Row["Addressing"].ljust(9) + "{:12.2f}".format(Row["Seconds"] * 1e3) + " ms")
+
+    print("\nLazy addressing is " + "{:.0f}".format(Results[0]["Seconds"] / Results[1]["Seconds"]) + "x faster")
+    print("")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FlowGenerator"))
+from Sources import PlatformComposer, AppComposer
+
+
+# Builds a square platform running a single application, each thread sending to AmountOfTargets random threads
+def makeSyntheticPlatform(Dimension, AmountOfTargets, Seed=0):
+
+    rng = random.Random(Seed)
+
+    Setup = PlatformComposer.Platform((Dimension, Dimension), ReferenceClock=100)
+    Synthetic = AppComposer.Application(AppName="Synthetic")
+
+    Threads = [AppComposer.Thread() for i in range(Dimension * Dimension)]
+    for Thread in Threads:
+        Synthetic.addThread(Thread)
+
+    for Thread in Threads:
+        for TargetThread in rng.sample(Threads, AmountOfTargets):
+            Thread.addTarget(AppComposer.Target(TargetThread=TargetThread, Bandwidth=rng.randint(1, 8)))
+
+    Setup.addApplication(Synthetic)
+    Setup.setAllocationMap({i: Thread for i, Thread in enumerate(Threads)})
+
+    return Setup
+
+
+# Payload lists previously built by Injector.__init__ (one list of flags per target)
+def legacyPayloads(Injector):
+
+    Payloads = dict()
+
+    for i in range(len(Injector.TargetPEs)):
+
+        payloads_aux = ["PEPOS", "TMSTP", "RANDO", "RANDO", "RANDO", "RANDO"]
+
+        for j in range(int(Injector.TargetPayloadSize[i]) - 6):
+            payloads_aux.append("RANDO")
+
+        Payloads["Payload" + str(Injector.TargetPEs[i])] = payloads_aux
+
+    return Payloads
+
+
+# Returns ( seconds, peak bytes allocated ) of a call
+def measure(Function):
+
+    tracemalloc.start()
+    startTime = time.perf_counter()
+    Result = Function()
+    elapsedTime = time.perf_counter() - startTime
+    peakMemory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return elapsedTime, peakMemory, Result
+
+
+# Compares expanded payload lists against run-length encoded payloads, returns a list of result rows
+def benchmark(Dimensions, AmountOfTargets=16):
+
+    Results = []
+
+    for Dimension in Dimensions:
+
+        Setup = makeSyntheticPlatform(Dimension, AmountOfTargets)
+        Setup.mapToPlatform()
+        Injectors = list(Setup.Injectors.values())
+
+        Encodings = [
+            ("expanded", lambda: [legacyPayloads(Injector) for Injector in Injectors],
+             lambda: [PlatformComposer.dumpJSON(Injector.toDict()) for Injector in Injectors]),
+            ("rle", lambda: [{PayloadKey: PlatformComposer.getDefaultPayload(126)
+                              for PayloadKey in Injector.EncodedPayloads} for Injector in Injectors],
+             lambda: [PlatformComposer.dumpJSON(Injector.toDict(compactPayloads=True)) for Injector in Injectors])
+        ]
+
+        for EncodingName, buildPayloads, serialize in Encodings:
+
+            PlatformComposer.DefaultPayloads.clear()
+            buildTime, buildMemory, Payloads = measure(buildPayloads)
+            serializeTime, serializeMemory, Files = measure(serialize)
+
+            Results.append({"Benchmark": "PayloadEncoding", "Encoding": EncodingName,
+                            "AmountOfPEs": Dimension * Dimension, "AmountOfTargets": AmountOfTargets,
+                            "BuildSeconds": buildTime, "PayloadBytes": buildMemory,
+                            "SerializeSeconds": serializeTime, "JSONBytes": sum(len(File) for File in Files)})
+
+    return Results
+
+
+# Expects as (optional) arguments: $1 = amount of targets per thread
+def main():
+
+    AmountOfTargets = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    Results = benchmark([8, 16, 32], AmountOfTargets=AmountOfTargets)
+
+    print("\n\tInjector payload encoding (" + str(AmountOfTargets) + " targets per thread)")
+    for Row in Results:
+        print(Row["Encoding"].ljust(9) + str(Row["AmountOfPEs"]).rjust(6) + " PEs " +
+              "{:9.4f}".format(Row["BuildSeconds"]) + " s build " +
+              "{:9.2f}".format(Row["PayloadBytes"] / (1 << 20)) + " MB payloads " +
+              "{:9.4f}".format(Row["SerializeSeconds"]) + " s serialize " +
+              "{:9.2f}".format(Row["JSONBytes"] / (1 << 20)) + " MB JSON")
+
+    Expanded, Encoded = Results[-2], Results[-1]
+    print("\nLargest platform: payloads " + "{:.1f}".format(Expanded["PayloadBytes"] / Encoded["PayloadBytes"]) +
+          "x smaller in memory, JSON " + "{:.1f}".format(Expanded["JSONBytes"] / Encoded["JSONBytes"]) + "x smaller, " +
+          "serialization " + "{:.1f}".format(Expanded["SerializeSeconds"] / Encoded["SerializeSeconds"]) + "x faster")
+    print("")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
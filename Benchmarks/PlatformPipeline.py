@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FlowGenerator"))
+from Sources import PlatformComposer, AppComposer
+from PEAddressing import buildPlatform
+
+
+# Returns ( structure type, amount of PEs, wrapper location ) of AmountOfWrappers random buses and crossbars on a square
+# base NoC, sized so the platform fills a square NoC of given side (as the square NoC algorithm requires)
+def makeSquareStructures(Dimension, AmountOfWrappers, SquareSide, Seed=0):
+
+    rng = random.Random(Seed)
+    Locations = rng.sample([(x, y) for y in range(Dimension) for x in range(Dimension)], AmountOfWrappers)
+
+    # Each wrapper replaces a base NoC PE, so its structure adds ( amount of PEs - 1 ) PEs to the platform
+    AmountOfExtraPEs = [2] * AmountOfWrappers
+    for i in range(SquareSide * SquareSide - Dimension * Dimension - 2 * AmountOfWrappers):
+        AmountOfExtraPEs[rng.randrange(AmountOfWrappers)] += 1
+
+    return [(rng.choice(("Bus", "Crossbar")), AmountOfExtraPEs[i] + 1, Locations[i]) for i in range(AmountOfWrappers)]
+
+
+# Builds a single application with AmountOfThreads threads, each sending to AmountOfTargets random threads
+def makeDenseApplication(AmountOfThreads, AmountOfTargets, Seed=0):
+
+    rng = random.Random(Seed)
+
+    Synthetic = AppComposer.Application(AppName="Dense")
+
+    Threads = [AppComposer.Thread() for i in range(AmountOfThreads)]
+    for Thread in Threads:
+        Synthetic.addThread(Thread)
+
+    for i, Thread in enumerate(Threads):
+        for target in rng.sample(range(AmountOfThreads - 1), AmountOfTargets):
+            TargetThread = Threads[target if target < i else target + 1]
+            Thread.addTarget(AppComposer.Target(TargetThread=TargetThread, Bandwidth=rng.randint(8, 64)))
+
+    return Synthetic
+
+
+# Times every stage of a FlowGenerator run on a synthetic platform (a square base NoC with AmountOfWrappers buses and
+# crossbars, SquareSide ^ 2 PEs, a thread on every PE): adding structures, mapping threads to PEs and writing flow
+# files. Returns a list of result rows
+def benchmark(Dimension=16, AmountOfWrappers=48, SquareSide=24, AmountOfTargets=8, jobs=1):
+
+    Structures = makeSquareStructures(Dimension, AmountOfWrappers, SquareSide)
+
+    startTime = time.perf_counter()
+    Setup = buildPlatform(PlatformComposer.Platform, (Dimension, Dimension), Structures)
+    structureTime = time.perf_counter() - startTime
+
+    Synthetic = makeDenseApplication(Setup.AmountOfPEs, AmountOfTargets)
+
+    startTime = time.perf_counter()
+    Setup.addApplication(Synthetic)
+    Setup.setAllocationMap({i: Thread for i, Thread in enumerate(Synthetic.Threads)})
+    Setup.mapToPlatform(Seed=0)
+    mapTime = time.perf_counter() - startTime
+
+    with tempfile.TemporaryDirectory() as FlowPath:
+        startTime = time.perf_counter()
+        amountOfFiles = Setup.generateJSON(FlowPath + os.sep, jobs=jobs)
+        generateTime = time.perf_counter() - startTime
+
+    Stages = [("addStructure", structureTime), ("mapToPlatform", mapTime), ("generateJSON", generateTime)]
+
+    return [{"Benchmark": "PlatformPipeline", "Stage": StageName, "AmountOfPEs": Setup.AmountOfPEs,
+             "AmountOfWrappers": AmountOfWrappers, "AmountOfFlows": Setup.AmountOfPEs * AmountOfTargets,
+             "AmountOfFiles": amountOfFiles, "Seconds": elapsedTime} for StageName, elapsedTime in Stages]
+
+
+# Expects as (optional) arguments: $1 = base NoC dimension ; $2 = amount of wrappers ; $3 = side of the square NoC ;
+# $4 = amount of targets per thread
+def main():
+
+    Results = benchmark(*[int(Argument) for Argument in sys.argv[1:5]])
+
+    print("\n\tFlowGenerator stages (" + str(Results[0]["AmountOfPEs"]) + " PEs, " +
+          str(Results[0]["AmountOfWrappers"]) + " wrappers, " + str(Results[0]["AmountOfFlows"]) + " flows)")
+    for Row in Results:
+        print(Row["Stage"].ljust(14) + "{:10.3f}".format(Row["Seconds"]) + " s")
+    print("")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+import os
+import sys
+import copy
+import time
+import tracemalloc
+
+FlowGeneratorPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FlowGenerator")
+sys.path.insert(0, FlowGeneratorPath)
+from Sources import PlatformComposer, DefinitionLoader
+
+
+# Builds the platform of given setup running given application, as FlowGenerator.py does
+def loadPlatform(SetupScript, AppScript, AllocScript, ReferenceClock=100):
+
+    Setup, Applications = DefinitionLoader.loadFlow(SetupScript, AppScript, AllocScript, ReferenceClock,
+                                                    Root=FlowGeneratorPath)
+    Setup.mapToPlatform()
+
+    return Setup
+
+
+# Platform.toDict previously used by Platform.toJSON (deep copies the whole platform, then drops most of it)
+def legacyToDict(Platform):
+
+    SerializableObject = copy.deepcopy(Platform)
+
+    del SerializableObject._PEs
+    del SerializableObject._WrapperAddresses
+    del SerializableObject.AddressesOutdated
+    del SerializableObject.Applications
+    del SerializableObject.Injectors
+    del SerializableObject.BaseNoC
+    del SerializableObject.AllocationMap
+    del SerializableObject.ThreadPEPos
+    del SerializableObject.Buses
+    del SerializableObject.Crossbars
+
+    SerializableDict = SerializableObject.__dict__
+    SerializableDict["BusWrapperIDs"] = [Bus.AddressInBaseNoC for Bus in Platform.Buses]
+    SerializableDict["CrossbarWrapperIDs"] = [Crossbar.AddressInBaseNoC for Crossbar in Platform.Crossbars]
+    SerializableDict["WrapperAddresses"] = [Platform.WrapperAddresses[i] for i in range(len(Platform.WrapperAddresses))]
+
+    return SerializableDict
+
+
+# Times both serializers on given setup, returns a list of result rows
+def benchmark(SetupScript="H33_100", AppScript="PIP", AllocScript="PIP_default", Repeats=20):
+
+    Setup = loadPlatform(SetupScript, AppScript, AllocScript)
+
+    if PlatformComposer.dumpJSON(legacyToDict(Setup)) != PlatformComposer.dumpJSON(Setup.toDict()):
+        raise ValueError("Serializers disagree on " + SetupScript)
+
+    Results = []
+
+    for SerializerName, Serializer in (("deepcopy", legacyToDict), ("explicit", PlatformComposer.Platform.toDict)):
+
+        bestTime = None
+        for r in range(Repeats):
+            startTime = time.perf_counter()
+            Serializer(Setup)
+            elapsedTime = time.perf_counter() - startTime
+            bestTime = elapsedTime if bestTime is None else min(bestTime, elapsedTime)
+
+        tracemalloc.start()
+        Serializer(Setup)
+        peakMemory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        Results.append({"Benchmark": "PlatformSerialization", "Serializer": SerializerName, "Setup": SetupScript,
+                        "AmountOfPEs": Setup.AmountOfPEs, "Seconds": bestTime, "PeakBytes": peakMemory})
+
+    return Results
+
+
+# Expects as (optional) arguments: $1 = setup script ; $2 = application script ; $3 = allocation map script
+def main():
+
+    Results = benchmark(*sys.argv[1:4])
+
+    print("\n\tPlatform.toDict (" + Results[0]["Setup"] + ", " + str(Results[0]["AmountOfPEs"]) + " PEs)")
+    for Row in Results:
+        print(Row["Serializer"].ljust(9) + "{:12.1f}".format(Row["Seconds"] * 1e6) + " us " +
+              "{:12.1f}".format(Row["PeakBytes"] / 1024) + " kB peak")
+
+    print("\nExplicit serializer is " + "{:.0f}".format(Results[0]["Seconds"] / Results[1]["Seconds"]) + "x faster")
+    print("")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
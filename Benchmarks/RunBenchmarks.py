@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import importlib
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+# Benchmarks of the suite, as ( module name, arguments of its benchmark() function in quick mode, arguments in full
+# mode ). Full mode runs platforms of a few thousand PEs and logs of millions of lines
+Suite = [
+    ("DefinitionLoading", {"Repeats": 20}, {"Repeats": 200}),
+    ("PEAddressing", {"Repeats": 1}, {"Dimension": 32, "AmountOfWrappers": 192, "Repeats": 5}),
+    ("PlatformPipeline", {}, {"AmountOfWrappers": 96, "SquareSide": 32, "AmountOfTargets": 16}),
+    ("PlatformSerialization", {"Repeats": 5}, {"Repeats": 20}),
+    ("PayloadEncoding", {"Dimensions": [8, 16]}, {"Dimensions": [8, 16, 32]}),
+    ("ModelFootprint", {"Sizes": [1000, 10000]}, {"Sizes": [1000, 10000, 40000]}),
+    ("ThreadMapping", {}, {"Dimension": 16, "AmountOfThreads": 192}),
+    ("LoadEstimation", {"Dimensions": [8, 16]}, {"Dimensions": [8, 16, 32]}),
+    ("TrafficSimulation", {"Dimensions": [4, 8], "endTime": 200000}, {"Dimensions": [4, 8, 16]}),
+    ("TrafficPatterns", {"Dimensions": [25, 50]}, {"Dimensions": [50, 100, 200]}),
+    ("LogMatching", {"Sizes": [50000, 200000]}, {"Sizes": [100000, 400000, 1600000]}),
+    ("LogFileMatching", {"Sizes": [100000]}, {"Sizes": [250000, 1000000, 2000000]})
+]
+
+
+# Returns whether a row value measures performance, and if so whether lower values are better. Times (in seconds or
+# nanoseconds) and sizes (in bytes) are better lower, throughputs (per second) higher
+def getMetricDirection(key, value):
+
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+
+    if key.endswith("PerSecond"):
+        return "higher"
+
+    if key.endswith("Seconds") or key.endswith("PerLine") or key.endswith("Bytes") or key.endswith("PerPE"):
+        return "lower"
+
+    return None
+
+
+# Returns the values identifying a row of a benchmark among its other rows (its strings and amounts)
+def getRowKey(Row):
+    return tuple(sorted((key, value) for key, value in Row.items()
+                        if isinstance(value, str) or key.startswith("AmountOf") or key == "Dimension"))
+
+
+# Runs given benchmarks of the suite, returns a serializable report of their rows
+def runSuite(Names, full=False):
+
+    Report = {"Date": time.strftime("%Y-%m-%dT%H:%M:%S"), "Python": platform.python_version(),
+              "Platform": platform.platform(), "Mode": "full" if full else "quick", "Benchmarks": dict()}
+
+    for ModuleName, QuickArguments, FullArguments in Suite:
+
+        if ModuleName not in Names:
+            continue
+
+        print("Running " + ModuleName + "...", flush=True)
+
+        Module = importlib.import_module(ModuleName)
+        Arguments = FullArguments if full else QuickArguments
+
+        startTime = time.perf_counter()
+        Rows = Module.benchmark(**Arguments)
+        elapsedTime = time.perf_counter() - startTime
+
+        Report["Benchmarks"][ModuleName] = {"Arguments": Arguments, "Seconds": elapsedTime, "Rows": Rows}
+
+    return Report
+
+
+# Compares every metric of rows found in both reports. Returns a list of ( benchmark, row key, metric, old value, new
+# value, relative change, whether it got worse by more than threshold ) tuples. Relative change is positive when the
+# metric got better. Times shorter than minSeconds in both reports are too noisy to be compared
+def compareReports(OldReport, NewReport, threshold=0.2, minSeconds=0.01):
+
+    Comparisons = []
+
+    for ModuleName, NewResults in NewReport["Benchmarks"].items():
+
+        OldResults = OldReport["Benchmarks"].get(ModuleName)
+        if OldResults is None:
+            continue
+
+        OldRows = {getRowKey(Row): Row for Row in OldResults["Rows"]}
+
+        for NewRow in NewResults["Rows"]:
+
+            OldRow = OldRows.get(getRowKey(NewRow))
+            if OldRow is None:
+                continue
+
+            # Throughputs of rows timed too briefly are as noisy as their times
+            shortFlag = max(NewRow.get("Seconds", minSeconds), OldRow.get("Seconds", minSeconds)) < minSeconds
+
+            for key, newValue in NewRow.items():
+
+                direction = getMetricDirection(key, newValue)
+                oldValue = OldRow.get(key)
+
+                if direction is None or not isinstance(oldValue, (int, float)) or oldValue == 0 or newValue == 0:
+                    continue
+
+                if key.endswith("Seconds") and max(oldValue, newValue) < minSeconds or shortFlag:
+                    continue
+
+                change = (oldValue / newValue - 1) if direction == "lower" else (newValue / oldValue - 1)
+                Comparisons.append((ModuleName, getRowKey(NewRow), key, oldValue, newValue, change,
+                                    change < -threshold))
+
+    return Comparisons
+
+
+# Prints a comparison (see compareReports), returns the amount of regressions
+def printComparison(Comparisons):
+
+    amountOfRegressions = 0
+
+    for ModuleName, RowKey, key, oldValue, newValue, change, regressionFlag in Comparisons:
+
+        RowName = ", ".join(name + "=" + str(value) for name, value in RowKey if name != "Benchmark")
+        print((ModuleName + " [" + RowName + "] " + key).ljust(100) + "{:14.6g}".format(oldValue) + " -> " +
+              "{:<14.6g}".format(newValue) + "{:+8.1f}".format(change * 100) + " %" +
+              ("  REGRESSION" if regressionFlag else ""))
+
+        amountOfRegressions += regressionFlag
+
+    print("\n" + str(len(Comparisons)) + " metrics compared, " + str(amountOfRegressions) + " regressions")
+
+    return amountOfRegressions
+
+
+# Expects as (optional) arguments: names of benchmarks to run (default: whole suite) ; [--full] ; [--output file] ;
+# [--baseline file] ; [--threshold fraction] ; or --diff old.json new.json to compare two stored runs
+def main():
+
+    parser = argparse.ArgumentParser(description="Runs the benchmark suite, storing every result row as JSON, and "
+                                                 "compares runs to catch regressions")
+    parser.add_argument("Names", nargs="*", help="benchmarks to run (default: " +
+                                                 ", ".join(ModuleName for ModuleName, *Arguments in Suite) + ")")
+    parser.add_argument("--full", action="store_true", help="run larger platforms and logs (takes minutes)")
+    parser.add_argument("--output", dest="OutputFileName",
+                        help="JSON file results are written to (default: benchmark-<date>.json)")
+    parser.add_argument("--baseline", dest="BaselineFileName", help="JSON file of a previous run to compare against")
+    parser.add_argument("--diff", nargs=2, metavar=("OLD", "NEW"), help="only compare two JSON files of previous runs")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown reported as a regression (default: 0.2, i.e. 20 %%)")
+    parser.add_argument("--min-seconds", type=float, default=0.01, dest="minSeconds",
+                        help="times shorter than this in both runs are not compared (default: 0.01)")
+    args = parser.parse_args()
+
+    if args.diff is not None:
+
+        with open(args.diff[0], 'r') as OldFile, open(args.diff[1], 'r') as NewFile:
+            amountOfRegressions = printComparison(compareReports(json.load(OldFile), json.load(NewFile),
+                                                                 args.threshold, args.minSeconds))
+
+        exit(1 if amountOfRegressions > 0 else 0)
+
+    Names = args.Names if len(args.Names) > 0 else [ModuleName for ModuleName, *Arguments in Suite]
+    UnknownNames = set(Names) - set(ModuleName for ModuleName, *Arguments in Suite)
+    if len(UnknownNames) > 0:
+        parser.error("unknown benchmarks: " + ", ".join(sorted(UnknownNames)))
+
+    Report = runSuite(Names, args.full)
+
+    OutputFileName = args.OutputFileName if args.OutputFileName is not None else \
+        "benchmark-" + time.strftime("%Y%m%d-%H%M%S") + ".json"
+    with open(OutputFileName, 'w') as OutputFile:
+        OutputFile.write(json.dumps(Report, indent=4))
+
+    print("\nResults of " + str(len(Report["Benchmarks"])) + " benchmarks written to " + OutputFileName)
+
+    if args.BaselineFileName is not None:
+
+        with open(args.BaselineFileName, 'r') as BaselineFile:
+            amountOfRegressions = printComparison(compareReports(json.load(BaselineFile), Report, args.threshold,
+                                                                 args.minSeconds))
+
+        exit(1 if amountOfRegressions > 0 else 0)
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
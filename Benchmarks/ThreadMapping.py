@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FlowGenerator"))
+from Sources import PlatformComposer, AppComposer, ThreadMapper
+
+
+# Builds a square platform with AmountOfThreads threads in a single application, each thread sending to
+# AmountOfTargets random threads
+def makeSyntheticProblem(Dimension, AmountOfThreads, AmountOfTargets, ReferenceClock=100, Seed=0):
+
+    rng = random.Random(Seed)
+
+    Setup = PlatformComposer.Platform((Dimension, Dimension), ReferenceClock=ReferenceClock)
+    Synthetic = AppComposer.Application(AppName="Synthetic")
+
+    Threads = [AppComposer.Thread() for i in range(AmountOfThreads)]
+    for Thread in Threads:
+        Synthetic.addThread(Thread)
+
+    for Thread in Threads:
+        for TargetThread in rng.sample([Other for Other in Threads if Other is not Thread], AmountOfTargets):
+            Thread.addTarget(AppComposer.Target(TargetThread=TargetThread, Bandwidth=rng.randint(8, 64)))
+
+    Setup.addApplication(Synthetic)
+
+    return Setup, Synthetic
+
+
+# Compares cost of a random placement against greedy placement and greedy placement refined by simulated annealing,
+# returns a list of result rows
+def benchmark(Dimension=8, AmountOfThreads=48, AmountOfTargets=3):
+
+    Setup, Synthetic = makeSyntheticProblem(Dimension, AmountOfThreads, AmountOfTargets)
+    Mapper = ThreadMapper.ThreadMapper(Setup, [Synthetic], Seed=0)
+
+    PEIndexes = random.Random(0).sample(range(len(Mapper.PEPositions)), AmountOfThreads)
+    Placements = [("random", lambda: Mapper.setPlacement(PEIndexes)), ("greedy", Mapper.placeGreedily),
+                  ("annealed", Mapper.map)]
+
+    Results = []
+
+    for PlacementName, place in Placements:
+
+        startTime = time.perf_counter()
+        place()
+        elapsedTime = time.perf_counter() - startTime
+        hopCost, overload = Mapper.getCost()
+
+        Results.append({"Benchmark": "ThreadMapping", "Placement": PlacementName, "AmountOfPEs": Dimension * Dimension,
+                        "AmountOfThreads": AmountOfThreads, "Seconds": elapsedTime, "HopCost": hopCost,
+                        "Overload": overload})
+
+    return Results
+
+
+# Expects as (optional) arguments: $1 = base NoC dimension ; $2 = amount of threads ; $3 = amount of targets per thread
+def main():
+
+    Results = benchmark(*[int(Argument) for Argument in sys.argv[1:4]])
+
+    print("\n\tThread mapping (" + str(Results[0]["AmountOfThreads"]) + " threads, " +
+          str(Results[0]["AmountOfPEs"]) + " PEs)")
+    for Row in Results:
+        print(Row["Placement"].ljust(9) + "{:10.3f}".format(Row["Seconds"]) + " s " + str(Row["HopCost"]).rjust(10) +
+              " Mbps x hops " + str(Row["Overload"]).rjust(8) + " Mbps overload")
+
+    print("\nAnnealed placement costs " + "{:.1f}".format(Results[0]["HopCost"] / Results[2]["HopCost"]) +
+          "x less than a random one")
+    print("")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
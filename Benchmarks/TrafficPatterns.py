@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FlowGenerator"))
+from Sources import PlatformComposer, AppComposer
+
+
+# Traffic pattern generators of AppComposer, by name
+Patterns = [("UniformRandom", AppComposer.makeUniformRandom), ("Transpose", AppComposer.makeTranspose),
+            ("BitComplement", AppComposer.makeBitComplement), ("Hotspot", AppComposer.makeHotspot),
+            ("NearestNeighbor", AppComposer.makeNearestNeighbor)]
+
+
+# Times construction of every traffic pattern application (but all-to-all, quadratic) on square base NoCs of given
+# dimensions, each PE injecting 10 % of link bandwidth. Returns a list of result rows
+def benchmark(Dimensions, ReferenceClock=100):
+
+    Results = []
+
+    for Dimension in Dimensions:
+
+        Setup = PlatformComposer.Platform((Dimension, Dimension), ReferenceClock=ReferenceClock)
+        bandwidth = Setup.AmountOfPEs * 32 * ReferenceClock // 10
+
+        for PatternName, makePattern in Patterns:
+
+            startTime = time.perf_counter()
+            PatternApplication = makePattern(Setup, bandwidth)
+            elapsedTime = time.perf_counter() - startTime
+
+            Results.append({"Benchmark": "TrafficPatterns", "Pattern": PatternName, "AmountOfPEs": Setup.AmountOfPEs,
+                            "AmountOfFlows": sum(len(Thread.Targets) for Thread in PatternApplication.Threads),
+                            "Seconds": elapsedTime, "NanosecondsPerPE": (elapsedTime * 1e9) / Setup.AmountOfPEs})
+
+    return Results
+
+
+# Expects as (optional) argument: $1 = largest base NoC dimension
+def main():
+
+    Dimension = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    Results = benchmark([Dimension // 4, Dimension // 2, Dimension])
+
+    print("\n\tTraffic pattern construction")
+    for Row in Results:
+        print(Row["Pattern"].ljust(16) + str(Row["AmountOfPEs"]).rjust(7) + " PEs " +
+              str(Row["AmountOfFlows"]).rjust(8) + " flows " + "{:8.3f}".format(Row["Seconds"]) + " s " +
+              "{:8.0f}".format(Row["NanosecondsPerPE"]) + " ns/PE")
+    print("")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FlowGenerator"))
+from Sources import TrafficSimulator
+from ThreadMapping import makeSyntheticProblem
+
+
+# Times cycle-approximate simulation of synthetic square platforms (one thread per PE, each sending to AmountOfTargets
+# random threads) for endTime ns, returns a list of result rows. A lower reference clock makes for higher injection
+# rates
+def benchmark(Dimensions, endTime=1000000, AmountOfTargets=3, ReferenceClock=25):
+
+    Results = []
+
+    for Dimension in Dimensions:
+
+        Setup, Synthetic = makeSyntheticProblem(Dimension, Dimension * Dimension, AmountOfTargets,
+                                                ReferenceClock=ReferenceClock)
+        Setup.setAllocationMap({i: Thread for i, Thread in enumerate(Synthetic.Threads)})
+        Setup.mapToPlatform(Seed=0)
+
+        with tempfile.TemporaryDirectory() as FlowPath:
+
+            Setup.generateJSON(FlowPath + os.sep)
+
+            startTime = time.perf_counter()
+            Simulator = TrafficSimulator.TrafficSimulator(FlowPath)
+            loadTime = time.perf_counter() - startTime
+
+            startTime = time.perf_counter()
+            Simulator.run(endTime)
+            elapsedTime = time.perf_counter() - startTime
+
+        amountOfMessagesSent, amountOfMessagesReceived = Simulator.getMessageCounts()
+
+        Results.append({"Benchmark": "TrafficSimulation", "AmountOfPEs": Dimension * Dimension, "SimulatedNs": endTime,
+                        "MessagesSent": amountOfMessagesSent, "MessagesReceived": amountOfMessagesReceived,
+                        "LoadSeconds": loadTime, "Seconds": elapsedTime,
+                        "MessagesPerSecond": amountOfMessagesSent / elapsedTime})
+
+    return Results
+
+
+# Expects as (optional) arguments: $1 = simulated time, in ns ; $2 = amount of targets per thread
+def main():
+
+    endTime = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    AmountOfTargets = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    Results = benchmark([4, 8, 16], endTime=endTime, AmountOfTargets=AmountOfTargets)
+
+    print("\n\tCycle-approximate traffic simulation (" + str(endTime) + " ns, " + str(AmountOfTargets) +
+          " targets per thread)")
+    for Row in Results:
+        print(str(Row["AmountOfPEs"]).rjust(6) + " PEs " + str(Row["MessagesSent"]).rjust(8) + " sent " +
+              str(Row["MessagesReceived"]).rjust(8) + " received " + "{:8.2f}".format(Row["Seconds"]) + " s " +
+              "{:10.0f}".format(Row["MessagesPerSecond"]) + " messages per second")
+    print("")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+from Sources import AppComposer
+
+# Allocates thread i of a traffic pattern application (see AppComposer) at the i-th lowest PEPos value of the setup
+AllocationMap = AppComposer.getPatternAllocationMap(Setup, Applications[0])
@@ -0,0 +1,6 @@
+from Sources import AppComposer
+
+# All-to-all traffic between threads on every PE of the setup, injecting 10 % of link bandwidth at each PE on
+# average, 1 Mbps per flow at least (see AppComposer). Threads are allocated by the Pattern allocation map
+bandwidth = max(Setup.AmountOfPEs * 32 * ReferenceClock // 10, Setup.AmountOfPEs * (Setup.AmountOfPEs - 1))
+Applications = [AppComposer.makeAllToAll(Setup, bandwidth)]
@@ -0,0 +1,6 @@
+from Sources import AppComposer
+
+# Hotspot traffic between threads on every PE of the setup, half of it to a single thread, injecting 10 % of link
+# bandwidth at each PE on average (see AppComposer). Threads are allocated by the Pattern allocation map
+bandwidth = Setup.AmountOfPEs * 32 * ReferenceClock // 10
+Applications = [AppComposer.makeHotspot(Setup, bandwidth)]
@@ -0,0 +1,6 @@
+from Sources import AppComposer
+
+# Uniform random traffic between threads on every PE of the setup, injecting 10 % of link bandwidth at each PE on
+# average (see AppComposer). Threads are allocated by the Pattern allocation map
+bandwidth = Setup.AmountOfPEs * 32 * ReferenceClock // 10
+Applications = [AppComposer.makeUniformRandom(Setup, bandwidth)]
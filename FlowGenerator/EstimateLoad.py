@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+import json
+import time
+import argparse
+from Sources import DefinitionLoader
+from Sources import LoadEstimator
+
+
+# Expects as arguments: $1 = Name of setup script, located in Setups folder ; $2 = Name of application script, located
+# in Applications folder ; $3 = Name of allocation map script, located in AllocationMaps folder ; $4 = Platform
+# reference clock, in MHz ; [--top N] ; [--router-latency cycles] ; [--json file]
+def main():
+
+    parser = argparse.ArgumentParser(description="Estimates link, bus and crossbar utilization and message latency of "
+                                                 "a platform running given applications, without simulating it")
+    parser.add_argument("SetupScript", help="name of setup script, located in Setups folder")
+    parser.add_argument("AppScript", help="name of application script, located in Applications folder")
+    parser.add_argument("AllocScript", help="name of allocation map script, located in AllocationMaps folder")
+    parser.add_argument("ReferenceClock", type=int, help="platform reference clock, in MHz")
+    parser.add_argument("--top", type=int, default=10, help="amount of busiest links to report")
+    parser.add_argument("--router-latency", type=int, default=4, dest="routerLatency",
+                        help="cycles a message header spends at each hop without contention")
+    parser.add_argument("--json", dest="JSONFileName", help="also write the whole estimate to given JSON file")
+    args = parser.parse_args()
+
+    startTime = time.perf_counter()
+
+    Setup, Applications = DefinitionLoader.loadFlow(args.SetupScript, args.AppScript, args.AllocScript,
+                                                    args.ReferenceClock)
+    Setup.mapToPlatform(Seed=0)
+
+    Estimator = LoadEstimator.LoadEstimator(Setup, routerLatency=args.routerLatency).estimate()
+    Estimate = Estimator.toDict()
+
+    elapsedTime = time.perf_counter() - startTime
+
+    print("\n\tBusiest links (link bandwidth = " + str(Estimate["LinkBandwidth"]) + " Mbps)")
+    for LinkDict in Estimate["Links"][:args.top]:
+        print(LinkDict["Link"].ljust(30) + "{:8.1f}".format(LinkDict["Utilization"] * 100) + " % " +
+              "{:10.1f}".format(LinkDict["Mbps"]) + " Mbps" + ("  SATURATED" if LinkDict["Utilization"] >= 1 else ""))
+
+    print("\n\tStructures (busiest of bus medium or crossbar port and wrapper ports)")
+    for StructureDict in Estimate["Structures"]:
+        print(StructureDict["Structure"].ljust(30) + "{:8.1f}".format(StructureDict["Utilization"] * 100) + " %")
+
+    Latencies = [FlowDict["LatencyInNs"] for FlowDict in Estimate["Flows"]]
+    FiniteLatencies = [latency for latency in Latencies if latency is not None]
+
+    print("\n\tFlows")
+    print("Amount of flows: " + str(len(Latencies)) + " (" + str(len(Latencies) - len(FiniteLatencies)) +
+          " crossing a saturated link)")
+    if len(FiniteLatencies) > 0:
+        print("Estimated latency: average = " + "{:.1f}".format(sum(FiniteLatencies) / len(FiniteLatencies)) +
+              " ns, max = " + "{:.1f}".format(max(FiniteLatencies)) + " ns")
+
+    print("\nEstimated in " + "{:.1f}".format(elapsedTime * 1000) + " ms")
+
+    if args.JSONFileName is not None:
+        with open(args.JSONFileName, 'w') as JSONFile:
+            JSONFile.write(json.dumps(Estimate, indent=4))
+        print("Estimate written to " + args.JSONFileName)
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -1,107 +1,192 @@
 #!/usr/bin/env python
-import sys
-from os import getcwd
+import io
+import argparse
+from os import getcwd, path
 import statistics
+from Sources import DefinitionLoader
+from Sources import PlatformComposer
+from Sources import StageTimer
 #from sklearn import preprocessing
 
-# Expects arguments:
-SetupScript = str(sys.argv[1])      # $1 = Name of setup script, located in Setups folder
-AppScript = str(sys.argv[2])        # $2 = Name of application script, located in Applications folder
-AllocScript = str(sys.argv[3])      # $3 = Name of allocation map script, located in Maps folder
-ReferenceClock = int(sys.argv[4])   # $4 = Platform reference clock, in MHz
-
-# Executes Setup script
-try:
-    exec(open("Setups/" + SetupScript + ".py").read())
-except FileNotFoundError:
-    print("Error: Given Setup script \"" + str(SetupScript) + "\" not found at Setups directory")
-    exit(1)
-
-# Executes Application script
-try:
-    exec(open("Applications/" + AppScript + ".py").read())
-except FileNotFoundError:
-    print("Error: Given Application script \"" + str(AppScript) + "\" not found at Applications directory")
-    exit(1)
-
-# Executes Allocation Map script
-try:
-    exec(open("AllocationMaps/" + AllocScript + ".py").read())
-except FileNotFoundError:
-    print("Error: Given Allocation Map script \"" + str(AllocScript) + "\" not found at AllocationMaps directory")
-    exit(1)
-
-# Link applications to Platform (Applications array must be set on given app script)
-for i in range(len(Applications)):
-    Setup.addApplication(Applications[i])
-
-# Link Allocation Map to platform
-Setup.setAllocationMap(AllocationMap)
-
-# Makes PE and Injector objects
-Setup.mapToPlatform()
-
-# Generate project JSON config files
-Setup.generateJSON("Flows/" + SetupScript + " " + AppScript + "/flow/")
-print("JSON files created at " + getcwd() + "/Flows/" + SetupScript + " " + AppScript + "/flow/")
-
-# Generate log containing project information
-ProjectInfo = open("Flows/" + SetupScript + " " + AppScript + "/" + SetupScript + " " + AppScript + "Info.txt", 'w')
-ProjectInfo.write("Setup: " + SetupScript + "\n")
-ProjectInfo.write("\tAmount of PEs: " + str(Setup.AmountOfPEs) + "\n")
-ProjectInfo.write("\tAmount of PEs in base NoC: " + str((Setup.BaseNoCDimensions[0]*Setup.BaseNoCDimensions[1]) - Setup.AmountOfWrappers) + "\n")
-ProjectInfo.write("\tAmount of Wrappers: " + str(Setup.AmountOfWrappers) + "\n")
-
-ProjectInfo.write("\tAmount of Buses: " + str(Setup.AmountOfBuses) + "\n")
-AmountOfPEsInBuses = 0
-for Bus in Setup.Buses:
-    AmountOfPEsInBuses += len(Bus.PEs)
-ProjectInfo.write("\tAmount of PEs in each Bus: " + str(Setup.AmountOfPEsInBuses) + "\n")
-
-ProjectInfo.write("\tAmount of Crossbars: " + str(Setup.AmountOfCrossbars) + "\n")
-AmountOfPEsInCrossbars = 0
-for Crossbar in Setup.Crossbars:
-    AmountOfPEsInCrossbars += len(Crossbar.PEs)
-ProjectInfo.write("\tAmount of PEs in each Crossbar: " + str(Setup.AmountOfPEsInCrossbars) + "\n")
-
-ProjectInfo.write("Application: " + "\n")
-ProjectInfo.write("\tNumber of Applications: " + str(len(Applications)) + "\n")
-
-Threads = []
-for App in Applications:
-    for Thread in App.Threads:
-        Threads.append(Thread)
-ProjectInfo.write("\tNumber of Threads: " + str(len(Threads)) + "\n")
-
-Targets = []
-for Thread in Threads:
-    for Target in Thread.Targets:
-        Targets.append(Target)
-ProjectInfo.write("\tAmount of Targets: " + str(len(Targets)) + "\n")
-
-Bandwidth = []
-for Thread in Threads:
-    Bandwidth.append(Thread.TotalBandwidth)
-ProjectInfo.write("\tTotal required bandwidth: " + str(sum(Bandwidth)) + "\n")
-
-ProjectInfo.write("\tAverage required bandwidth (per thread): " + str(statistics.mean(Bandwidth)) + "\n")
-ProjectInfo.write("\tStd deviation of required bandwidth (per thread): " + str(statistics.pstdev(Bandwidth)) + "\n")
-
-# TODO: Classify application as concentrated or distributed (function of std dev) and high demand or low demand
-
-# Classify application as concentrated or distributed
-# BandwidthNormalized = preprocessing.normalize([Bandwidth])
-# if statistics.pstdev(BandwidthNormalized) > 0.35:
-#     ProjectInfo.write("\n\tApplication is concentrated")
-# else:
-#     ProjectInfo.write("\n\tApplication is distributed")
-#
-# # Classify as high demand or low demand
-# if statistics.mean(Bandwidth) > 100:  # Bandwidth is expressed in Mbps
-#     ProjectInfo.write("\tApplication is high demand")
-# else:
-#     ProjectInfo.write("\tApplication is low demand")
-
-# Close info file and exit successfully
-ProjectInfo.close()
-exit(0)
+
+# Writes log containing project information (platform structure and application bandwidth requirements). In incremental
+# mode, the file is left untouched if its content didn't change
+def writeProjectInfo(FileName, SetupScript, Setup, Applications, incremental=False):
+
+    ProjectInfo = io.StringIO()
+    ProjectInfo.write("Setup: " + SetupScript + "\n")
+    ProjectInfo.write("\tAmount of PEs: " + str(Setup.AmountOfPEs) + "\n")
+    ProjectInfo.write("\tAmount of PEs in base NoC: " + str((Setup.BaseNoCDimensions[0]*Setup.BaseNoCDimensions[1]) - Setup.AmountOfWrappers) + "\n")
+    ProjectInfo.write("\tAmount of Wrappers: " + str(Setup.AmountOfWrappers) + "\n")
+
+    ProjectInfo.write("\tAmount of Buses: " + str(Setup.AmountOfBuses) + "\n")
+    AmountOfPEsInBuses = 0
+    for Bus in Setup.Buses:
+        AmountOfPEsInBuses += len(Bus.PEs)
+    ProjectInfo.write("\tAmount of PEs in each Bus: " + str(Setup.AmountOfPEsInBuses) + "\n")
+
+    ProjectInfo.write("\tAmount of Crossbars: " + str(Setup.AmountOfCrossbars) + "\n")
+    AmountOfPEsInCrossbars = 0
+    for Crossbar in Setup.Crossbars:
+        AmountOfPEsInCrossbars += len(Crossbar.PEs)
+    ProjectInfo.write("\tAmount of PEs in each Crossbar: " + str(Setup.AmountOfPEsInCrossbars) + "\n")
+
+    ProjectInfo.write("Application: " + "\n")
+    ProjectInfo.write("\tNumber of Applications: " + str(len(Applications)) + "\n")
+
+    Threads = []
+    for App in Applications:
+        for Thread in App.Threads:
+            Threads.append(Thread)
+    ProjectInfo.write("\tNumber of Threads: " + str(len(Threads)) + "\n")
+
+    Targets = []
+    for Thread in Threads:
+        for Target in Thread.Targets:
+            Targets.append(Target)
+    ProjectInfo.write("\tAmount of Targets: " + str(len(Targets)) + "\n")
+
+    Bandwidth = []
+    for Thread in Threads:
+        Bandwidth.append(Thread.TotalBandwidth)
+    ProjectInfo.write("\tTotal required bandwidth: " + str(sum(Bandwidth)) + "\n")
+
+    ProjectInfo.write("\tAverage required bandwidth (per thread): " + str(statistics.mean(Bandwidth)) + "\n")
+    ProjectInfo.write("\tStd deviation of required bandwidth (per thread): " + str(statistics.pstdev(Bandwidth)) + "\n")
+
+    # TODO: Classify application as concentrated or distributed (function of std dev) and high demand or low demand
+
+    # Classify application as concentrated or distributed
+    # BandwidthNormalized = preprocessing.normalize([Bandwidth])
+    # if statistics.pstdev(BandwidthNormalized) > 0.35:
+    #     ProjectInfo.write("\n\tApplication is concentrated")
+    # else:
+    #     ProjectInfo.write("\n\tApplication is distributed")
+    #
+    # # Classify as high demand or low demand
+    # if statistics.mean(Bandwidth) > 100:  # Bandwidth is expressed in Mbps
+    #     ProjectInfo.write("\tApplication is high demand")
+    # else:
+    #     ProjectInfo.write("\tApplication is low demand")
+
+    # Write info file
+    if incremental:
+        PlatformComposer.writeFileIfChanged(FileName, ProjectInfo.getvalue())
+    else:
+        with open(FileName, 'w') as ProjectInfoFile:
+            ProjectInfoFile.write(ProjectInfo.getvalue())
+
+
+def main():
+
+    # Expects arguments: $1 = Name of setup script, located in Setups folder ; $2 = Name of application script, located
+    # in Applications folder ; $3 = Name of allocation map script, located in Maps folder ; $4 = Platform reference
+    # clock, in MHz ; [--jobs N] ; [--compact] ; [--compact-payloads] ; [--seed N] ; [--incremental] ; [--profile] ;
+    # [--trace-memory]
+    parser = argparse.ArgumentParser(description="Generates JSON config files of a platform running given applications")
+    parser.add_argument("SetupScript", help="name of setup script, located in Setups folder")
+    parser.add_argument("AppScript", help="name of application script, located in Applications folder")
+    parser.add_argument("AllocScript", help="name of allocation map script, located in AllocationMaps folder")
+    parser.add_argument("ReferenceClock", type=int, help="platform reference clock, in MHz")
+    parser.add_argument("--jobs", type=int, default=1, help="amount of processes writing JSON files")
+    parser.add_argument("--compact", action="store_true", help="write JSON files without indentation or whitespace")
+    parser.add_argument("--compact-payloads", action="store_true", dest="compactPayloads",
+                        help="run-length encode injector payloads (not yet readable by Injector.vhd)")
+    parser.add_argument("--seed", type=int, help="derive injector RNG seeds from given seed instead of drawing them at "
+                                                  "random, making generation deterministic")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only rewrite JSON files whose content changed since last generation (implies --seed 0 "
+                             "if no seed is given)")
+    parser.add_argument("--profile", action="store_true", dest="profileFlag",
+                        help="run every stage under cProfile, writing its statistics next to the timing report")
+    parser.add_argument("--trace-memory", action="store_true", dest="traceMemoryFlag",
+                        help="trace Python allocations, reporting the peak amount of memory allocated by every stage")
+    args = parser.parse_args()
+    SetupScript = args.SetupScript
+    AppScript = args.AppScript
+    AllocScript = args.AllocScript
+    ReferenceClock = args.ReferenceClock
+
+    # Times every stage of the generation (see StageTimer)
+    Timer = StageTimer.StageTimer(args.profileFlag, args.traceMemoryFlag)
+
+    # Loads Setup definition (script or JSON file)
+    try:
+        with Timer.stage("loadSetup"):
+            Setup = DefinitionLoader.loadSetup(SetupScript, ReferenceClock)
+    except FileNotFoundError:
+        print("Error: Given Setup script \"" + str(SetupScript) + "\" not found at Setups directory")
+        exit(1)
+    except ValueError as Error:
+        print("Error: " + str(Error))
+        exit(1)
+
+    # Sets PEPos values of every PE, once every structure is added
+    with Timer.stage("updatePEAddresses"):
+        Setup.PEs
+
+    # Loads Application definition. Setup and ReferenceClock are visible to application and allocation map scripts
+    ScriptGlobals = {"ReferenceClock": ReferenceClock, "Setup": Setup}
+    try:
+        with Timer.stage("loadApplications"):
+            Applications, Threads = DefinitionLoader.loadApplications(AppScript, Globals=ScriptGlobals)
+    except FileNotFoundError:
+        print("Error: Given Application script \"" + str(AppScript) + "\" not found at Applications directory")
+        exit(1)
+
+    # Loads Allocation Map definition, which refers to threads by name (or to Applications, e.g. for traffic patterns)
+    ScriptGlobals["Applications"] = Applications
+    try:
+        with Timer.stage("loadAllocationMap"):
+            AllocationMap = DefinitionLoader.loadAllocationMap(AllocScript, Threads, Globals=ScriptGlobals)
+    except FileNotFoundError:
+        print("Error: Given Allocation Map script \"" + str(AllocScript) + "\" not found at AllocationMaps directory")
+        exit(1)
+
+    with Timer.stage("mapToPlatform"):
+
+        # Link applications to Platform (Applications array must be set on given app script)
+        for i in range(len(Applications)):
+            Setup.addApplication(Applications[i])
+
+        # Link Allocation Map to platform
+        Setup.setAllocationMap(AllocationMap)
+
+        # Makes PE and Injector objects. Random injector seeds would change every file on each run, so incremental
+        # generation always uses derived seeds
+        Seed = args.seed if args.seed is not None or not args.incremental else 0
+        Setup.mapToPlatform(Seed=Seed)
+
+    # Generate project JSON config files
+    with Timer.stage("generateJSON"):
+        amountOfFilesWritten = Setup.generateJSON("Flows/" + SetupScript + " " + AppScript + "/flow/", jobs=args.jobs,
+                                                  compact=args.compact, compactPayloads=args.compactPayloads,
+                                                  incremental=args.incremental)
+    if args.incremental:
+        print(str(amountOfFilesWritten) + " of " + str(len(Setup.Injectors) + len(Setup.PEs) + 1) +
+              " JSON files rewritten at " + getcwd() + "/Flows/" + SetupScript + " " + AppScript + "/flow/")
+    else:
+        print("JSON files created at " + getcwd() + "/Flows/" + SetupScript + " " + AppScript + "/flow/")
+
+    # Generate log containing project information
+    with Timer.stage("writeProjectInfo"):
+        writeProjectInfo("Flows/" + SetupScript + " " + AppScript + "/" + SetupScript + " " + AppScript + "Info.txt",
+                         SetupScript, Setup, Applications, args.incremental)
+
+    # Generate timing report (and profile) next to project information. In incremental mode, a flow whose files didn't
+    # change keeps the report of the run that last changed it
+    ReportPath = "Flows/" + SetupScript + " " + AppScript + "/" + SetupScript + " " + AppScript
+    if args.incremental and amountOfFilesWritten == 0 and path.exists(ReportPath + "Timing.json"):
+        Timer.finish()
+    else:
+        Timer.writeReport(ReportPath + "Timing.json", ReportPath + "Profile.prof" if args.profileFlag else None)
+        print("Timing report written to " + getcwd() + "/" + ReportPath + "Timing.json")
+
+    if args.profileFlag or args.traceMemoryFlag:
+        Timer.printSummary()
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
+    exit(0)
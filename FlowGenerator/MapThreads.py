@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+import os
+import time
+import argparse
+from Sources import DefinitionLoader
+from Sources import ThreadMapper
+
+
+# Expects as arguments: $1 = Name of setup script, located in Setups folder ; $2 = Name of application script, located
+# in Applications folder ; $3 = Name of allocation map to write in AllocationMaps folder ; $4 = Platform reference
+# clock, in MHz ; [--iterations N] ; [--seed N] ; [--json] ; [--compare names]
+def main():
+
+    parser = argparse.ArgumentParser(description="Maps threads of given applications on a platform, minimizing "
+                                                 "bandwidth weighted hop distance within bus and crossbar capacity")
+    parser.add_argument("SetupScript", help="name of setup script, located in Setups folder")
+    parser.add_argument("AppScript", help="name of application script, located in Applications folder")
+    parser.add_argument("AllocName", help="name of allocation map to write in AllocationMaps folder")
+    parser.add_argument("ReferenceClock", type=int, help="platform reference clock, in MHz")
+    parser.add_argument("--iterations", type=int, help="simulated annealing iterations (default: 2000 per thread)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random swaps made by simulated annealing")
+    parser.add_argument("--json", action="store_true", dest="JSONFormat",
+                        help="write allocation map as a JSON definition instead of a script")
+    parser.add_argument("--compare", nargs="+", default=[], dest="CompareScripts",
+                        help="allocation maps (located in AllocationMaps folder) to report the cost of")
+    args = parser.parse_args()
+
+    Setup = DefinitionLoader.loadSetup(args.SetupScript, args.ReferenceClock)
+    ScriptGlobals = {"ReferenceClock": args.ReferenceClock, "Setup": Setup}
+    Applications, Threads = DefinitionLoader.loadApplications(args.AppScript, Globals=ScriptGlobals)
+    ScriptGlobals["Applications"] = Applications
+
+    # AppIDs are set as FlowGenerator.py does, so allocation maps can be evaluated
+    for Application in Applications:
+        Setup.addApplication(Application)
+
+    Mapper = ThreadMapper.ThreadMapper(Setup, Applications, Seed=args.seed)
+
+    for CompareScript in args.CompareScripts:
+        AllocationMap = DefinitionLoader.loadAllocationMap(CompareScript, Threads, Globals=ScriptGlobals)
+        hopCost, overload = Mapper.evaluate(AllocationMap)
+        print(CompareScript + ": weighted hop distance = " + str(hopCost) + " Mbps x hops, overload = " +
+              str(overload) + " Mbps")
+
+    startTime = time.perf_counter()
+    Mapper.placeGreedily()
+    greedyCost = Mapper.getCost()
+    AllocationMap = Mapper.map(args.iterations, placeFlag=False)
+    hopCost, overload = Mapper.getCost()
+
+    print(args.AllocName + ": weighted hop distance = " + str(hopCost) + " Mbps x hops, overload = " + str(overload) +
+          " Mbps (greedy placement: " + str(greedyCost[0]) + " Mbps x hops, overload = " + str(greedyCost[1]) +
+          " Mbps), mapped in " + "{:.2f}".format(time.perf_counter() - startTime) + " s")
+
+    FileName = os.path.join("AllocationMaps", args.AllocName + (".json" if args.JSONFormat else ".py"))
+    ThreadMapper.writeAllocationMap(FileName, AllocationMap, Threads, args.JSONFormat)
+    print("Allocation map written to " + FileName)
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+import os
+import time
+import argparse
+from Sources import TrafficSimulator
+
+
+# Expects as arguments: $1 = Path to flow folder made by FlowGenerator.py (e.g. "Flows/H16_100 PIP/flow") ; [--time ns]
+# ; [--output path] ; [--router-latency cycles] ; [--buffer-depth flits]
+def main():
+
+    parser = argparse.ArgumentParser(description="Simulates a platform with a cycle-approximate model of its routers, "
+                                                 "buses, crossbars and injectors, writing In and Out logs to be read "
+                                                 "by LogParser")
+    parser.add_argument("FlowPath", help="flow folder made by FlowGenerator.py, holding PlatformConfig.json")
+    parser.add_argument("--time", type=int, default=1000000, dest="endTime", help="simulated time, in ns")
+    parser.add_argument("--output", dest="LogPath",
+                        help="folder logs are written to (default: Logs folder next to flow folder)")
+    parser.add_argument("--router-latency", type=int, default=4, dest="routerLatency",
+                        help="cycles a message header spends at each hop without contention")
+    parser.add_argument("--buffer-depth", type=int, default=4, dest="bufferDepth",
+                        help="flits buffered at each hop")
+    args = parser.parse_args()
+
+    LogPath = args.LogPath if args.LogPath is not None else \
+        os.path.join(os.path.dirname(os.path.normpath(args.FlowPath)), "Logs")
+
+    Simulator = TrafficSimulator.TrafficSimulator(args.FlowPath, routerLatency=args.routerLatency,
+                                                  bufferDepth=args.bufferDepth)
+
+    startTime = time.perf_counter()
+    Simulator.run(args.endTime)
+    elapsedTime = time.perf_counter() - startTime
+
+    amountOfMessagesSent, amountOfMessagesReceived = Simulator.getMessageCounts()
+    Simulator.writeLogs(LogPath)
+
+    print("Simulated " + str(args.endTime) + " ns of " + str(len(Simulator.Injectors)) + " injectors: " +
+          str(amountOfMessagesSent) + " messages sent, " + str(amountOfMessagesReceived) + " received, in " +
+          "{:.2f}".format(elapsedTime) + " s (" + "{:.0f}".format(amountOfMessagesSent / max(elapsedTime, 1e-9)) +
+          " messages per second)")
+    print("Logs of " + str(Simulator.AmountOfPEs) + " PEs written to " + LogPath)
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,12 @@
+import math
+import random
+
+
 class Application:
 
+    # Attributes live in slots (here and in Thread and Target), as synthetic applications can have thousands of threads
+    __slots__ = ("Threads", "AppID", "AppName", "ParentPlatform")
+
     def __init__(self, AppName):
         self.Threads = []
         self.AppID = None
@@ -20,6 +27,8 @@ class Application:
 
 class Thread:
 
+    __slots__ = ("Targets", "ThreadID", "ParentApplication", "TotalBandwidth")
+
     def __init__(self):
 
         self.Targets = []
@@ -42,6 +51,8 @@ class Thread:
 
 class Target:
 
+    __slots__ = ("TargetThread", "SourceThread", "Bandwidth")
+
     def __init__(self, TargetThread, Bandwidth):
 
         self.TargetThread = TargetThread
@@ -51,3 +62,162 @@ class Target:
 
     def __str__(self):
         pass
+
+
+# Returns an application named AppName with a thread per PE of given platform, and ( x, y ) coordinates of each thread
+# in the square NoC addressed by PEPos values (see Platform.updatePEAddresses). Thread i is meant to be allocated at the
+# i-th lowest PEPos value (see getPatternAllocationMap)
+def makePatternThreads(Platform, AppName):
+
+    squareNoCBound = math.ceil(math.sqrt(Platform.AmountOfPEs))
+
+    PatternApplication = Application(AppName=AppName)
+    for i in range(len(Platform.PEs)):
+        PatternApplication.addThread(Thread())
+
+    return PatternApplication, [(PEPos % squareNoCBound, PEPos // squareNoCBound) for PEPos in sorted(Platform.PEs)]
+
+
+# Returns allocation map ( dict mapping PEPos values to Thread objects ) of a traffic pattern application made for given
+# platform, its i-th thread being allocated at the i-th lowest PEPos value
+def getPatternAllocationMap(Platform, PatternApplication):
+    return dict(zip(sorted(Platform.PEs), PatternApplication.Threads))
+
+
+# Adds a target to thread i of given application for every thread index in TargetLists[i], splitting given bandwidth
+# (in Mbps) evenly among every flow. Flow bandwidths are whole Mbps, the first flows getting an extra Mbps when
+# bandwidth isn't a multiple of the amount of flows
+def addPatternTargets(PatternApplication, TargetLists, bandwidth):
+
+    amountOfFlows = sum(len(TargetIndexes) for TargetIndexes in TargetLists)
+    if amountOfFlows == 0:
+        return
+
+    if bandwidth < amountOfFlows:
+        raise ValueError("Bandwidth of " + str(bandwidth) + " Mbps can't be split among " + str(amountOfFlows) +
+                         " flows of application \"" + PatternApplication.AppName + "\" (1 Mbps at least per flow)")
+
+    flowBandwidth, remainder = divmod(int(bandwidth), amountOfFlows)
+    Threads = PatternApplication.Threads
+
+    for i, TargetIndexes in enumerate(TargetLists):
+        for target in TargetIndexes:
+            Threads[i].addTarget(Target(TargetThread=Threads[target], Bandwidth=flowBandwidth + (remainder > 0)))
+            remainder -= 1
+
+
+# Returns, for each of amountOfThreads threads, amountOfTargets distinct other threads drawn at random. Threads in
+# ExcludedLists[i] (if given) are never drawn for thread i
+def getRandomTargets(rng, amountOfThreads, amountOfTargets, ExcludedLists=None):
+
+    TargetLists = []
+
+    for i in range(amountOfThreads):
+
+        # Draws among the threads left, then skips excluded thread indexes, in increasing order
+        Skipped = sorted({i} | set(ExcludedLists[i] if ExcludedLists is not None else []))
+        amountOfCandidates = amountOfThreads - len(Skipped)
+        TargetList = []
+
+        for target in rng.sample(range(amountOfCandidates), min(amountOfTargets, amountOfCandidates)):
+            for skipped in Skipped:
+                if target >= skipped:
+                    target += 1
+            TargetList.append(target)
+
+        TargetLists.append(TargetList)
+
+    return TargetLists
+
+
+# The functions below make synthetic traffic pattern applications, with a thread per PE of given platform sending a
+# total of bandwidth Mbps (summed over every flow). Threads are to be allocated by getPatternAllocationMap. Every
+# pattern but all-to-all makes a number of flows linear in the amount of PEs
+
+# Uniform random traffic: every thread sends to amountOfTargets distinct threads drawn at random
+def makeUniformRandom(Platform, bandwidth, amountOfTargets=4, Seed=0, AppName="UniformRandom"):
+
+    PatternApplication, Coordinates = makePatternThreads(Platform, AppName)
+    addPatternTargets(PatternApplication, getRandomTargets(random.Random(Seed), len(Coordinates), amountOfTargets),
+                      bandwidth)
+
+    return PatternApplication
+
+
+# Transpose traffic: the thread at ( x, y ) sends to the thread at ( y, x ). Threads on the diagonal, or whose
+# transposed position holds no PE, send nothing
+def makeTranspose(Platform, bandwidth, AppName="Transpose"):
+
+    PatternApplication, Coordinates = makePatternThreads(Platform, AppName)
+    Indexes = {Coordinate: i for i, Coordinate in enumerate(Coordinates)}
+
+    addPatternTargets(PatternApplication, [[Indexes[(y, x)]] if x != y and (y, x) in Indexes else []
+                                           for x, y in Coordinates], bandwidth)
+
+    return PatternApplication
+
+
+# Bit-complement traffic: the thread at PEPos value p sends to the thread at PEPos value ~p, i.e. at ( S - 1 - x,
+# S - 1 - y ) in a square NoC of side S (the same for any S, not only powers of 2). Threads whose complement holds no PE
+# send nothing
+def makeBitComplement(Platform, bandwidth, AppName="BitComplement"):
+
+    PatternApplication, Coordinates = makePatternThreads(Platform, AppName)
+    Indexes = {Coordinate: i for i, Coordinate in enumerate(Coordinates)}
+    squareNoCBound = math.ceil(math.sqrt(Platform.AmountOfPEs))
+
+    TargetLists = []
+    for x, y in Coordinates:
+        Complement = (squareNoCBound - 1 - x, squareNoCBound - 1 - y)
+        TargetLists.append([Indexes[Complement]] if Complement != (x, y) and Complement in Indexes else [])
+
+    addPatternTargets(PatternApplication, TargetLists, bandwidth)
+
+    return PatternApplication
+
+
+# Hotspot traffic: every thread sends to amountOfTargets threads drawn at random, and every thread but the hotspots
+# also sends to each of amountOfHotspots hotspot threads (drawn at random). Hotspot flows get hotspotShare of bandwidth.
+# Threads sending to the hotspots draw their random targets among the other threads, so no flow is made twice
+def makeHotspot(Platform, bandwidth, amountOfHotspots=1, hotspotShare=0.5, amountOfTargets=4, Seed=0,
+                AppName="Hotspot"):
+
+    PatternApplication, Coordinates = makePatternThreads(Platform, AppName)
+    rng = random.Random(Seed)
+
+    Hotspots = rng.sample(range(len(Coordinates)), min(amountOfHotspots, len(Coordinates)))
+    HotspotSet = set(Hotspots)
+
+    HotspotLists = [Hotspots if i not in HotspotSet else [] for i in range(len(Coordinates))]
+
+    hotspotBandwidth = int(bandwidth * hotspotShare)
+    addPatternTargets(PatternApplication, HotspotLists, hotspotBandwidth)
+    addPatternTargets(PatternApplication, getRandomTargets(rng, len(Coordinates), amountOfTargets, HotspotLists),
+                      bandwidth - hotspotBandwidth)
+
+    return PatternApplication
+
+
+# Nearest-neighbor traffic: every thread sends to the threads next to it (up to 4) in the square NoC
+def makeNearestNeighbor(Platform, bandwidth, AppName="NearestNeighbor"):
+
+    PatternApplication, Coordinates = makePatternThreads(Platform, AppName)
+    Indexes = {Coordinate: i for i, Coordinate in enumerate(Coordinates)}
+
+    addPatternTargets(PatternApplication, [[Indexes[Neighbor] for Neighbor in ((x + 1, y), (x, y + 1), (x - 1, y),
+                                                                                (x, y - 1)) if Neighbor in Indexes]
+                                           for x, y in Coordinates], bandwidth)
+
+    return PatternApplication
+
+
+# All-to-all traffic: every thread sends to every other thread (a number of flows quadratic in the amount of PEs)
+def makeAllToAll(Platform, bandwidth, AppName="AllToAll"):
+
+    PatternApplication, Coordinates = makePatternThreads(Platform, AppName)
+    amountOfThreads = len(Coordinates)
+
+    addPatternTargets(PatternApplication, [list(range(i)) + list(range(i + 1, amountOfThreads))
+                                           for i in range(amountOfThreads)], bandwidth)
+
+    return PatternApplication
@@ -0,0 +1,190 @@
+import os
+import json
+from importlib.machinery import SourceFileLoader
+from . import PlatformComposer
+from . import AppComposer
+
+
+# Setups, applications and allocation maps are defined either by a Python script (as in the Setups, Applications and
+# AllocationMaps folders) or by a declarative JSON file of the same name, which takes precedence over the script:
+#
+#   Setups/<Name>.json:         {"BaseNoCDimensions": [6, 5],
+#                                "Structures": [{"Type": "Crossbar", "AmountOfPEs": 15,
+#                                                "WrapperLocationInBaseNoc": [0, 4]}, ...]}
+#
+#   Applications/<Name>.json:   {"Applications": [{"AppName": "PIP",
+#                                                  "Threads": {"InpMemA": [{"Target": "HS", "Bandwidth": 128}],
+#                                                              "HS": [{"Target": "VS", "Bandwidth": 64}], ...}}]}
+#
+#   AllocationMaps/<Name>.json: {"AllocationMap": {"0": "InpMemA", "1": "HS", ...}}
+#
+# Thread names must be unique among every application of a file, as allocation maps refer to threads by name (just as
+# allocation map scripts refer to the thread variables made by application scripts). Every loader call builds new
+# objects, so platforms can be loaded any amount of times in the same process
+
+
+# Code objects of definition scripts, by ( path, size, modification time ). SourceFileLoader also keeps their bytecode
+# in __pycache__, so a script is only compiled again across runs if it changed
+CompiledDefinitions = dict()
+
+# Parsed JSON definitions, by ( path, size, modification time )
+ParsedDefinitions = dict()
+
+
+# Returns path of the definition of given name in given folder (JSON file if there is one, Python script otherwise)
+def findDefinition(Folder, Name):
+
+    for extension in (".json", ".py"):
+        if os.path.isfile(os.path.join(Folder, Name + extension)):
+            return os.path.join(Folder, Name + extension)
+
+    raise FileNotFoundError("No definition named \"" + Name + "\" found at " + Folder + " directory")
+
+
+def getDefinitionKey(DefinitionPath):
+
+    FileStatus = os.stat(DefinitionPath)
+    return os.path.abspath(DefinitionPath), FileStatus.st_size, FileStatus.st_mtime_ns
+
+
+# Returns compiled code of a definition script
+def getCompiledDefinition(ScriptPath):
+
+    key = getDefinitionKey(ScriptPath)
+
+    if key not in CompiledDefinitions:
+        name = os.path.splitext(os.path.basename(ScriptPath))[0]
+        CompiledDefinitions[key] = SourceFileLoader(name, key[0]).get_code(name)
+
+    return CompiledDefinitions[key]
+
+
+# Returns content of a JSON definition (shared between calls, must not be modified)
+def getParsedDefinition(JSONPath):
+
+    key = getDefinitionKey(JSONPath)
+
+    if key not in ParsedDefinitions:
+        with open(JSONPath, 'r') as JSONFile:
+            ParsedDefinitions[key] = json.load(JSONFile)
+
+    return ParsedDefinitions[key]
+
+
+# Runs a definition script in a new namespace holding given globals, returns that namespace
+def runDefinitionScript(ScriptPath, Globals=None):
+
+    Namespace = dict(Globals) if Globals is not None else dict()
+    exec(getCompiledDefinition(ScriptPath), Namespace)
+
+    return Namespace
+
+
+# Returns Platform object of given setup
+def loadSetup(Name, ReferenceClock, Folder="Setups"):
+
+    DefinitionPath = findDefinition(Folder, Name)
+
+    if DefinitionPath.endswith(".py"):
+        return runDefinitionScript(DefinitionPath, {"ReferenceClock": ReferenceClock})["Setup"]
+
+    Definition = getParsedDefinition(DefinitionPath)
+    Setup = PlatformComposer.Platform(tuple(Definition["BaseNoCDimensions"]), ReferenceClock=ReferenceClock)
+
+    for StructureDefinition in Definition.get("Structures", []):
+
+        if StructureDefinition["Type"] == "Bus":
+            NewStructure = PlatformComposer.Bus(StructureDefinition["AmountOfPEs"])
+        elif StructureDefinition["Type"] == "Crossbar":
+            NewStructure = PlatformComposer.Crossbar(StructureDefinition["AmountOfPEs"])
+        else:
+            raise ValueError("Unknown structure type \"" + str(StructureDefinition["Type"]) + "\" in " + DefinitionPath)
+
+        Setup.addStructure(NewStructure=NewStructure,
+                           WrapperLocationInBaseNoc=tuple(StructureDefinition["WrapperLocationInBaseNoc"]))
+
+    return Setup
+
+
+# Returns ( list of Application objects, dict mapping each thread name to its Thread object ) of given application
+# definition. Scripts are run with given globals available (e.g. Setup and ReferenceClock). Threads a script didn't
+# name (e.g. made by a traffic pattern generator of AppComposer) are named after their application and ThreadID
+def loadApplications(Name, Folder="Applications", Globals=None):
+
+    DefinitionPath = findDefinition(Folder, Name)
+
+    if DefinitionPath.endswith(".py"):
+
+        Namespace = runDefinitionScript(DefinitionPath, Globals)
+        Threads = {ThreadName: Thread for ThreadName, Thread in Namespace.items()
+                   if isinstance(Thread, AppComposer.Thread)}
+
+        NamedThreads = set(id(Thread) for Thread in Threads.values())
+        for Application in Namespace["Applications"]:
+            for Thread in Application.Threads:
+                if id(Thread) not in NamedThreads:
+                    Threads.setdefault(Application.AppName + "_" + str(Thread.ThreadID), Thread)
+
+        return Namespace["Applications"], Threads
+
+    Definition = getParsedDefinition(DefinitionPath)
+    Applications = []
+    Threads = dict()
+
+    # Makes every thread first, as targets may refer to threads defined further on (or in another application)
+    for ApplicationDefinition in Definition["Applications"]:
+
+        NewApplication = AppComposer.Application(AppName=ApplicationDefinition["AppName"])
+        Applications.append(NewApplication)
+
+        for ThreadName in ApplicationDefinition["Threads"]:
+
+            if ThreadName in Threads:
+                raise ValueError("Thread \"" + ThreadName + "\" defined more than once in " + DefinitionPath)
+
+            Threads[ThreadName] = AppComposer.Thread()
+            NewApplication.addThread(Threads[ThreadName])
+
+    for ApplicationDefinition in Definition["Applications"]:
+        for ThreadName, TargetDefinitions in ApplicationDefinition["Threads"].items():
+            for TargetDefinition in TargetDefinitions:
+                Threads[ThreadName].addTarget(AppComposer.Target(TargetThread=Threads[TargetDefinition["Target"]],
+                                                                 Bandwidth=TargetDefinition["Bandwidth"]))
+
+    return Applications, Threads
+
+
+# Returns allocation map ( dict mapping PEPos values to Thread objects ) of given definition. Threads are looked up by
+# name in given Threads dict. Scripts are run with every thread and given globals available (e.g. Setup and the list of
+# Applications)
+def loadAllocationMap(Name, Threads, Folder="AllocationMaps", Globals=None):
+
+    DefinitionPath = findDefinition(Folder, Name)
+
+    if DefinitionPath.endswith(".py"):
+        Namespace = dict(Globals) if Globals is not None else dict()
+        Namespace.update(Threads)
+        return runDefinitionScript(DefinitionPath, Namespace)["AllocationMap"]
+
+    Definition = getParsedDefinition(DefinitionPath)
+
+    return {int(PEPos): Threads[ThreadName] for PEPos, ThreadName in Definition["AllocationMap"].items()}
+
+
+# Returns ( Platform object, list of Application objects ) of given setup running given applications, mapped by given
+# allocation map (as FlowGenerator.py does, PE and Injector objects are only made by Platform.mapToPlatform()).
+# Definitions are looked up in the Setups, Applications and AllocationMaps folders under Root
+def loadFlow(SetupName, AppName, AllocName, ReferenceClock, Root="."):
+
+    Setup = loadSetup(SetupName, ReferenceClock, os.path.join(Root, "Setups"))
+
+    Globals = {"ReferenceClock": ReferenceClock, "Setup": Setup}
+    Applications, Threads = loadApplications(AppName, os.path.join(Root, "Applications"), Globals)
+    Globals["Applications"] = Applications
+    AllocationMap = loadAllocationMap(AllocName, Threads, os.path.join(Root, "AllocationMaps"), Globals)
+
+    for Application in Applications:
+        Setup.addApplication(Application)
+    Setup.setAllocationMap(AllocationMap)
+
+    return Setup, Applications
@@ -0,0 +1,216 @@
+import math
+
+
+class LoadEstimator:
+
+    # Constructor. Estimates link loads of a platform whose Injector objects are made (see Platform.mapToPlatform),
+    # every element running at platform reference clock. routerLatency is the amount of cycles a header spends at each
+    # hop (router, bus or crossbar) before being forwarded, with no contention
+    def __init__(self, Platform, routerLatency=4):
+
+        self.Platform = Platform
+        self.routerLatency = routerLatency
+
+        # Link bandwidth (in Mbps) of a 32 bit wide link at reference clock, as assumed by Injector
+        self.LinkBandwidth = 32 * Platform.ReferenceClock
+
+        # Flits per clock cycle carried by every link used by some flow, by link (see getRoute)
+        self.LinkLoads = dict()
+
+        # ( source PEPos, target PEPos, flits per cycle, message size in flits, route ) of every flow
+        self.Flows = []
+
+        # "Bus" or "Crossbar", by base NoC address of each wrapper
+        self.StructureTypes = {Structure.AddressInBaseNoC: Structure.StructureType
+                               for Structure in Platform.Buses + Platform.Crossbars}
+
+    # Returns links used by a message from source PE to target PE (see getRoute)
+    def getRoute(self, sourcePEPos, targetPEPos):
+        return getRoute(sourcePEPos, targetPEPos, self.Platform.WrapperAddresses, self.StructureTypes,
+                        self.Platform.BaseNoCDimensions)
+
+    # Returns probability of each target of an injector being chosen at the end of a burst. Random flows pick
+    # integer(RandomNumber * (AmountOfTargetPEs - 1)), which rounds, so first and last targets are picked half as often
+    @staticmethod
+    def getTargetProbabilities(Injector):
+
+        amountOfTargets = len(Injector.TargetPEs)
+
+        if Injector.FlowType != "RND" or amountOfTargets == 1:
+            return [1 / amountOfTargets] * amountOfTargets
+
+        Probabilities = [1 / (amountOfTargets - 1)] * amountOfTargets
+        Probabilities[0] /= 2
+        Probabilities[-1] /= 2
+
+        return Probabilities
+
+    # Returns ( message size in flits, flits per cycle ) sent to each target of an injector. A fixed rate injector sends
+    # a message of M flits then idles ( M * 100 / InjectionRate ) - M + 2 cycles (none at 100%), bursts of messages
+    # going to a random target
+    def getInjectorFlows(self, Injector):
+
+        Probabilities = self.getTargetProbabilities(Injector)
+        MessageSizes = [payloadSize + Injector.HeaderSize for payloadSize in Injector.TargetPayloadSize]
+
+        # Share of messages sent to each target, and cycles taken by each message
+        Shares = [Probabilities[k] * Injector.AmountOfMessagesInBurst[k] for k in range(len(Probabilities))]
+        Periods = [messageSize if Injector.InjectionRate == 100 else (messageSize * 100) // Injector.InjectionRate + 2
+                   for messageSize in MessageSizes]
+        averagePeriod = sum(Shares[k] * Periods[k] for k in range(len(Shares)))
+
+        return [(MessageSizes[k], Shares[k] * MessageSizes[k] / averagePeriod) for k in range(len(Shares))]
+
+    # Routes every flow of every injector with a non-zero injection rate, adding up link loads
+    def estimate(self):
+
+        self.LinkLoads = dict()
+        self.Flows = []
+
+        for sourcePEPos, Injector in sorted(self.Platform.Injectors.items()):
+
+            if Injector.InjectionRate == 0 or Injector.InjectorType != "FXD":
+                continue
+
+            for targetPEPos, (messageSize, flitRate) in zip(Injector.TargetPEs, self.getInjectorFlows(Injector)):
+
+                Route = self.getRoute(sourcePEPos, targetPEPos)
+                self.Flows.append((sourcePEPos, targetPEPos, flitRate, messageSize, Route))
+
+                for Link in Route:
+                    self.LinkLoads[Link] = self.LinkLoads.get(Link, 0) + flitRate
+
+        return self
+
+    # Returns estimated latency (in cycles) of a message of given size along given route: header latency plus
+    # M/M/1 queueing delay (rho / (1 - rho) messages ahead) at every hop, plus serialization of the message. Returns
+    # infinity if a link of the route is saturated
+    def getLatency(self, Route, messageSize):
+
+        latency = messageSize
+
+        for Link in Route:
+
+            utilization = self.LinkLoads.get(Link, 0)
+
+            if utilization >= 1:
+                return math.inf
+
+            latency += self.routerLatency + (utilization / (1 - utilization)) * messageSize
+
+        return latency
+
+    # Returns ( name, utilization ) of every structure (its bus medium or busiest crossbar port and its wrapper's
+    # router local ports), in base NoC order
+    def getStructureUtilizations(self):
+
+        Utilizations = []
+
+        for y in range(self.Platform.BaseNoCDimensions[1]):
+            for x in range(self.Platform.BaseNoCDimensions[0]):
+
+                address = y * self.Platform.BaseNoCDimensions[0] + x
+                if address not in self.StructureTypes:
+                    continue
+
+                utilization = max([load for Link, load in self.LinkLoads.items()
+                                   if Link[0] in ("Bus", "Crossbar", "Local") and Link[1] == address], default=0)
+                Utilizations.append((self.StructureTypes[address] + " @ " + str(address), utilization))
+
+        return Utilizations
+
+    # Returns a readable name of a link
+    @staticmethod
+    def getLinkName(Link):
+
+        if Link[0] == "Router":
+            return "Router " + str(Link[1]) + " -> " + str(Link[2])
+
+        if Link[0] == "Local":
+            return "Router " + str(Link[1]) + (" local in" if Link[2] == "In" else " local out")
+
+        if Link[0] == "Bus":
+            return "Bus @ " + str(Link[1])
+
+        return "Crossbar @ " + str(Link[1]) + (" -> bridge" if Link[2] == "Bridge" else " -> PE " + str(Link[2]))
+
+    # Returns estimate as a serializable dict. Utilization is given as a fraction of link bandwidth, latencies in cycles
+    # and ns
+    def toDict(self):
+
+        clockPeriod = 1000 / self.Platform.ReferenceClock  # In ns
+
+        FlowDicts = []
+        for sourcePEPos, targetPEPos, flitRate, messageSize, Route in self.Flows:
+            latency = self.getLatency(Route, messageSize)
+            FlowDicts.append({"Source": sourcePEPos, "Target": targetPEPos, "Mbps": flitRate * self.LinkBandwidth,
+                              "Hops": len(Route), "LatencyInCycles": latency if latency != math.inf else None,
+                              "LatencyInNs": latency * clockPeriod if latency != math.inf else None})
+
+        return {
+            "LinkBandwidth": self.LinkBandwidth,
+            "Links": [{"Link": self.getLinkName(Link), "Utilization": load, "Mbps": load * self.LinkBandwidth}
+                      for Link, load in sorted(self.LinkLoads.items(), key=lambda Item: -Item[1])],
+            "Structures": [{"Structure": name, "Utilization": utilization}
+                           for name, utilization in self.getStructureUtilizations()],
+            "Flows": FlowDicts
+        }
+
+
+# Returns links used by a message from source PE to target PE. Links are tuples:
+#   ( "Router", a, b ): Hermes link from router at base NoC address a to its neighbor at address b
+#   ( "Local", a, "In" ) / ( "Local", a, "Out" ): local port of router at base NoC address a, from / to its PE or
+#   wrapper
+#   ( "Bus", a ): medium of bus wrapped at base NoC address a, shared by every PE and its bridge
+#   ( "Crossbar", a, PEPos ): crossbar (wrapped at base NoC address a) output port to given PE, or to its bridge if
+#   PEPos is "Bridge"
+# Messages are routed by XY routing (X first) between the routers their source and target wrappers are attached to.
+# WrapperAddresses maps a PEPos value to its wrapper's base NoC address and StructureTypes maps the base NoC address of
+# each wrapper to "Bus" or "Crossbar"
+def getRoute(sourcePEPos, targetPEPos, WrapperAddresses, StructureTypes, BaseNoCDimensions):
+
+    sourceAddress = WrapperAddresses[sourcePEPos]
+    targetAddress = WrapperAddresses[targetPEPos]
+    sourceStructureType = StructureTypes.get(sourceAddress)
+    targetStructureType = StructureTypes.get(targetAddress)
+
+    # Messages between PEs of the same structure never reach the NoC
+    if sourceStructureType is not None and sourceAddress == targetAddress:
+        return [getStructureLink(sourceStructureType, sourceAddress, targetPEPos)]
+
+    Route = []
+
+    if sourceStructureType is not None:
+        Route.append(getStructureLink(sourceStructureType, sourceAddress, "Bridge"))
+
+    Route.append(("Local", sourceAddress, "In"))
+
+    x, y = sourceAddress % BaseNoCDimensions[0], sourceAddress // BaseNoCDimensions[0]
+    targetX, targetY = targetAddress % BaseNoCDimensions[0], targetAddress // BaseNoCDimensions[0]
+
+    while (x, y) != (targetX, targetY):
+
+        address = y * BaseNoCDimensions[0] + x
+
+        if x != targetX:
+            x += 1 if targetX > x else -1
+        else:
+            y += 1 if targetY > y else -1
+
+        Route.append(("Router", address, y * BaseNoCDimensions[0] + x))
+
+    Route.append(("Local", targetAddress, "Out"))
+
+    if targetStructureType is not None:
+        Route.append(getStructureLink(targetStructureType, targetAddress, targetPEPos))
+
+    return Route
+
+
+# Returns link of a structure of given type wrapped at given base NoC address, towards given PE (or its bridge)
+def getStructureLink(StructureType, address, PEPos):
+
+    if StructureType == "Bus":
+        return "Bus", address
+
+    return "Crossbar", address, PEPos
@@ -1,8 +1,8 @@
 import json
 import random
+import hashlib
 import os
 import math
-import copy
 import sys
 from . import AppComposer
 
@@ -13,12 +13,14 @@ class Platform:
     def __init__(self, BaseNoCDimensions, ReferenceClock):
 
         self.AllocationMap = dict()
+        self.ThreadPEPos = dict()  # Maps an (AppID, ThreadID) pair to the PEPos value its thread is allocated at
         self.Applications = []
         self.BaseNoCDimensions = BaseNoCDimensions
-        self.BaseNoC = [[None for x in range(BaseNoCDimensions[0])] for y in range(BaseNoCDimensions[1])]
-        self.PEs = dict()
+        self.BaseNoC = [[None for y in range(BaseNoCDimensions[1])] for x in range(BaseNoCDimensions[0])]  # [x][y]
+        self._PEs = dict()  # Maps a PEPos value to its PE object (see PEs property)
         self.Injectors = dict()
-        self.WrapperAddresses = dict()  # Maps a PEPos value to its wrapper's address in base NoC
+        self._WrapperAddresses = dict()  # Maps a PEPos value to its wrapper's address in base NoC
+        self.AddressesOutdated = False  # Set when a structure is added, until PEPos values are updated
         self.AmountOfPEs = BaseNoCDimensions[0] * BaseNoCDimensions[1]
         self.AmountOfWrappers = 0
         self.AmountOfBuses = 0
@@ -38,11 +40,31 @@ class Platform:
             for x in range(BaseNoCDimensions[0]):
 
                 self.BaseNoC[x][y] = PE(PEPos=i, AppID=None, ThreadID=None, InjectorClockPeriod=self.ReferenceClock)
-                self.PEs[i] = self.BaseNoC[x][y]
+                self._PEs[i] = self.BaseNoC[x][y]
+                self._WrapperAddresses[i] = i
 
                 i += 1
 
 
+    # PE objects by PEPos value. PEPos values are only updated once every structure is added, when PEs or
+    # WrapperAddresses are first read
+    @property
+    def PEs(self):
+
+        if self.AddressesOutdated:
+            self.updatePEAddresses()
+
+        return self._PEs
+
+    @property
+    def WrapperAddresses(self):
+
+        if self.AddressesOutdated:
+            self.updatePEAddresses()
+
+        return self._WrapperAddresses
+
+
     # Adds structure (Bus or Crossbar) to base NoC
     def addStructure(self, NewStructure, WrapperLocationInBaseNoc: tuple):
 
@@ -50,8 +72,7 @@ class Platform:
         if isinstance(self.BaseNoC[WrapperLocationInBaseNoc[0]][WrapperLocationInBaseNoc[1]], Structure):
 
             # There already is a wrapper at this position in base NoC
-            print("Error: There already is a wrapper at given location " + str(WrapperLocationInBaseNoc) + " \n")
-            exit(1)
+            raise ValueError("There already is a wrapper at given location " + str(WrapperLocationInBaseNoc))
 
         else:
 
@@ -76,123 +97,127 @@ class Platform:
 
             NewStructure.AddressInBaseNoC = (WrapperLocationInBaseNoc[1] * self.BaseNoCDimensions[0]) + WrapperLocationInBaseNoc[0]
 
-            # Updates all PEPos values (platform-wide)
-            self.updatePEAddresses()
+            # PEPos values (platform-wide) are updated when next read
+            self.AddressesOutdated = True
 
 
-    # Sets PEPos values according to the square NoC algorithm
+    # Sets PEPos values according to the square NoC algorithm. Base NoC elements (PEs and the first PE of each wrapper's
+    # structure) are addressed by their base NoC coordinates, then the remaining PEs of each structure (in base NoC
+    # order) fill shells around the base NoC (see getShellPosition). Both are addressed in a square NoC of side
+    # ceil(sqrt(AmountOfPEs)), so a single pass over every PE is needed
     def updatePEAddresses(self):
 
         SquareNoCBound = math.ceil(math.sqrt(self.AmountOfPEs))
 
-        # Set NoC 1st of wrapper PE addresses
-        x_base = 0
-        y_base = 0
-        x_square = 0
-        y_square = 0
-        for i in range(self.BaseNoCDimensions[0]*self.BaseNoCDimensions[1]):  # Loops through base NoC
+        self._PEs = dict()
+        self._WrapperAddresses = dict()
 
-            # Unique network ID based on square NoC algorithm
-            #PEPos = (y_square * SquareNoCBound) + x_square
-            PEPos = (y_base * SquareNoCBound) + x_base  # TODO
-            #print(str(PEPos) + " (" + str(x_base) + "," + str(y_base) + ") (" + str(x_square) + "," + str(y_square) + ")")
-            self.WrapperAddresses[PEPos] = (y_base * self.BaseNoCDimensions[0]) + x_base
-
-            # If current base NoC position is a PE (not a wrapper), set its address
-            if isinstance(self.BaseNoC[x_base][y_base], PE):
+        # Set NoC 1st of wrapper PE addresses
+        for y_base in range(self.BaseNoCDimensions[1]):
+            for x_base in range(self.BaseNoCDimensions[0]):
 
-                self.BaseNoC[x_base][y_base].PEPos = PEPos
-                self.PEs[PEPos] = self.BaseNoC[x_base][y_base]
+                PEPos = (y_base * SquareNoCBound) + x_base
+                self._WrapperAddresses[PEPos] = (y_base * self.BaseNoCDimensions[0]) + x_base
 
-            # If current base NoC position is a wrapper, sets address for the first element of its corresponding structure
-            elif isinstance(self.BaseNoC[x_base][y_base], Structure):
+                # If current base NoC position is a wrapper, sets address for the first element of its structure
+                if isinstance(self.BaseNoC[x_base][y_base], Structure):
+                    self.BaseNoC[x_base][y_base].PEs[0].PEPos = PEPos
+                    self._PEs[PEPos] = self.BaseNoC[x_base][y_base].PEs[0]
 
-                self.BaseNoC[x_base][y_base].PEs[0].PEPos = PEPos
-                self.PEs[PEPos] = self.BaseNoC[x_base][y_base].PEs[0]
+                else:
+                    self.BaseNoC[x_base][y_base].PEPos = PEPos
+                    self._PEs[PEPos] = self.BaseNoC[x_base][y_base]
 
-            # Increment base NoC x & y indexes
-            if x_base == self.BaseNoCDimensions[0] - 1:
+        # Set Remaining PEs on wrapper
+        shellIndex = 0
+        for y_base in range(self.BaseNoCDimensions[1]):
+            for x_base in range(self.BaseNoCDimensions[0]):
 
-                x_base = 0
-                y_base += 1
+                if not isinstance(self.BaseNoC[x_base][y_base], Structure):
+                    continue
 
-            else:
+                for StructurePE in self.BaseNoC[x_base][y_base].PEs[1:]:
 
-                x_base += 1
+                    x_square, y_square = self.getShellPosition(shellIndex)
+                    shellIndex += 1
 
-            # Increment square NoC x & y indexes
-            if x_square == SquareNoCBound:
+                    PEPos = (y_square * SquareNoCBound) + x_square
+                    StructurePE.PEPos = PEPos
+                    self._WrapperAddresses[PEPos] = (y_base * self.BaseNoCDimensions[0]) + x_base
+                    self._PEs[PEPos] = StructurePE
 
-                x_square = 0
-                y_square += 1
+        # The last shell may be left partly empty, or shells may not fit in the square NoC if the base NoC is not square
+        # enough. PEPos values then have gaps, which structure PEs addressed past the last PEPos value are moved into
+        # (in increasing order of both), so PEPos values always range from 0 to AmountOfPEs - 1
+        if max(self._PEs) >= self.AmountOfPEs:
 
-            else:
+            Gaps = [PEPos for PEPos in range(self.AmountOfPEs) if PEPos not in self._PEs]
+            OutOfRangePEPos = sorted(PEPos for PEPos in self._PEs if PEPos >= self.AmountOfPEs)
 
-                x_square += 1
+            if len(Gaps) != len(OutOfRangePEPos):
+                raise ValueError("Can't address " + str(self.AmountOfPEs) + " PEs on a base NoC of dimensions " +
+                                 str(self.BaseNoCDimensions) + " with the square NoC algorithm")
 
-        # Set Remaining PEs on wrapper
-        x_base = 0
-        y_base = 0
-        x_square = 0
-        y_square = self.BaseNoCDimensions[1]
-        x_square_limit = self.BaseNoCDimensions[0]
-        y_square_limit = self.BaseNoCDimensions[1]
-        for i in range(self.BaseNoCDimensions[0]*self.BaseNoCDimensions[1]):  # Loops through base NoC
+            for gap, PEPos in zip(Gaps, OutOfRangePEPos):
 
-            # If current base NoC position is a wrapper, sets address for all the elements contained in its corresponding structure, except the first
-            if isinstance(self.BaseNoC[x_base][y_base], Structure):
+                StructurePE = self._PEs.pop(PEPos)
+                StructurePE.PEPos = gap
+                self._PEs[gap] = StructurePE
+                self._WrapperAddresses[gap] = self._WrapperAddresses.pop(PEPos)
 
-                for j in range(len(self.BaseNoC[x_base][y_base].PEs) - 1):
+        self.AddressesOutdated = False
 
-                    # Update PEPos vale at current PE object
-                    PEPos = (y_square * SquareNoCBound) + x_square  # TODO
-                    #PEPos = (y_base * SquareNoCBound) + x_base  # TODO
-                    #print(str(PEPos) + " (" + str(x_base) + "," + str(y_base) + ") (" + str(x_square) + "," + str(y_square) + ")")
-                    self.BaseNoC[x_base][y_base].PEs[j + 1].PEPos = PEPos
-                    self.WrapperAddresses[PEPos] = (y_base * self.BaseNoCDimensions[0]) + x_base
 
-                    # Updates reference to current PE object at master PE dictionary
-                    self.PEs[PEPos] = self.BaseNoC[x_base][y_base].PEs[j + 1]
+    # Returns square NoC (x, y) coordinates of the i-th structure PE placed outside of the base NoC. Those PEs fill
+    # L-shaped shells around the base NoC, shell k covering row y = Y + k from x = 0 to x = X + k, then column x = X + k
+    # from y = Y + k - 1 down to y = 0 (X, Y being base NoC dimensions). Shell k holds X + Y + 1 + 2k PEs, so shells
+    # before shell k hold k * (X + Y) + k^2 PEs in total, which is solved for k
+    def getShellPosition(self, i):
 
-                    # Increment square NoC x & y indexes
-                    if x_square == x_square_limit and y_square == 0:
+        X, Y = self.BaseNoCDimensions
 
-                        x_square = 0
-                        x_square_limit += 1
-                        y_square_limit += 1
-                        y_square = y_square_limit
+        k = (math.isqrt((X + Y) * (X + Y) + 4 * i) - (X + Y)) // 2
+        offset = i - (k * (X + Y) + k * k)
 
-                    else:
+        if offset <= X + k:
+            return offset, Y + k
 
-                        if x_square < x_square_limit:
+        return X + k, Y + k - (offset - X - k)
 
-                            x_square += 1
 
-                        elif y_square > 0:
+    # Find matching PE address (PEPos) for a given Thread object
+    def getPEPos(self, Thread):
 
-                            y_square -= 1
+        ThreadKey = (Thread.ParentApplication.AppID, Thread.ThreadID)
+        PEPos = self.ThreadPEPos.get(ThreadKey)
 
-            # Increment base NoC x & y indexes
-            if x_base == self.BaseNoCDimensions[0] - 1:
+        # Rebuilds reverse index if allocation map was changed directly since it was last built
+        if PEPos is None or self.getThreadKey(self.AllocationMap.get(PEPos)) != ThreadKey:
 
-                x_base = 0
-                y_base += 1
+            self.indexAllocationMap()
+            PEPos = self.ThreadPEPos.get(ThreadKey)
 
-            else:
+            if PEPos is None:
+                print("Warning: No mathcing PE found for given thread")
 
-                x_base += 1
+        return PEPos
 
+    # Returns (AppID, ThreadID) pair of given Thread object (None if there is no Thread)
+    @staticmethod
+    def getThreadKey(Thread):
 
-    # Find matching PE address (PEPos) for a given Thread object
-    def getPEPos(self, Thread):
+        if Thread is None:
+            return None
 
-        for i in range(self.AmountOfPEs):
+        return (Thread.ParentApplication.AppID if Thread.ParentApplication is not None else None, Thread.ThreadID)
 
-            if self.AllocationMap[i].ParentApplication.AppID == Thread.ParentApplication.AppID and self.AllocationMap[i].ThreadID == Thread.ThreadID:
+    # Rebuilds reverse index of allocation map. A thread allocated at more than one PE is mapped to the lowest PEPos
+    def indexAllocationMap(self):
 
-                return i
+        self.ThreadPEPos = dict()
 
-        print("Warning: No mathcing PE found for given thread")
+        for PEPos in sorted(self.AllocationMap):
+            self.ThreadPEPos.setdefault(self.getThreadKey(self.AllocationMap[PEPos]), PEPos)
 
     # Adds an application (containing various Thread objects) to platform
     def addApplication(self, Application):
@@ -201,17 +226,35 @@ class Platform:
         Application.ParentPlatform = self
         self.Applications.append(Application)
 
+        # AppID of already allocated threads may have just been set
+        if len(self.AllocationMap) > 0:
+            self.indexAllocationMap()
+
 
     # Sets allocation map (Maps AppID and ThreadID to an unique PE)
     def setAllocationMap(self, AllocationMap):
 
         self.AllocationMap = AllocationMap
+        self.indexAllocationMap()
 
 
-    # Updates PE objects with application and thread info
-    def mapToPlatform(self):
+    # Allocates a single thread at given PE address, replacing any thread previously allocated there
+    def allocateThread(self, PEPos, Thread):
 
-        for i in range(len(self.PEs)):
+        PreviousThread = self.AllocationMap.get(PEPos)
+        self.AllocationMap[PEPos] = Thread
+
+        if PreviousThread is not None and self.ThreadPEPos.get(self.getThreadKey(PreviousThread)) == PEPos:
+            self.indexAllocationMap()
+        elif PEPos < self.ThreadPEPos.get(self.getThreadKey(Thread), PEPos + 1):
+            self.ThreadPEPos[self.getThreadKey(Thread)] = PEPos
+
+
+    # Updates PE objects with application and thread info. Injector RNG seeds are derived from Seed if given (see
+    # getInjectorSeeds()), random otherwise
+    def mapToPlatform(self, Seed=None):
+
+        for i in sorted(self.PEs):
 
             if i in self.AllocationMap:
 
@@ -219,71 +262,105 @@ class Platform:
                 Thread = self.AllocationMap[i]
                 self.PEs[i].AppID = Thread.ParentApplication.AppID
                 self.PEs[i].ThreadID = Thread.ThreadID
-                self.Injectors[i] = Injector(PEPos=self.PEs[i].PEPos, Thread=Thread, InjectorClockPeriod=self.ReferenceClock)
+                self.Injectors[i] = Injector(PEPos=self.PEs[i].PEPos, Thread=Thread,
+                                             InjectorClockPeriod=self.ReferenceClock, Seed=Seed)
 
             else:  # No thread allocated at current address, create dummy PE and Injector objects
 
                 # Creates dummy PE and Injector objects
                 self.PEs[i].AppID = 99
                 self.PEs[i].ThreadID = 99
-                self.Injectors[i] = Injector(PEPos=self.PEs[i].PEPos, Thread=AppComposer.Thread(), InjectorClockPeriod=99)
+                self.Injectors[i] = Injector(PEPos=self.PEs[i].PEPos, Thread=AppComposer.Thread(),
+                                             InjectorClockPeriod=99, Seed=Seed)
 
 
-    # Generate JSON config files for PEs, Injectors and Platform
-    def generateJSON(self, Path):
+    # Generate JSON config files for PEs, Injectors and Platform. With jobs > 1, files are serialized and written by a
+    # pool of processes, batchSize files at a time. Compact files have no indentation or whitespace. Injector payloads
+    # are run-length encoded if compactPayloads is set (not yet readable by Injector.vhd, see expandPayloads()). In
+    # incremental mode, files whose content didn't change since last generation are left untouched (content hashes are
+    # kept in FlowHashes.json). Returns amount of files written
+    def generateJSON(self, Path, jobs=1, compact=False, batchSize=64, compactPayloads=False, incremental=False):
 
-        for i in range(self.AmountOfPEs):
+        # Creates directory if it doesn't exist
+        os.makedirs(Path, exist_ok=True)
 
-            # Creates directory if it doesn't exist
-            if not os.path.exists(Path):
-                os.makedirs(Path)
+        # Lists every file to be written, as (file name, serializable dict) tuples
+        Files = []
+        for i in range(self.AmountOfPEs):
 
-            # Write Injector JSON config file
+            # Injector JSON config file
             if i in self.Injectors:
+                Files.append(("INJ" + str(i) + ".json", self.Injectors[i].toDict(compactPayloads)))
 
-                f = open(Path + "INJ" + str(i) + ".json", 'w')
-                f.write(self.Injectors[i].toJSON())
-                f.close()
-
-            # Write PE JSON config file
+            # PE JSON config file
             if i in self.PEs:
-
-                f = open(Path + "PE" + str(i) + ".json", 'w')
-                f.write(self.PEs[i].toJSON())
-                f.close()
+                Files.append(("PE" + str(i) + ".json", self.PEs[i].toDict()))
 
         # TODO: Write Platform config file
-        f = open(Path + "PlatformConfig.json", 'w')
-        f.write(self.toJSON())
-        f.close()
+        Files.append(("PlatformConfig.json", self.toDict()))
 
+        KnownHashes = readFileHashes(Path) if incremental else None
 
-    def toJSON(self):
+        if jobs > 1:
 
-        return json.dumps(self.toDict(), sort_keys=True, indent=4)
+            from concurrent.futures import ProcessPoolExecutor
 
+            Batches = [Files[i:i + batchSize] for i in range(0, len(Files), batchSize)]
+            BatchHashes = [None if KnownHashes is None else
+                           {FileName: KnownHashes.get(FileName) for FileName, SerializableDict in Batch}
+                           for Batch in Batches]
 
-    def __str__(self):
+            with ProcessPoolExecutor(max_workers=jobs) as Pool:
+                WrittenFiles = [WrittenFile for BatchFiles in Pool.map(writeJSONFiles, Batches, [Path] * len(Batches),
+                                                                       [compact] * len(Batches), BatchHashes)
+                                for WrittenFile in BatchFiles]
 
-        pass
+        else:
 
+            WrittenFiles = writeJSONFiles(Files, Path, compact, KnownHashes)
 
-#   Returns dictionary of object with serializeable attributes (for JSON generation)
-    def toDict(self):
+        if incremental:
 
-        SerializableObject = copy.deepcopy(self)
+            # Files generated last time but not anymore (e.g. the platform got smaller) are removed
+            Hashes = {FileName: contentHash for FileName, contentHash, written in WrittenFiles}
+            for FileName in set(KnownHashes) - set(Hashes):
+                if os.path.exists(Path + FileName):
+                    os.remove(Path + FileName)
 
-        del SerializableObject.PEs
-        del SerializableObject.Applications
-        del SerializableObject.Injectors
-        del SerializableObject.BaseNoC
-        del SerializableObject.AllocationMap
-        del SerializableObject.Buses
-        del SerializableObject.Crossbars
+            writeFileIfChanged(Path + "FlowHashes.json", json.dumps(Hashes, sort_keys=True, indent=4))
 
-        SerializableObject.WrapperAddresses = [self.WrapperAddresses[i] for i in range(len(self.WrapperAddresses))]
+        return sum(written for FileName, contentHash, written in WrittenFiles)
 
-        return SerializableObject.__dict__
+
+    def toJSON(self, compact=False):
+
+        return dumpJSON(self.toDict(), compact)
+
+
+    def __str__(self):
+
+        pass
+
+
+#   Returns dictionary of object with serializeable attributes (for JSON generation). Only platform-wide values are
+#   included (PEs, Injectors, structures and applications are serialized on their own)
+    def toDict(self):
+
+        return {
+            "AmountOfBuses": self.AmountOfBuses,
+            "AmountOfCrossbars": self.AmountOfCrossbars,
+            "AmountOfPEs": self.AmountOfPEs,
+            "AmountOfPEsInBuses": list(self.AmountOfPEsInBuses),
+            "AmountOfPEsInCrossbars": list(self.AmountOfPEsInCrossbars),
+            "AmountOfWrappers": self.AmountOfWrappers,
+            "BaseNoCDimensions": list(self.BaseNoCDimensions),
+            "BusWrapperIDs": [Bus.AddressInBaseNoC for Bus in self.Buses],
+            "CrossbarWrapperIDs": [Crossbar.AddressInBaseNoC for Crossbar in self.Crossbars],
+            "NUMBER_PROCESSORS_X": self.NUMBER_PROCESSORS_X,
+            "NUMBER_PROCESSORS_Y": self.NUMBER_PROCESSORS_Y,
+            "ReferenceClock": self.ReferenceClock,
+            "WrapperAddresses": [self.WrapperAddresses[i] for i in range(len(self.WrapperAddresses))]
+        }
 
 class Structure:
 
@@ -328,6 +405,10 @@ class Crossbar(Structure):
 
 class PE:
 
+    # Attributes are kept in slots instead of a per-object dict, as large platforms hold many PE objects
+    __slots__ = ("CommStructure", "InjectorType", "InjectorClockPeriod", "InBufferSize", "OutBufferSize", "PEPos",
+                 "AppID", "ThreadID", "AverageProcessingTimeInClockPulses")
+
     def __init__(self, PEPos, AppID, ThreadID, InjectorClockPeriod):
 
         self.CommStructure = "NOC"  # Default
@@ -346,14 +427,35 @@ class PE:
         self.AverageProcessingTimeInClockPulses = 1  # Default
 
 
-    def toJSON(self):
+    # Returns dictionary of serializable attributes (for JSON generation)
+    def toDict(self):
+
+        return {
+            "AppID": self.AppID,
+            "AverageProcessingTimeInClockPulses": self.AverageProcessingTimeInClockPulses,
+            "CommStructure": self.CommStructure,
+            "InBufferSize": self.InBufferSize,
+            "InjectorClockPeriod": self.InjectorClockPeriod,
+            "InjectorType": self.InjectorType,
+            "OutBufferSize": self.OutBufferSize,
+            "PEPos": self.PEPos,
+            "ThreadID": self.ThreadID
+        }
 
-        return json.dumps(self.__dict__, sort_keys=True, indent=4)
+
+    def toJSON(self, compact=False):
+
+        return dumpJSON(self.toDict(), compact)
 
 
 class Injector:
 
-    def __init__(self, PEPos, Thread, InjectorClockPeriod):
+    __slots__ = ("PEPos", "AppID", "ThreadID", "InjectionRate", "TargetPEs", "AmountOfMessagesInBurst",
+                 "TargetPayloadSize", "SourcePEs", "SourcePayloadSize", "AmountOfSourcePEs", "AmountOfTargetPEs",
+                 "AverageProcessingTimeInClockPulses", "InjectorType", "FlowType", "HeaderSize", "timestampFlag",
+                 "amountOfMessagesSentFlag", "RNGSeed1", "RNGSeed2", "Headers", "EncodedPayloads")
+
+    def __init__(self, PEPos, Thread, InjectorClockPeriod, Seed=None):
 
         # Gets position value from AllocationTable dictionary
         self.PEPos = PEPos
@@ -411,31 +513,203 @@ class Injector:
         self.HeaderSize = 2  # Default
         self.timestampFlag = 1984626850  # Default
         self.amountOfMessagesSentFlag = 2101596287  # Default
-        self.RNGSeed1 = random.randint(0, 2147483646)  # Random Value
-        self.RNGSeed2 = random.randint(0, 2147483646)  # Random Value
+
+        if Seed is None:
+            self.RNGSeed1 = random.randint(0, 2147483646)  # Random Value
+            self.RNGSeed2 = random.randint(0, 2147483646)  # Random Value
+        else:
+            self.RNGSeed1, self.RNGSeed2 = getInjectorSeeds(Seed, self.PEPos, self.AppID, self.ThreadID)
 
         self.Headers = dict()
-        self.Payloads = dict()
+        self.EncodedPayloads = dict()  # Run-length encoded payload of each target (see encodePayload())
 
         for i in range(len(self.TargetPEs)):
 
-            payloads_aux = [  # Default
-                "PEPOS",
-                "TMSTP",
-                "RANDO",
-                "RANDO",
-                "RANDO",
-                "RANDO",
-            ]
+            self.Headers["Header" + str(self.TargetPEs[i])] = ["ADDR", "SIZE"]  # Default
+            self.EncodedPayloads["Payload" + str(self.TargetPEs[i])] = getDefaultPayload(int(self.TargetPayloadSize[i]))
+
+
+    # Payload flit flags of each target, expanded on demand from their run-length encoding
+    @property
+    def Payloads(self):
+
+        return {PayloadKey: decodePayload(EncodedPayload)
+                for PayloadKey, EncodedPayload in self.EncodedPayloads.items()}
+
+    @Payloads.setter
+    def Payloads(self, Payloads):
+
+        self.EncodedPayloads = {PayloadKey: encodePayload(Payload) for PayloadKey, Payload in Payloads.items()}
+
+
+    # Returns dictionary of serializable attributes (for JSON generation). Payloads are expanded into one flag per flit,
+    # as read by Injector.vhd, unless compactPayloads is set
+    def toDict(self, compactPayloads=False):
+
+        SerializableDict = {
+            "AmountOfMessagesInBurst": self.AmountOfMessagesInBurst,
+            "AmountOfSourcePEs": self.AmountOfSourcePEs,
+            "AmountOfTargetPEs": self.AmountOfTargetPEs,
+            "AppID": self.AppID,
+            "AverageProcessingTimeInClockPulses": self.AverageProcessingTimeInClockPulses,
+            "FlowType": self.FlowType,
+            "HeaderSize": self.HeaderSize,
+            "Headers": self.Headers,
+            "InjectionRate": self.InjectionRate,
+            "InjectorType": self.InjectorType,
+            "PEPos": self.PEPos,
+            "RNGSeed1": self.RNGSeed1,
+            "RNGSeed2": self.RNGSeed2,
+            "SourcePEs": self.SourcePEs,
+            "SourcePayloadSize": self.SourcePayloadSize,
+            "TargetPEs": self.TargetPEs,
+            "TargetPayloadSize": self.TargetPayloadSize,
+            "ThreadID": self.ThreadID,
+            "amountOfMessagesSentFlag": self.amountOfMessagesSentFlag,
+            "timestampFlag": self.timestampFlag
+        }
+
+        if compactPayloads:
+            SerializableDict["PayloadEncoding"] = "RLE"
+            SerializableDict["Payloads"] = {PayloadKey: [list(Run) for Run in EncodedPayload]
+                                            for PayloadKey, EncodedPayload in self.EncodedPayloads.items()}
+        else:
+            SerializableDict["Payloads"] = self.Payloads
 
-            for j in range(int(self.TargetPayloadSize[i]) - 6):
-                payloads_aux.append("RANDO")  # Preenche com RANDO #Default
+        return SerializableDict
+
+
+    def toJSON(self, compact=False, compactPayloads=False):
+
+        return dumpJSON(self.toDict(compactPayloads), compact)
+
+
+# Serializes a dict into JSON, with sorted keys. Compact JSON has no indentation or whitespace
+def dumpJSON(SerializableDict, compact=False):
+
+    if compact:
+        return json.dumps(SerializableDict, sort_keys=True, separators=(",", ":"))
+
+    return json.dumps(SerializableDict, sort_keys=True, indent=4)
+
+
+# Writes a batch of (file name, serializable dict) tuples as JSON files at given path. If KnownHashes (file name to
+# content hash of last generation) is given, files with an unchanged content hash are not rewritten. Returns a
+# (file name, content hash, written) tuple per file (content hashes are only computed if KnownHashes is given)
+def writeJSONFiles(Files, Path, compact=False, KnownHashes=None):
+
+    WrittenFiles = []
+
+    for FileName, SerializableDict in Files:
+
+        content = dumpJSON(SerializableDict, compact)
+
+        if KnownHashes is None:
+
+            f = open(Path + FileName, 'w')
+            f.write(content)
+            f.close()
+            WrittenFiles.append((FileName, None, True))
+
+        else:
+
+            contentHash = hashlib.sha256(content.encode()).hexdigest()
+            written = KnownHashes.get(FileName) != contentHash or not os.path.exists(Path + FileName)
+
+            if written:
+                f = open(Path + FileName, 'w')
+                f.write(content)
+                f.close()
+
+            WrittenFiles.append((FileName, contentHash, written))
+
+    return WrittenFiles
+
+
+# Returns file name to content hash dict recorded by last incremental generation at given path (empty if there is none)
+def readFileHashes(Path):
+
+    try:
+        with open(Path + "FlowHashes.json", 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return dict()
+
+
+# Writes content to a file, unless the file already holds that exact content. Returns whether the file was written
+def writeFileIfChanged(FileName, content):
+
+    try:
+        with open(FileName, 'r') as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+
+    f = open(FileName, 'w')
+    f.write(content)
+    f.close()
+
+    return True
+
+
+# Returns a pair of RNG seeds for an injector, derived from a platform-wide seed and the injector's PE and thread. Seeds
+# only change for injectors whose PE or thread changed
+def getInjectorSeeds(Seed, PEPos, AppID, ThreadID):
+
+    digest = hashlib.sha256(repr((Seed, PEPos, AppID, ThreadID)).encode()).digest()
+
+    return int.from_bytes(digest[0:4], "little") % 2147483647, int.from_bytes(digest[4:8], "little") % 2147483647
+
+
+# Run-length encoded default payloads, by payload size (every injector sending payloads of the same size shares one)
+DefaultPayloads = dict()
+
+
+# Returns run-length encoded default payload of given size: a "PEPOS" flit, a "TMSTP" flit, then "RANDO" flits
+def getDefaultPayload(PayloadSize):
+
+    if PayloadSize not in DefaultPayloads:
+        DefaultPayloads[PayloadSize] = encodePayload(["PEPOS", "TMSTP"] + ["RANDO"] * (PayloadSize - 2))
+
+    return DefaultPayloads[PayloadSize]
+
+
+# Encodes a list of flit flags as a tuple of (flag, amount of consecutive flits) tuples
+def encodePayload(Payload):
+
+    EncodedPayload = []
+
+    for flag in Payload:
+
+        if len(EncodedPayload) > 0 and EncodedPayload[-1][0] == flag:
+            EncodedPayload[-1] = (flag, EncodedPayload[-1][1] + 1)
+        else:
+            EncodedPayload.append((flag, 1))
+
+    return tuple(EncodedPayload)
+
+
+# Expands a run-length encoded payload back into a list of flit flags
+def decodePayload(EncodedPayload):
+
+    Payload = []
+
+    for flag, amount in EncodedPayload:
+        Payload.extend([flag] * amount)
+
+    return Payload
 
-            self.Headers["Header" + str(self.TargetPEs[i])] = ["ADDR", "SIZE"]  # Default
-            self.Payloads["Payload" + str(self.TargetPEs[i])] = payloads_aux
 
+# Returns a copy of an injector config dict (as loaded from an INJ<i>.json file) with expanded payloads
+def expandPayloads(InjectorDict):
 
-    def toJSON(self):
+    if InjectorDict.get("PayloadEncoding") != "RLE":
+        return InjectorDict
 
-        return json.dumps(self.__dict__, sort_keys=True, indent=4)
+    ExpandedDict = dict(InjectorDict)
+    del ExpandedDict["PayloadEncoding"]
+    ExpandedDict["Payloads"] = {PayloadKey: decodePayload(EncodedPayload)
+                                for PayloadKey, EncodedPayload in InjectorDict["Payloads"].items()}
 
+    return ExpandedDict
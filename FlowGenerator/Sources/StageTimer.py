@@ -0,0 +1,143 @@
+import sys
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+from .PlatformComposer import writeFileIfChanged
+
+try:
+    import resource
+except ImportError:  # Not available on Windows, peak resident set size is then left out
+    resource = None
+
+
+class StageTimer:
+
+    # Constructor. Times named stages of a flow generation (see stage). If profileFlag is set, each stage is also run
+    # under cProfile. If traceMemoryFlag is set, Python allocations are traced by tracemalloc, so the peak amount of
+    # memory allocated during each stage can be reported. Several timers can be used in turn in the same process
+    def __init__(self, profileFlag=False, traceMemoryFlag=False):
+
+        self.profileFlag = profileFlag
+        self.traceMemoryFlag = traceMemoryFlag
+        self.Stages = []  # A dict per stage, in the order they ran
+        self.Profiles = []  # cProfile.Profile object of each stage, if profiling
+        self.startedTracing = False  # Whether tracing was started by this timer (and must be stopped by it)
+
+        if traceMemoryFlag and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.startedTracing = True
+
+    # Times the block of a "with" statement as a stage of given name. Records its wall time and, if tracing memory, the
+    # peak amount of memory allocated while it ran
+    @contextmanager
+    def stage(self, StageName):
+
+        StageDict = {"Stage": StageName}
+        Profile = cProfile.Profile() if self.profileFlag else None
+
+        if self.traceMemoryFlag:
+            tracemalloc.reset_peak()
+            startTracedBytes = tracemalloc.get_traced_memory()[0]
+
+        if Profile is not None:
+            Profile.enable()
+
+        startTime = time.perf_counter()
+
+        try:
+            yield StageDict
+
+        finally:
+
+            StageDict["Seconds"] = time.perf_counter() - startTime
+
+            if Profile is not None:
+                Profile.disable()
+                self.Profiles.append(Profile)
+                StageDict["TopFunctions"] = getTopFunctions(Profile)
+
+            if self.traceMemoryFlag:
+                StageDict["PeakTracedBytes"] = tracemalloc.get_traced_memory()[1] - startTracedBytes
+
+            self.Stages.append(StageDict)
+
+    # Records a stage timed elsewhere (e.g. shared by several flows), with its wall time in seconds
+    def addStage(self, StageName, seconds):
+        self.Stages.append({"Stage": StageName, "Seconds": seconds})
+
+    # Stops memory tracing, if started by this timer
+    def finish(self):
+
+        if self.startedTracing:
+            tracemalloc.stop()
+            self.startedTracing = False
+
+    # Returns stage names and their wall time
+    def getStageTimes(self):
+        return {StageDict["Stage"]: StageDict["Seconds"] for StageDict in self.Stages}
+
+    # Returns timing report. Peak resident set size is only reported for the whole process (by the time the report is
+    # made), as the operating system keeps a single peak since the process started: per stage peaks come from tracing
+    # memory instead
+    def toDict(self):
+
+        return {
+            "Seconds": sum(StageDict["Seconds"] for StageDict in self.Stages),
+            "PeakRSSBytes": getPeakRSS(),
+            "Profiled": self.profileFlag,
+            "TracedMemory": self.traceMemoryFlag,
+            "Stages": self.Stages
+        }
+
+    # Writes timing report to a JSON file (left untouched if its content didn't change). If profiling, statistics of
+    # every stage are also dumped together to ProfileFileName, to be read by pstats (or any viewer of cProfile output)
+    def writeReport(self, FileName, ProfileFileName=None):
+
+        self.finish()
+
+        writeFileIfChanged(FileName, json.dumps(self.toDict(), indent=4))
+
+        if ProfileFileName is not None and len(self.Profiles) > 0:
+            Statistics = pstats.Stats(self.Profiles[0])
+            for Profile in self.Profiles[1:]:
+                Statistics.add(Profile)
+            Statistics.dump_stats(ProfileFileName)
+
+    # Prints wall time of every stage
+    def printSummary(self):
+
+        totalTime = sum(StageDict["Seconds"] for StageDict in self.Stages)
+
+        for StageDict in self.Stages:
+            print(StageDict["Stage"].ljust(20) + "{:10.4f}".format(StageDict["Seconds"]) + " s" +
+                  "{:7.1f}".format(StageDict["Seconds"] * 100 / totalTime if totalTime > 0 else 0) + " %" +
+                  ("{:12.1f}".format(StageDict["PeakTracedBytes"] / 1024) + " kB allocated at peak"
+                   if "PeakTracedBytes" in StageDict else ""))
+
+
+# Returns peak resident set size of the process so far, in bytes (None if it can't be read on this platform)
+def getPeakRSS():
+
+    if resource is None:
+        return None
+
+    peakRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kB, macOS reports bytes
+    return peakRSS if sys.platform == "darwin" else peakRSS * 1024
+
+
+# Returns the amount of functions of a profile taking the most cumulative time, as ( function, calls, own time, time
+# including callees ) dicts
+def getTopFunctions(Profile, amountOfFunctions=10):
+
+    Statistics = pstats.Stats(Profile).stats
+    TopFunctions = sorted(Statistics.items(), key=lambda Item: -Item[1][3])[:amountOfFunctions]
+
+    return [{"Function": FileName + ":" + str(lineNumber) + "(" + FunctionName + ")", "Calls": calls,
+             "OwnSeconds": ownTime, "CumulativeSeconds": cumulativeTime}
+            for (FileName, lineNumber, FunctionName), (primitiveCalls, calls, ownTime, cumulativeTime, Callers)
+            in TopFunctions]
@@ -0,0 +1,372 @@
+import json
+import math
+import random
+from . import PlatformComposer
+
+
+class ThreadMapper:
+
+    # Constructor. Threads of given applications are to be placed on PEs of given platform, minimizing the sum of each
+    # flow's bandwidth times its hop distance, while keeping bus and crossbar traffic within their capacity
+    def __init__(self, Platform, Applications, Seed=0):
+
+        self.Platform = Platform
+        self.rng = random.Random(Seed)
+
+        # Link bandwidth (in Mbps) of a 32 bit wide link at reference clock, as assumed by Injector
+        self.LinkBandwidth = 32 * Platform.ReferenceClock
+
+        # PEs are identified by their index in PEPositions, structures by their index in Structures
+        self.PEPositions = sorted(Platform.PEs)
+        self.Structures = []
+        Locations = dict()  # Maps a PEPos value to ( base NoC x, base NoC y, structure index or None )
+
+        for y in range(Platform.BaseNoCDimensions[1]):
+            for x in range(Platform.BaseNoCDimensions[0]):
+
+                if isinstance(Platform.BaseNoC[x][y], PlatformComposer.Structure):
+
+                    for StructurePE in Platform.BaseNoC[x][y].PEs:
+                        Locations[StructurePE.PEPos] = (x, y, len(self.Structures))
+
+                    self.Structures.append(Platform.BaseNoC[x][y])
+
+                else:
+                    Locations[Platform.BaseNoC[x][y].PEPos] = (x, y, None)
+
+        self.PEStructure = [Locations[PEPos][2] for PEPos in self.PEPositions]
+
+        # Hop distances are computed on demand from the location of each PE (see getPEDistance), as a table of every
+        # pair would hold millions of values on platforms of a few thousand PEs
+        self.PELocations = [Locations[PEPos] for PEPos in self.PEPositions]
+
+        # Threads are identified by their index in Threads, flows by their index in Edges
+        self.Threads = [Thread for Application in Applications for Thread in Application.Threads]
+        ThreadIndexes = {id(Thread): i for i, Thread in enumerate(self.Threads)}
+        self.Edges = []  # ( source thread index, target thread index, bandwidth ) of every flow
+        self.IncidentEdges = [[] for Thread in self.Threads]
+
+        for i, Thread in enumerate(self.Threads):
+            for Target in Thread.Targets:
+
+                if id(Target.TargetThread) not in ThreadIndexes:
+                    raise ValueError("Target thread of thread " + str(Thread.ThreadID) + " belongs to no given "
+                                     "application")
+
+                j = ThreadIndexes[id(Target.TargetThread)]
+                self.IncidentEdges[i].append(len(self.Edges))
+                if j != i:
+                    self.IncidentEdges[j].append(len(self.Edges))
+                self.Edges.append((i, j, Target.Bandwidth))
+
+        if len(self.Threads) > len(self.PEPositions):
+            raise ValueError(str(len(self.Threads)) + " threads don't fit in " + str(len(self.PEPositions)) + " PEs")
+
+        # An overloaded Mbps costs more than routing that Mbps along the longest path of the platform
+        self.overloadWeight = 2 * self.getLongestDistance()
+
+        self.reset()
+
+    # Returns hop distance between two ( base NoC x, base NoC y, structure index or None ) locations: XY route between
+    # base NoC routers, plus a hop into and out of each structure (a single hop between PEs of the same structure)
+    @staticmethod
+    def getDistance(Source, Target):
+
+        if Source[2] is not None and Source[2] == Target[2]:
+            return 1
+
+        return abs(Source[0] - Target[0]) + abs(Source[1] - Target[1]) + (Source[2] is not None) + \
+            (Target[2] is not None)
+
+    # Returns hop distance between PEs of given indexes
+    def getPEDistance(self, sourcePE, targetPE):
+        return self.getDistance(self.PELocations[sourcePE], self.PELocations[targetPE])
+
+    # Returns hop distance between the two farthest PEs, in a single pass: |dx| + |dy| is the largest of +-dx +- dy, so
+    # the longest route is found from the extreme values of x + y and x - y, each structure PE adding a hop to them.
+    # This only overestimates routes of PEs sharing a base NoC position (2 hops at most), which small platforms check
+    # pair by pair
+    def getLongestDistance(self):
+
+        longestDistance = max(max(x + sign * y + (structure is not None) for x, y, structure in self.PELocations) -
+                              min(x + sign * y - (structure is not None) for x, y, structure in self.PELocations)
+                              for sign in (1, -1))
+
+        if longestDistance > 2:
+            return longestDistance
+
+        return max([self.getPEDistance(i, j) for i in range(len(self.PELocations)) for j in range(i)], default=0)
+
+    # Removes every thread from the platform
+    def reset(self):
+
+        self.ThreadPE = [None for Thread in self.Threads]
+        self.PEThread = [None for PEPos in self.PEPositions]
+        self.hopCost = 0
+
+        # [ internal, inbound, outbound ] traffic of each structure, in Mbps
+        self.Loads = [[0, 0, 0] for Structure in self.Structures]
+
+    # Returns traffic exceeding capacity (in Mbps) of a structure with given load. Bus traffic shares a single medium,
+    # while crossbars are only limited at their wrapper
+    def getOverload(self, StructureIndex, Load):
+
+        if self.Structures[StructureIndex].StructureType == "Bus":
+            return max(0, Load[0] + Load[1] + Load[2] - self.LinkBandwidth)
+
+        return max(0, Load[1] - self.LinkBandwidth) + max(0, Load[2] - self.LinkBandwidth)
+
+    # Adds traffic of a flow between given PEs to LoadDeltas, a dict mapping structure index to its load change
+    def addFlowLoad(self, LoadDeltas, sourcePE, targetPE, bandwidth):
+
+        sourceStructure = self.PEStructure[sourcePE]
+        targetStructure = self.PEStructure[targetPE]
+
+        if sourceStructure is not None and sourceStructure == targetStructure:
+            LoadDeltas.setdefault(sourceStructure, [0, 0, 0])[0] += bandwidth
+            return
+
+        if sourceStructure is not None:
+            LoadDeltas.setdefault(sourceStructure, [0, 0, 0])[2] += bandwidth
+
+        if targetStructure is not None:
+            LoadDeltas.setdefault(targetStructure, [0, 0, 0])[1] += bandwidth
+
+    # Returns ( cost change, hop cost change, load changes ) of moving threads to PEs, given as ( thread index, PE
+    # index ) pairs. Only flows incident to moved threads are evaluated. Flows with an unplaced end cost nothing
+    def getMoveDelta(self, Moves):
+
+        NewPE = dict(Moves)
+        LoadDeltas = dict()
+        hopDelta = 0
+        Locations, getDistance = self.PELocations, self.getDistance
+
+        for edgeIndex in set(edgeIndex for i in NewPE for edgeIndex in self.IncidentEdges[i]):
+
+            i, j, bandwidth = self.Edges[edgeIndex]
+            oldSource, oldTarget = self.ThreadPE[i], self.ThreadPE[j]
+            newSource, newTarget = NewPE.get(i, oldSource), NewPE.get(j, oldTarget)
+
+            if oldSource is not None and oldTarget is not None:
+                hopDelta -= bandwidth * getDistance(Locations[oldSource], Locations[oldTarget])
+                self.addFlowLoad(LoadDeltas, oldSource, oldTarget, -bandwidth)
+
+            if newSource is not None and newTarget is not None:
+                hopDelta += bandwidth * getDistance(Locations[newSource], Locations[newTarget])
+                self.addFlowLoad(LoadDeltas, newSource, newTarget, bandwidth)
+
+        overloadDelta = 0
+        for StructureIndex, Delta in LoadDeltas.items():
+            Load = self.Loads[StructureIndex]
+            overloadDelta += self.getOverload(StructureIndex, [Load[k] + Delta[k] for k in range(3)]) - \
+                self.getOverload(StructureIndex, Load)
+
+        return hopDelta + self.overloadWeight * overloadDelta, hopDelta, LoadDeltas
+
+    # Moves threads to PEs, given as ( thread index, PE index ) pairs, with changes returned by getMoveDelta
+    def applyMoves(self, Moves, hopDelta, LoadDeltas):
+
+        for i, PEIndex in Moves:
+            if self.ThreadPE[i] is not None and self.PEThread[self.ThreadPE[i]] == i:
+                self.PEThread[self.ThreadPE[i]] = None
+
+        for i, PEIndex in Moves:
+            self.ThreadPE[i] = PEIndex
+            self.PEThread[PEIndex] = i
+
+        for StructureIndex, Delta in LoadDeltas.items():
+            for k in range(3):
+                self.Loads[StructureIndex][k] += Delta[k]
+
+        self.hopCost += hopDelta
+
+    # Returns ( bandwidth weighted hop distance, traffic exceeding bus and crossbar capacity ) of current placement
+    def getCost(self):
+        return self.hopCost, sum(self.getOverload(i, Load) for i, Load in enumerate(self.Loads))
+
+    # Returns PE indexes sorted by their summed hop distance to every PE, in a single pass over PE locations: the sum of
+    # XY routes from a base NoC column (row) follows from the amount of PEs at each column (row), and structure PEs add
+    # a hop towards every PE outside their structure, instead of the XY route, within it
+    def getCentralPEs(self):
+
+        amountOfPEs = len(self.PELocations)
+        StructureSizes = [len(Structure.PEs) for Structure in self.Structures]
+        RouteSums = []
+
+        for axis in range(2):
+            Counts = [0 for position in range(self.Platform.BaseNoCDimensions[axis])]
+            for Location in self.PELocations:
+                Counts[Location[axis]] += 1
+            RouteSums.append([sum(count * abs(position - other) for other, count in enumerate(Counts))
+                              for position in range(len(Counts))])
+
+        RouteHops = [0 if structure is None else amountOfPEs - StructureSizes[structure]
+                     for structure in self.PEStructure]
+
+        return sorted(range(amountOfPEs), key=lambda PEIndex: RouteSums[0][self.PELocations[PEIndex][0]] +
+                      RouteSums[1][self.PELocations[PEIndex][1]] + RouteHops[PEIndex])
+
+    # Returns free PE indexes at increasing hop distance from given base NoC positions, ring by ring, until at least
+    # given amount is found (or the whole platform was searched). PositionPEs maps a base NoC position to its PE indexes
+    def getNearbyFreePEs(self, Positions, amountOfPEs, PositionPEs):
+
+        width, height = self.Platform.BaseNoCDimensions
+        NearbyPEs = set()
+
+        for radius in range(width + height - 1):
+
+            for x, y in Positions:
+                for dx in range(-radius, radius + 1):
+                    for dy in {radius - abs(dx), abs(dx) - radius}:
+                        if 0 <= x + dx < width and 0 <= y + dy < height:
+                            NearbyPEs.update(PEIndex for PEIndex in PositionPEs[(x + dx, y + dy)]
+                                             if self.PEThread[PEIndex] is None)
+
+            if len(NearbyPEs) >= amountOfPEs:
+                break
+
+        return NearbyPEs
+
+    # Places threads one at a time, heaviest first, each at the free PE minimizing cost towards threads already placed,
+    # among the given amount of free PEs closest to those threads. Threads without placed neighbors go to the free PE
+    # closest to every other PE
+    def placeGreedily(self, amountOfCandidates=16):
+
+        self.reset()
+
+        Traffic = [sum(self.Edges[edgeIndex][2] for edgeIndex in Incident) for Incident in self.IncidentEdges]
+        CentralPEs = self.getCentralPEs()
+        CentralRanks = {PEIndex: rank for rank, PEIndex in enumerate(CentralPEs)}
+        centralIndex = 0
+
+        PositionPEs = {(x, y): [] for x in range(self.Platform.BaseNoCDimensions[0])
+                       for y in range(self.Platform.BaseNoCDimensions[1])}
+        for PEIndex, Location in enumerate(self.PELocations):
+            PositionPEs[Location[:2]].append(PEIndex)
+
+        for i in sorted(range(len(self.Threads)), key=lambda i: -Traffic[i]):
+
+            NeighborPositions = set(self.PELocations[self.ThreadPE[j]][:2] for edgeIndex in self.IncidentEdges[i]
+                                    for j in self.Edges[edgeIndex][:2] if self.ThreadPE[j] is not None)
+
+            if not NeighborPositions:
+                while self.PEThread[CentralPEs[centralIndex]] is not None:
+                    centralIndex += 1
+                Move = [(i, CentralPEs[centralIndex])]
+                self.applyMoves(Move, *self.getMoveDelta(Move)[1:])
+                continue
+
+            # Candidates are evaluated in the order of CentralPEs, so ties go to the most central PE
+            bestDelta = None
+            for PEIndex in sorted(self.getNearbyFreePEs(NeighborPositions, amountOfCandidates, PositionPEs),
+                                  key=CentralRanks.get):
+                Delta = self.getMoveDelta([(i, PEIndex)])
+                if bestDelta is None or Delta[0] < bestDelta[0]:
+                    bestDelta, bestPE = Delta, PEIndex
+
+            self.applyMoves([(i, bestPE)], *bestDelta[1:])
+
+    # Returns moves swapping a random thread with the thread (if any) at a random other PE
+    def getRandomSwap(self):
+
+        i = self.rng.randrange(len(self.Threads))
+        PEIndex = self.rng.randrange(len(self.PEPositions) - 1)
+        if PEIndex >= self.ThreadPE[i]:
+            PEIndex += 1
+
+        j = self.PEThread[PEIndex]
+
+        return [(i, PEIndex)] if j is None else [(i, PEIndex), (j, self.ThreadPE[i])]
+
+    # Improves current placement by simulated annealing over random swaps, cooling geometrically from the average cost
+    # change of a random swap down to a thousandth of it. Keeps the best placement found
+    def anneal(self, iterations):
+
+        if len(self.Threads) == 0 or len(self.PEPositions) < 2:
+            return
+
+        Samples = [abs(self.getMoveDelta(self.getRandomSwap())[0]) for s in range(100)]
+        temperature = sum(Samples) / len(Samples)
+
+        if temperature == 0:
+            return
+
+        cooling = 1e-3 ** (1 / iterations)
+        cost = self.hopCost + self.overloadWeight * self.getCost()[1]
+        bestCost = cost
+        BestPlacement = list(self.ThreadPE)
+
+        for iteration in range(iterations):
+
+            Moves = self.getRandomSwap()
+            Delta = self.getMoveDelta(Moves)
+
+            if Delta[0] <= 0 or self.rng.random() < math.exp(-Delta[0] / temperature):
+
+                self.applyMoves(Moves, *Delta[1:])
+                cost += Delta[0]
+
+                if cost < bestCost:
+                    bestCost = cost
+                    BestPlacement = list(self.ThreadPE)
+
+            temperature *= cooling
+
+        self.setPlacement(BestPlacement)
+
+    # Places every thread at given PE index
+    def setPlacement(self, Placement):
+
+        self.reset()
+
+        for i, PEIndex in enumerate(Placement):
+            self.applyMoves([(i, PEIndex)], *self.getMoveDelta([(i, PEIndex)])[1:])
+
+    # Returns an allocation map ( dict mapping PEPos values to Thread objects ) of current placement
+    def getAllocationMap(self):
+        return {self.PEPositions[PEIndex]: self.Threads[i] for i, PEIndex in enumerate(self.ThreadPE)}
+
+    # Places threads as given allocation map does, returns its cost (see getCost)
+    def evaluate(self, AllocationMap):
+
+        PEIndexes = {PEPos: PEIndex for PEIndex, PEPos in enumerate(self.PEPositions)}
+        ThreadIndexes = {id(Thread): i for i, Thread in enumerate(self.Threads)}
+
+        self.reset()
+
+        for PEPos, Thread in AllocationMap.items():
+            Move = [(ThreadIndexes[id(Thread)], PEIndexes[PEPos])]
+            self.applyMoves(Move, *self.getMoveDelta(Move)[1:])
+
+        return self.getCost()
+
+    # Returns an allocation map placing every thread, found by greedy placement refined by given amount of annealing
+    # iterations (by default, 2000 per thread). Annealing starts from current placement if placeFlag is False
+    def map(self, iterations=None, placeFlag=True):
+
+        if placeFlag:
+            self.placeGreedily()
+
+        self.anneal(iterations if iterations is not None else 2000 * len(self.Threads))
+
+        return self.getAllocationMap()
+
+
+# Writes an allocation map as an allocation map script (or as a JSON definition, see DefinitionLoader), referring to
+# threads by name. ThreadNames maps each thread name to its Thread object
+def writeAllocationMap(FileName, AllocationMap, ThreadNames, JSONFormat=False):
+
+    Names = {id(Thread): ThreadName for ThreadName, Thread in ThreadNames.items()}
+
+    with open(FileName, 'w') as AllocationMapFile:
+
+        if JSONFormat:
+            AllocationMapFile.write(json.dumps({"AllocationMap": {str(PEPos): Names[id(AllocationMap[PEPos])]
+                                                                  for PEPos in sorted(AllocationMap)}}, indent=4))
+            return
+
+        AllocationMapFile.write("\n# Make Allocation Map (Maps Thread object to an unique PE)\n")
+        AllocationMapFile.write("AllocationMap = dict()\n")
+
+        for PEPos in sorted(AllocationMap):
+            AllocationMapFile.write("AllocationMap[" + str(PEPos) + "] = " + Names[id(AllocationMap[PEPos])] + "\n")
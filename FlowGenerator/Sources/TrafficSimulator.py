@@ -0,0 +1,408 @@
+import os
+import json
+import heapq
+from collections import deque
+from . import LoadEstimator
+
+
+# Event kinds, in the order they are handled within a clock cycle: links freed in a cycle can be granted in that same
+# cycle, to any header requesting it in that cycle
+RELEASE = 0
+REQUEST = 1
+INJECT = 2
+ARBITRATE = 3
+
+
+class Link:
+
+    __slots__ = ("Owner", "Waiting", "PortIDs", "lastPortID", "arbitrationPending")
+
+    # A link (router port, bus medium or crossbar port) carries a single message at a time. Messages waiting for it are
+    # queued by the input port they come from, and granted in round robin order between input ports
+    def __init__(self):
+
+        self.Owner = None
+        self.Waiting = dict()  # Maps an input port ID to a FIFO of messages waiting at that port
+        self.PortIDs = dict()  # Maps an input port (previous link or source PE) to its ID
+        self.lastPortID = -1
+        self.arbitrationPending = False
+
+    # Returns ID of given input port, adding it if this is the first message coming from it
+    def getPortID(self, Port):
+
+        if Port not in self.PortIDs:
+            self.PortIDs[Port] = len(self.PortIDs)
+
+        return self.PortIDs[Port]
+
+    # Removes and returns next message to be granted: the first one waiting at the first input port following the last
+    # granted one
+    def arbitrate(self):
+
+        if len(self.Waiting) == 1:
+            portID = next(iter(self.Waiting))
+        else:
+            amountOfPorts = len(self.PortIDs)
+            portID = min(self.Waiting, key=lambda waitingPortID: (waitingPortID - self.lastPortID - 1) % amountOfPorts)
+
+        self.lastPortID = portID
+
+        Queue = self.Waiting[portID]
+        Message = Queue.popleft()
+
+        if len(Queue) == 0:
+            del self.Waiting[portID]
+
+        return Message
+
+
+class Message:
+
+    __slots__ = ("Injector", "targetPEPos", "payloadSize", "messageSize", "outCycle", "Route", "Grants", "hop",
+                 "heldFrom", "tailCycle", "writeEndCycle", "bridged")
+
+    def __init__(self, Injector, targetPEPos, payloadSize, messageSize, outCycle, Route, bridged):
+
+        self.Injector = Injector
+        self.targetPEPos = targetPEPos
+        self.payloadSize = payloadSize
+        self.messageSize = messageSize
+        self.outCycle = outCycle  # Cycle its first flit is written to its injector's out buffer
+        self.Route = Route  # ( Link, input port ID ) pairs
+        self.Grants = [None] * len(Route)  # Cycle each link was granted at
+        self.hop = 0
+        self.heldFrom = 0  # Index of the first link of the route still held by this message
+        self.tailCycle = None  # Cycle its tail left the last link released
+        self.writeEndCycle = None  # Cycle its last flit is written to its injector's out buffer
+        self.bridged = bridged  # Whether it leaves its source structure through a bridge
+
+
+class Injector:
+
+    __slots__ = ("PEPos", "TargetPEs", "TargetPayloadSize", "MessageSizes", "AmountOfMessagesInBurst", "FlowType",
+                 "InjectionRate", "OutBufferSize", "RNGSeed1", "RNGSeed2", "randomNumber", "currentTarget",
+                 "burstCounter", "lastTailCycle")
+
+    # Fixed rate injector, as Injector.vhd (FXD block) built from an INJ<i>.json and a PE<i>.json file
+    def __init__(self, InjectorDict, PEDict):
+
+        self.PEPos = InjectorDict["PEPos"]
+        self.TargetPEs = InjectorDict["TargetPEs"]
+        self.TargetPayloadSize = InjectorDict["TargetPayloadSize"]
+        self.MessageSizes = [payloadSize + InjectorDict["HeaderSize"] for payloadSize in self.TargetPayloadSize]
+        self.AmountOfMessagesInBurst = InjectorDict["AmountOfMessagesInBurst"]
+        self.FlowType = InjectorDict["FlowType"]
+        self.InjectionRate = InjectorDict["InjectionRate"]
+        self.OutBufferSize = PEDict["OutBufferSize"]
+        self.RNGSeed1 = InjectorDict["RNGSeed1"]
+        self.RNGSeed2 = InjectorDict["RNGSeed2"]
+        self.currentTarget = 0
+        self.burstCounter = 0
+        self.lastTailCycle = None  # Cycle the tail of the last message sent left the first link of its route
+
+        # A random number is generated on reset, and each time it is used
+        self.randomNumber = self.uniform()
+
+    # Returns next random number of the injector's generator (UNIFORM procedure from ieee.math_real, as in
+    # HyHeMPS_PKG), updating its seeds
+    def uniform(self):
+
+        k = self.RNGSeed1 // 53668
+        self.RNGSeed1 = 40014 * (self.RNGSeed1 - k * 53668) - k * 12211
+        if self.RNGSeed1 < 0:
+            self.RNGSeed1 += 2147483563
+
+        k = self.RNGSeed2 // 52774
+        self.RNGSeed2 = 40692 * (self.RNGSeed2 - k * 52774) - k * 3791
+        if self.RNGSeed2 < 0:
+            self.RNGSeed2 += 2147483399
+
+        z = self.RNGSeed1 - self.RNGSeed2
+        if z < 1:
+            z += 2147483562
+
+        return z * 4.656613e-10
+
+    # Returns index of target of next message, moving on to next target once a burst ends. Random flows pick
+    # integer(RandomNumber * (AmountOfTargetPEs - 1)), which rounds to the nearest integer
+    def getNextTarget(self):
+
+        target = self.currentTarget
+        self.burstCounter += 1
+
+        if self.burstCounter == self.AmountOfMessagesInBurst[target]:
+
+            self.burstCounter = 0
+
+            if self.FlowType == "RND":
+                self.currentTarget = int(self.randomNumber * (len(self.TargetPEs) - 1) + 0.5)
+                self.randomNumber = self.uniform()
+
+            elif self.FlowType == "DTM":
+                self.currentTarget = (self.currentTarget + 1) % len(self.TargetPEs)
+
+        return target
+
+    # Returns amount of cycles the injector idles after writing the last flit of a message of given size. A period of
+    # ( M * 100 / InjectionRate ) - M is counted from 0 to period + 1, except at 100% injection rate
+    def getIdleCycles(self, messageSize):
+
+        if self.InjectionRate == 100:
+            return 0
+
+        return (messageSize * 100) // self.InjectionRate - messageSize + 2
+
+
+class TrafficSimulator:
+
+    # Constructor. Reads platform, PE and injector configuration files generated by Platform.generateJSON at FlowPath.
+    # Every element runs at platform reference clock. routerLatency is the amount of cycles a header spends at each hop
+    # before requesting the next one, and bufferDepth the amount of flits buffered at each hop (Hermes TAM_BUFFER)
+    def __init__(self, FlowPath, routerLatency=4, bufferDepth=4):
+
+        self.routerLatency = routerLatency
+        self.bufferDepth = bufferDepth
+
+        with open(os.path.join(FlowPath, "PlatformConfig.json"), 'r') as PlatformFile:
+            self.PlatformConfig = json.load(PlatformFile)
+
+        self.AmountOfPEs = self.PlatformConfig["AmountOfPEs"]
+        self.ReferenceClock = self.PlatformConfig["ReferenceClock"]  # In MHz
+        self.StructureTypes = getStructureTypes(self.PlatformConfig)
+
+        # Only fixed rate injectors with a non-zero injection rate send messages
+        self.Injectors = []
+        for PEPos in range(self.AmountOfPEs):
+
+            with open(os.path.join(FlowPath, "INJ" + str(PEPos) + ".json"), 'r') as InjectorFile:
+                InjectorDict = json.load(InjectorFile)
+
+            if InjectorDict["InjectorType"] != "FXD" or InjectorDict["InjectionRate"] == 0:
+                continue
+
+            with open(os.path.join(FlowPath, "PE" + str(PEPos) + ".json"), 'r') as PEFile:
+                self.Injectors.append(Injector(InjectorDict, json.load(PEFile)))
+
+        self.Links = dict()  # Maps a link (see LoadEstimator.getRoute) to its Link object
+        self.Routes = dict()  # Maps a ( source PEPos, target PEPos ) pair to its ( Link, input port ID ) pairs
+
+        # ( target, source, payload size, timestamp ) entries of each Out log and ( target, source, payload size, out
+        # timestamp, in timestamp ) entries of each In log, in ns
+        self.OutLogs = [[] for PEPos in range(self.AmountOfPEs)]
+        self.InLogs = [[] for PEPos in range(self.AmountOfPEs)]
+
+        self.Events = []
+        self.eventCounter = 0
+        self.endCycle = None
+
+    # Returns time (in ns, truncated as in VHDL logs) of rising clock edge of given cycle. Clocks start low, so cycle 0
+    # rises at half a clock period
+    def getTimestamp(self, cycle):
+        return ((2 * cycle + 1) * 1000) // (2 * self.ReferenceClock)
+
+    # Returns ( Link, input port ID ) pairs of the route from source PE to target PE, each input port being the
+    # previous link (or the source PE, for the first link)
+    def getRoute(self, sourcePEPos, targetPEPos):
+
+        Route = self.Routes.get((sourcePEPos, targetPEPos))
+
+        if Route is None:
+
+            Route = []
+            Port = ("PE", sourcePEPos)
+
+            for LinkKey in LoadEstimator.getRoute(sourcePEPos, targetPEPos, self.PlatformConfig["WrapperAddresses"],
+                                                  self.StructureTypes, self.PlatformConfig["BaseNoCDimensions"]):
+
+                if LinkKey not in self.Links:
+                    self.Links[LinkKey] = Link()
+
+                Route.append((self.Links[LinkKey], self.Links[LinkKey].getPortID(Port)))
+                Port = LinkKey
+
+            self.Routes[(sourcePEPos, targetPEPos)] = Route
+
+        return Route
+
+    def schedule(self, cycle, kind, Object):
+
+        heapq.heappush(self.Events, (cycle, kind, self.eventCounter, Object))
+        self.eventCounter += 1
+
+    # Writes first flit of next message of given injector to its out buffer
+    def inject(self, cycle, Injector):
+
+        target = Injector.getNextTarget()
+        targetPEPos = Injector.TargetPEs[target]
+
+        Route = self.getRoute(Injector.PEPos, targetPEPos)
+        bridged = len(Route) > 1 and self.PlatformConfig["WrapperAddresses"][Injector.PEPos] in self.StructureTypes
+
+        NewMessage = Message(Injector, targetPEPos, Injector.TargetPayloadSize[target], Injector.MessageSizes[target],
+                             cycle, Route, bridged)
+
+        self.OutLogs[Injector.PEPos].append((targetPEPos, Injector.PEPos, NewMessage.payloadSize,
+                                             self.getTimestamp(cycle)))
+
+        # Header is read from out buffer in the next cycle
+        self.schedule(cycle + 1, REQUEST, NewMessage)
+
+    # Queues message at the input port of the next link of its route
+    def request(self, cycle, Message):
+
+        RequestedLink, portID = Message.Route[Message.hop]
+
+        if portID in RequestedLink.Waiting:
+            RequestedLink.Waiting[portID].append(Message)
+        else:
+            RequestedLink.Waiting[portID] = deque((Message,))
+
+        if RequestedLink.Owner is None and not RequestedLink.arbitrationPending:
+            RequestedLink.arbitrationPending = True
+            self.schedule(cycle, ARBITRATE, RequestedLink)
+
+    # Frees a link, granting it to the next message waiting for it
+    def release(self, cycle, ReleasedLink):
+
+        ReleasedLink.Owner = None
+
+        if len(ReleasedLink.Waiting) > 0 and not ReleasedLink.arbitrationPending:
+            ReleasedLink.arbitrationPending = True
+            self.schedule(cycle, ARBITRATE, ReleasedLink)
+
+    # Grants a free link to the next message waiting for it, which then requests the next link of its route
+    def grant(self, cycle, GrantedLink):
+
+        GrantedLink.arbitrationPending = False
+
+        if GrantedLink.Owner is not None or len(GrantedLink.Waiting) == 0:
+            return
+
+        Message = GrantedLink.arbitrate()
+        GrantedLink.Owner = Message
+        Message.Grants[Message.hop] = cycle
+
+        if Message.hop == 0:
+            self.leaveOutBuffer(cycle, Message)
+
+        if Message.hop == len(Message.Route) - 1:
+            self.deliver(cycle, Message)
+            return
+
+        # Bridges buffer messages leaving a structure, so its bus or crossbar port is freed as soon as the whole
+        # message crossed it, whatever happens in the NoC
+        if Message.hop == 0 and Message.bridged:
+
+            Message.tailCycle = max(cycle + Message.messageSize, Message.writeEndCycle + 1)
+            Message.heldFrom = 1
+            Message.Injector.lastTailCycle = Message.tailCycle
+            self.schedule(Message.tailCycle, RELEASE, GrantedLink)
+
+        Message.hop += 1
+        self.schedule(cycle + self.routerLatency, REQUEST, Message)
+
+    # Header of a message left its injector's out buffer. Sets cycle its last flit is written to the out buffer, which
+    # may stall until the previous message leaves, and schedules the next message
+    def leaveOutBuffer(self, cycle, Message):
+
+        Injector = Message.Injector
+        Message.writeEndCycle = Message.outCycle + Message.messageSize - 1
+
+        if Injector.lastTailCycle is not None:
+            Message.writeEndCycle = max(Message.writeEndCycle,
+                                        Injector.lastTailCycle + Message.messageSize - Injector.OutBufferSize)
+
+        # Next first flit is written once the injector idled, and once this message's first flit left, if this message
+        # fills the out buffer
+        nextCycle = max(Message.writeEndCycle + 1 + Injector.getIdleCycles(Message.messageSize),
+                        cycle + 1 + max(0, Message.messageSize - Injector.OutBufferSize), cycle + 1)
+
+        if nextCycle <= self.endCycle:
+            self.schedule(nextCycle, INJECT, Injector)
+
+    # Header of a message reached its target. Sets cycle its tail leaves each held link, 1 flit per cycle after each
+    # grant, one cycle after leaving the previous link and no sooner than bufferDepth cycles before leaving the next
+    # link (wormhole back pressure), then frees every held link and logs the message at its target
+    def deliver(self, cycle, Message):
+
+        TailCycles = []
+        previousTailCycle = Message.tailCycle if Message.heldFrom > 0 else Message.writeEndCycle
+
+        for hop in range(Message.heldFrom, len(Message.Route)):
+            previousTailCycle = max(Message.Grants[hop] + Message.messageSize, previousTailCycle + 1)
+            TailCycles.append(previousTailCycle)
+
+        for i in range(len(TailCycles) - 2, -1, -1):
+            TailCycles[i] = max(TailCycles[i], TailCycles[i + 1] - self.bufferDepth)
+
+        if Message.heldFrom == 0:
+            Message.Injector.lastTailCycle = TailCycles[0]
+
+        for i, tailCycle in enumerate(TailCycles):
+            self.schedule(max(tailCycle, cycle), RELEASE, Message.Route[Message.heldFrom + i][0])
+
+        # Receiver logs a message when its last flit is received
+        if TailCycles[-1] <= self.endCycle:
+            self.InLogs[Message.targetPEPos].append((Message.targetPEPos, Message.Injector.PEPos, Message.payloadSize,
+                                                     self.getTimestamp(Message.outCycle),
+                                                     self.getTimestamp(TailCycles[-1])))
+
+    # Simulates platform from reset until endTime (in ns). Reset is held for 100 ns, as in HyHeMPS_TB, then each
+    # injector resets (1 cycle) and writes its first flit in the next cycle
+    def run(self, endTime):
+
+        resetCycle = max(0, -(-(200 * self.ReferenceClock - 1000) // 2000))
+        self.endCycle = (((endTime + 1) * 2 * self.ReferenceClock - 1) // 1000 - 1) // 2
+
+        for Injector in self.Injectors:
+            if resetCycle + 1 <= self.endCycle:
+                self.schedule(resetCycle + 1, INJECT, Injector)
+
+        Events = self.Events
+
+        while len(Events) > 0 and Events[0][0] <= self.endCycle:
+
+            cycle, kind, eventCounter, Object = heapq.heappop(Events)
+
+            if kind == RELEASE:
+                self.release(cycle, Object)
+            elif kind == REQUEST:
+                self.request(cycle, Object)
+            elif kind == INJECT:
+                self.inject(cycle, Object)
+            else:
+                self.grant(cycle, Object)
+
+        return self
+
+    # Returns amount of messages sent and received until end of simulation
+    def getMessageCounts(self):
+        return sum(len(OutLog) for OutLog in self.OutLogs), sum(len(InLog) for InLog in self.InLogs)
+
+    # Writes InLog<i>.txt and OutLog<i>.txt files of every PE at given path, in the format written by Injector.vhd and
+    # Receiver.vhd. In log entries are ordered by the time their message was received
+    def writeLogs(self, Path):
+
+        os.makedirs(Path, exist_ok=True)
+
+        for PEPos in range(self.AmountOfPEs):
+
+            with open(os.path.join(Path, "OutLog" + str(PEPos) + ".txt"), 'w') as OutLogFile:
+                OutLogFile.writelines(" ".join(map(str, Entry)) + "\n" for Entry in self.OutLogs[PEPos])
+
+            with open(os.path.join(Path, "InLog" + str(PEPos) + ".txt"), 'w') as InLogFile:
+                InLogFile.writelines(" ".join(map(str, Entry)) + "\n"
+                                     for Entry in sorted(self.InLogs[PEPos], key=lambda Entry: Entry[4]))
+
+
+# Returns "Bus" or "Crossbar" by base NoC address of each wrapper of a platform configuration dict
+# (see Platform.toDict)
+def getStructureTypes(PlatformConfig):
+
+    if "BusWrapperIDs" not in PlatformConfig:
+        raise ValueError("Platform configuration has no wrapper IDs, flows must be generated again")
+
+    StructureTypes = {address: "Bus" for address in PlatformConfig["BusWrapperIDs"]}
+    StructureTypes.update({address: "Crossbar" for address in PlatformConfig["CrossbarWrapperIDs"]})
+
+    return StructureTypes
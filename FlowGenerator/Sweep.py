@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+import os
+import copy
+import math
+import json
+import time
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from FlowGenerator import writeProjectInfo
+from Sources import DefinitionLoader
+from Sources import StageTimer
+
+
+# Returns name of the flow directory of a sweep point
+def getFlowName(SetupScript, AppScript, AllocScript, ReferenceClock):
+    return SetupScript + " " + AppScript + " " + AllocScript + " " + str(ReferenceClock) + "MHz"
+
+
+# Generates flows of every ( application, allocation map ) pair on a single setup and reference clock. The setup is
+# only loaded once, every pair starting from a copy of the resulting platform (the time it took is reported by the
+# first pair). A timing report (see StageTimer) is written next to the information file of every flow. Returns a
+# manifest entry per pair
+def generateSetupFlows(SetupScript, ReferenceClock, Pairs, OutputPath, compact=False, seed=None, incremental=False,
+                       profileFlag=False, traceMemoryFlag=False, compactPayloads=False):
+
+    Entries = []
+    SetupStages = []
+
+    try:
+        startTime = time.perf_counter()
+        BasePlatform = DefinitionLoader.loadSetup(SetupScript, ReferenceClock)
+        SetupStages.append(("loadSetup", time.perf_counter() - startTime))
+
+        # Sets PEPos values of every PE once, so every copy of the platform has them
+        startTime = time.perf_counter()
+        BasePlatform.PEs
+        SetupStages.append(("updatePEAddresses", time.perf_counter() - startTime))
+
+        SetupError = None
+    except (Exception, SystemExit):  # Definition scripts may exit
+        SetupError = traceback.format_exc(limit=1)
+
+    for AppScript, AllocScript in Pairs:
+
+        FlowName = getFlowName(SetupScript, AppScript, AllocScript, ReferenceClock)
+        Entry = {"Setup": SetupScript, "Application": AppScript, "AllocationMap": AllocScript,
+                 "ReferenceClock": ReferenceClock, "Directory": os.path.join(OutputPath, FlowName)}
+        startTime = time.perf_counter()
+
+        Timer = StageTimer.StageTimer(profileFlag, traceMemoryFlag)
+        for StageName, stageTime in SetupStages:
+            Timer.addStage(StageName, stageTime)
+        SetupStages = []
+
+        try:
+
+            if SetupError is not None:
+                raise RuntimeError(SetupError)
+
+            with Timer.stage("copySetup"):
+                Setup = copy.deepcopy(BasePlatform)
+
+            ScriptGlobals = {"ReferenceClock": ReferenceClock, "Setup": Setup}
+            with Timer.stage("loadApplications"):
+                Applications, Threads = DefinitionLoader.loadApplications(AppScript, Globals=ScriptGlobals)
+            ScriptGlobals["Applications"] = Applications
+            with Timer.stage("loadAllocationMap"):
+                AllocationMap = DefinitionLoader.loadAllocationMap(AllocScript, Threads, Globals=ScriptGlobals)
+
+            with Timer.stage("mapToPlatform"):
+                for Application in Applications:
+                    Setup.addApplication(Application)
+                Setup.setAllocationMap(AllocationMap)
+                Setup.mapToPlatform(Seed=seed)
+
+            with Timer.stage("generateJSON"):
+                amountOfFilesWritten = Setup.generateJSON(os.path.join(OutputPath, FlowName, "flow") + "/",
+                                                          compact=compact, compactPayloads=compactPayloads,
+                                                          incremental=incremental)
+            with Timer.stage("writeProjectInfo"):
+                writeProjectInfo(os.path.join(OutputPath, FlowName, FlowName + "Info.txt"), SetupScript, Setup,
+                                 Applications, incremental)
+
+            # In incremental mode, a flow whose files didn't change keeps the timing report of the run that last
+            # changed it
+            ReportPath = os.path.join(OutputPath, FlowName, FlowName)
+            if incremental and amountOfFilesWritten == 0 and os.path.exists(ReportPath + "Timing.json"):
+                Timer.finish()
+            else:
+                Timer.writeReport(ReportPath + "Timing.json", ReportPath + "Profile.prof" if profileFlag else None)
+
+            Entry["Status"] = "Generated"
+            Entry["AmountOfPEs"] = Setup.AmountOfPEs
+            Entry["AmountOfFiles"] = len(Setup.Injectors) + len(Setup.PEs) + 1
+            Entry["AmountOfFilesWritten"] = amountOfFilesWritten
+
+        except (Exception, SystemExit) as Error:
+
+            Entry["Status"] = "Failed"
+            Entry["Error"] = type(Error).__name__ + ": " + str(Error).strip()
+            Timer.finish()
+
+        Entry["Seconds"] = time.perf_counter() - startTime
+        Entry["Stages"] = Timer.getStageTimes()
+        Entries.append(Entry)
+
+    return Entries
+
+
+# Returns names of every definition (script or JSON file) in given folder
+def listScripts(Folder):
+    return sorted(set(os.path.splitext(FileName)[0] for FileName in os.listdir(Folder)
+                      if FileName.endswith(".py") or FileName.endswith(".json")))
+
+
+# Generates flows of every ( setup, application, allocation map, reference clock ) combination, by jobs processes.
+# Returns the manifest of the sweep. In incremental mode, only JSON files whose content changed are rewritten, injector
+# seeds being derived from seed (0 if not given). Stages of every flow are profiled if profileFlag is set, and their
+# peak memory allocation reported if traceMemoryFlag is set. Injector payloads are run-length encoded if
+# compactPayloads is set
+def sweep(SetupScripts, AppScripts, AllocScripts, ReferenceClocks, OutputPath="Flows", jobs=1, compact=False,
+          seed=None, incremental=False, profileFlag=False, traceMemoryFlag=False, compactPayloads=False):
+
+    Pairs = [(AppScript, AllocScript) for AppScript in AppScripts for AllocScript in AllocScripts]
+    Groups = [(SetupScript, ReferenceClock) for SetupScript in SetupScripts for ReferenceClock in ReferenceClocks]
+    startTime = time.perf_counter()
+
+    if incremental and seed is None:
+        seed = 0
+
+    # Pairs of every ( setup, reference clock ) group are split into consecutive chunks, so there are at least jobs
+    # tasks even when there are fewer groups than jobs. Each task loads its setup once
+    amountOfChunks = min(len(Pairs), math.ceil(jobs / max(1, len(Groups))))
+    Tasks = [(SetupScript, ReferenceClock, Pairs[len(Pairs) * chunk // amountOfChunks:
+                                                 len(Pairs) * (chunk + 1) // amountOfChunks])
+             for SetupScript, ReferenceClock in Groups for chunk in range(amountOfChunks)]
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as Pool:
+            EntryLists = list(Pool.map(generateSetupFlows, [Task[0] for Task in Tasks], [Task[1] for Task in Tasks],
+                                       [Task[2] for Task in Tasks], [OutputPath] * len(Tasks),
+                                       [compact] * len(Tasks), [seed] * len(Tasks), [incremental] * len(Tasks),
+                                       [profileFlag] * len(Tasks), [traceMemoryFlag] * len(Tasks),
+                                       [compactPayloads] * len(Tasks)))
+    else:
+        EntryLists = [generateSetupFlows(SetupScript, ReferenceClock, ChunkPairs, OutputPath, compact, seed,
+                                         incremental, profileFlag, traceMemoryFlag, compactPayloads)
+                      for SetupScript, ReferenceClock, ChunkPairs in Tasks]
+
+    Entries = [Entry for EntryList in EntryLists for Entry in EntryList]
+
+    return {"Setups": SetupScripts, "Applications": AppScripts, "AllocationMaps": AllocScripts,
+            "ReferenceClocks": ReferenceClocks, "Seed": seed, "Seconds": time.perf_counter() - startTime,
+            "AmountGenerated": sum(Entry["Status"] == "Generated" for Entry in Entries),
+            "AmountFailed": sum(Entry["Status"] == "Failed" for Entry in Entries), "Flows": Entries}
+
+
+# Expects as arguments: [--setups names] ; [--apps names] ; [--allocs names] ; [--clocks MHz] ; [--jobs N] ;
+# [--output directory] ; [--manifest file] ; [--compact] ; [--compact-payloads] ; [--seed N] ; [--incremental] ;
+# [--profile] ; [--trace-memory]. Every definition found in the Setups, Applications and AllocationMaps folders is used
+# by default
+def main():
+
+    parser = argparse.ArgumentParser(description="Generates flows of every setup x application x allocation map x "
+                                                 "reference clock combination")
+    parser.add_argument("--setups", nargs="+", dest="SetupScripts", help="setup scripts, located in Setups folder")
+    parser.add_argument("--apps", nargs="+", dest="AppScripts",
+                        help="application scripts, located in Applications folder")
+    parser.add_argument("--allocs", nargs="+", dest="AllocScripts",
+                        help="allocation map scripts, located in AllocationMaps folder")
+    parser.add_argument("--clocks", nargs="+", type=int, default=[100], dest="ReferenceClocks",
+                        help="platform reference clocks, in MHz")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="amount of processes generating flows")
+    parser.add_argument("--output", default="Flows", dest="OutputPath", help="directory flows are generated in")
+    parser.add_argument("--manifest", dest="ManifestFileName",
+                        help="sweep manifest file (default: SweepManifest.json in output directory)")
+    parser.add_argument("--compact", action="store_true", help="write JSON files without indentation or whitespace")
+    parser.add_argument("--compact-payloads", action="store_true", dest="compactPayloads",
+                        help="run-length encode injector payloads (not yet readable by Injector.vhd)")
+    parser.add_argument("--seed", type=int, help="derive injector RNG seeds from given seed instead of drawing them at "
+                                                  "random, making generation deterministic")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only rewrite JSON files whose content changed since last sweep (implies --seed 0 if no "
+                             "seed is given)")
+    parser.add_argument("--profile", action="store_true", dest="profileFlag",
+                        help="run every stage under cProfile, writing its statistics next to each timing report")
+    parser.add_argument("--trace-memory", action="store_true", dest="traceMemoryFlag",
+                        help="trace Python allocations, reporting the peak amount of memory allocated by every stage")
+    args = parser.parse_args()
+
+    SetupScripts = args.SetupScripts if args.SetupScripts is not None else listScripts("Setups")
+    AppScripts = args.AppScripts if args.AppScripts is not None else listScripts("Applications")
+    AllocScripts = args.AllocScripts if args.AllocScripts is not None else listScripts("AllocationMaps")
+
+    Manifest = sweep(SetupScripts, AppScripts, AllocScripts, args.ReferenceClocks, args.OutputPath, args.jobs,
+                     args.compact, args.seed, args.incremental, args.profileFlag, args.traceMemoryFlag,
+                     args.compactPayloads)
+
+    for Entry in Manifest["Flows"]:
+        if Entry["Status"] == "Failed":
+            print("Failed to generate \"" + os.path.basename(Entry["Directory"]) + "\": " +
+                  Entry["Error"].splitlines()[-1])
+
+    ManifestFileName = args.ManifestFileName or os.path.join(args.OutputPath, "SweepManifest.json")
+    os.makedirs(os.path.dirname(ManifestFileName) or ".", exist_ok=True)
+    with open(ManifestFileName, 'w') as ManifestFile:
+        ManifestFile.write(json.dumps(Manifest, indent=4))
+
+    print(str(Manifest["AmountGenerated"]) + " flows generated, " + str(Manifest["AmountFailed"]) + " failed, in " +
+          "{:.2f}".format(Manifest["Seconds"]) + " s. Manifest written to " + ManifestFileName)
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Sources import PlatformComposer
+
+
+class BaseNoCTest(unittest.TestCase):
+
+    # BaseNoC is indexed [x][y], so it must hold X lists of Y elements. It used to hold Y lists of X elements, which
+    # raised IndexError on base NoCs wider than tall (such as the 6x5 base NoC of H33 setups) and left the last rows
+    # out on base NoCs taller than wide
+    def test_non_square_base_nocs_are_indexed_by_x_then_y(self):
+
+        for X, Y in [(6, 5), (5, 6), (3, 1), (1, 3)]:
+            with self.subTest(BaseNoCDimensions=(X, Y)):
+
+                Setup = PlatformComposer.Platform((X, Y), ReferenceClock=100)
+
+                self.assertEqual(len(Setup.BaseNoC), X)
+                self.assertTrue(all(len(Column) == Y for Column in Setup.BaseNoC))
+                self.assertEqual([Setup.BaseNoC[x][y].PEPos for y in range(Y) for x in range(X)], list(range(X * Y)))
+
+    def test_structures_fit_at_far_corner_of_non_square_base_nocs(self):
+
+        for X, Y in [(6, 5), (5, 6)]:
+            with self.subTest(BaseNoCDimensions=(X, Y)):
+
+                Setup = PlatformComposer.Platform((X, Y), ReferenceClock=100)
+                Corner = PlatformComposer.Crossbar(4)
+                Setup.addStructure(NewStructure=Corner, WrapperLocationInBaseNoc=(X - 1, Y - 1))
+
+                self.assertIs(Setup.BaseNoC[X - 1][Y - 1], Corner)
+                self.assertEqual(Corner.AddressInBaseNoC, X * Y - 1)
+                self.assertEqual(Setup.AmountOfPEs, X * Y + 3)
+                self.assertEqual([Setup.WrapperAddresses[StructurePE.PEPos] for StructurePE in Corner.PEs],
+                                 [X * Y - 1] * 4)
+                self.assertEqual(Setup.toDict()["CrossbarWrapperIDs"], [X * Y - 1])
+
+
+# Forces entry point
+if __name__ == "__main__":
+    unittest.main()
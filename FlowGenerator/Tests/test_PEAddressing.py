@@ -0,0 +1,185 @@
+import os
+import sys
+import json
+import math
+import unittest
+
+FlowGeneratorPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, FlowGeneratorPath)
+from Sources import PlatformComposer, AppComposer, DefinitionLoader
+
+SetupsPath = os.path.join(FlowGeneratorPath, "Setups")
+
+# Setups whose structures don't fill the square NoC, so some structure PEs are moved into gaps between PEPos values
+GappedSetups = ["H25_100", "H25_25", "H25_36", "H33_64"]
+
+
+# Returns names of every setup script
+def getSetupNames():
+    return sorted(FileName[:-3] for FileName in os.listdir(SetupsPath) if FileName.endswith(".py"))
+
+
+# Returns PEPos values of every PE, in base NoC order (structure PEs following their wrapper)
+def getPEPositions(Setup):
+
+    PEPositions = []
+
+    for y in range(Setup.BaseNoCDimensions[1]):
+        for x in range(Setup.BaseNoCDimensions[0]):
+            if isinstance(Setup.BaseNoC[x][y], PlatformComposer.Structure):
+                PEPositions.extend(StructurePE.PEPos for StructurePE in Setup.BaseNoC[x][y].PEs)
+            else:
+                PEPositions.append(Setup.BaseNoC[x][y].PEPos)
+
+    return PEPositions
+
+
+# Yields square NoC (x, y) coordinates of the L-shaped shells around a base NoC of given dimensions, cell by cell: a row
+# below the cells laid out so far (left to right), then a column to their right (bottom to top)
+def iterShellCells(X, Y):
+
+    k = 0
+
+    while True:
+
+        for x in range(X + k + 1):
+            yield x, Y + k
+
+        for y in range(Y + k - 1, -1, -1):
+            yield X + k, y
+
+        k += 1
+
+
+# Returns ( PEPos values in base NoC order, wrapper addresses by PEPos value ) expected from the square NoC layout,
+# independently of Platform: each base NoC element (or first PE of its structure) at its base NoC coordinates, then the
+# remaining structure PEs along the shells, then PEs past the last PEPos value moved into gaps (in increasing order)
+def getShellLayout(Setup):
+
+    X, Y = Setup.BaseNoCDimensions
+    squareNoCBound = math.ceil(math.sqrt(Setup.AmountOfPEs))
+    ShellCells = iterShellCells(X, Y)
+    Layout = []  # ( square NoC x, square NoC y, wrapper address ) of every PE, in base NoC order
+
+    for y in range(Y):
+        for x in range(X):
+
+            Element = Setup.BaseNoC[x][y]
+            Layout.append((x, y, y * X + x))
+
+            if isinstance(Element, PlatformComposer.Structure):
+                Layout.extend(next(ShellCells) + (y * X + x,) for StructurePE in Element.PEs[1:])
+
+    PEPositions = [y * squareNoCBound + x for x, y, wrapperAddress in Layout]
+    Gaps = sorted(set(range(Setup.AmountOfPEs)) - set(PEPositions))
+    Moves = dict(zip(sorted(PEPos for PEPos in PEPositions if PEPos >= Setup.AmountOfPEs), Gaps))
+    PEPositions = [Moves.get(PEPos, PEPos) for PEPos in PEPositions]
+
+    WrapperAddresses = [None for PEPos in PEPositions]
+    for PEPos, (x, y, wrapperAddress) in zip(PEPositions, Layout):
+        WrapperAddresses[PEPos] = wrapperAddress
+
+    return PEPositions, WrapperAddresses
+
+
+class PEAddressingTest(unittest.TestCase):
+
+    # Reference PEPos values (in base NoC order) and wrapper addresses (by PEPos value) of every setup. The Provenance
+    # of each reference is "baseline" if the setup generated the same values before lazy addressing, "changed" if it
+    # generated other values then (see its Note) and "new" if it couldn't be generated then. Every reference is also
+    # checked against the square NoC layout (see getShellLayout)
+    @classmethod
+    def setUpClass(cls):
+
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "PEAddresses.json"), 'r') as ReferenceFile:
+            cls.References = json.load(ReferenceFile)
+
+    def loadSetup(self, SetupName):
+
+        Setup = DefinitionLoader.loadSetup(SetupName, 100, SetupsPath)
+        Setup.PEs
+
+        return Setup
+
+    def test_every_setup_has_reference(self):
+
+        self.assertEqual(sorted(self.References), getSetupNames())
+
+        for SetupName, Reference in self.References.items():
+            with self.subTest(Setup=SetupName):
+                self.assertIn(Reference["Provenance"], ["baseline", "changed", "new"])
+                self.assertEqual("Note" in Reference, Reference["Provenance"] != "baseline")
+
+    def test_references_match_shell_layout(self):
+
+        for SetupName in getSetupNames():
+            with self.subTest(Setup=SetupName):
+
+                PEPositions, WrapperAddresses = getShellLayout(self.loadSetup(SetupName))
+
+                self.assertEqual(PEPositions, self.References[SetupName]["PEPos"])
+                self.assertEqual(WrapperAddresses, self.References[SetupName]["WrapperAddresses"])
+
+    def test_addresses_match_reference(self):
+
+        for SetupName in getSetupNames():
+            with self.subTest(Setup=SetupName):
+
+                Setup = self.loadSetup(SetupName)
+
+                self.assertEqual(getPEPositions(Setup), self.References[SetupName]["PEPos"])
+                self.assertEqual([Setup.WrapperAddresses[PEPos] for PEPos in range(Setup.AmountOfPEs)],
+                                 self.References[SetupName]["WrapperAddresses"])
+
+    def test_addresses_are_contiguous(self):
+
+        for SetupName in getSetupNames():
+            with self.subTest(Setup=SetupName):
+
+                Setup = self.loadSetup(SetupName)
+
+                self.assertEqual(sorted(Setup.PEs), list(range(Setup.AmountOfPEs)))
+                self.assertEqual(sorted(Setup.WrapperAddresses), list(range(Setup.AmountOfPEs)))
+                self.assertTrue(all(SetupPE.PEPos == PEPos for PEPos, SetupPE in Setup.PEs.items()))
+
+    def test_wrapper_addresses_point_to_structures(self):
+
+        for SetupName in getSetupNames():
+            with self.subTest(Setup=SetupName):
+
+                Setup = self.loadSetup(SetupName)
+                X, Y = Setup.BaseNoCDimensions
+
+                for y in range(Y):
+                    for x in range(X):
+
+                        Element = Setup.BaseNoC[x][y]
+                        ElementPEs = Element.PEs if isinstance(Element, PlatformComposer.Structure) else [Element]
+
+                        for ElementPE in ElementPEs:
+                            self.assertEqual(Setup.WrapperAddresses[ElementPE.PEPos], y * X + x)
+
+    def test_gapped_setups_map_to_platform(self):
+
+        for SetupName in GappedSetups:
+            with self.subTest(Setup=SetupName):
+
+                Setup = self.loadSetup(SetupName)
+
+                # A thread per PE, each sending to the thread at the previous PEPos value (the first one to the last)
+                Ring = AppComposer.Application(AppName="Ring")
+                Threads = [AppComposer.Thread() for PEPos in range(Setup.AmountOfPEs)]
+                for i, Thread in enumerate(Threads):
+                    Ring.addThread(Thread)
+                    Thread.addTarget(AppComposer.Target(TargetThread=Threads[i - 1], Bandwidth=80))
+
+                Setup.addApplication(Ring)
+                Setup.setAllocationMap({PEPos: Thread for PEPos, Thread in enumerate(Threads)})
+                Setup.mapToPlatform(Seed=0)
+
+                self.assertEqual(sorted(Setup.Injectors), list(range(Setup.AmountOfPEs)))
+
+
+# Forces entry point
+if __name__ == "__main__":
+    unittest.main()
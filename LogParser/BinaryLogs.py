@@ -0,0 +1,146 @@
+import os
+import struct
+
+
+#                                                  Binary Log Format
+########################################################################################################################
+
+# A binary log file is a 16 byte header followed by fixed width little-endian records, one per text log line:
+#   Header: ( | magic "HLOG" | format version (uint16) | fields per record (uint16) | 8 reserved bytes | )
+#   Out log record: ( | target ID (uint32) | source ID (uint32) | msg size (uint32) | output timestamp (int64) | )
+#   In log record: ( | target ID (uint32) | source ID (uint32) | msg size (uint32) | output timestamp (int64) |
+#                    input timestamp (int64) | )
+
+MAGIC = b"HLOG"
+VERSION = 1
+HEADER = struct.Struct("<4sHH8x")
+OUT_RECORD = struct.Struct("<IIIq")
+IN_RECORD = struct.Struct("<IIIqq")
+
+
+# Returns record struct for a log with given amount of fields per line
+def getRecordStruct(amountOfFields):
+
+    if amountOfFields == 4:
+        return OUT_RECORD
+    elif amountOfFields == 5:
+        return IN_RECORD
+
+    raise ValueError("Binary logs must have 4 (Out log) or 5 (In log) fields per record, not " + str(amountOfFields))
+
+
+# Returns NumPy dtype of a record, with fields named after LogParser.Message attributes
+def getRecordDtype(amountOfFields):
+
+    import numpy as np
+
+    Fields = [("TargetID", "<u4"), ("SourceID", "<u4"), ("MessageSize", "<u4"), ("OutputTimestamp", "<i8")]
+    if amountOfFields == 5:
+        Fields.append(("InputTimestamp", "<i8"))
+
+    return np.dtype(Fields)
+
+
+# Reads and validates the header of an open binary log file, returns its amount of fields per record
+def readHeader(BinaryFile, FileName):
+
+    magic, version, amountOfFields = HEADER.unpack(BinaryFile.read(HEADER.size))
+
+    if magic != MAGIC:
+        raise ValueError("\"" + str(FileName) + "\" is not a binary log file")
+
+    if version != VERSION:
+        raise ValueError("\"" + str(FileName) + "\" has unsupported binary log version " + str(version))
+
+    getRecordStruct(amountOfFields)
+    return amountOfFields
+
+
+#                                                  Helper Functions
+########################################################################################################################
+
+
+# Converts a text log file into a binary log file, in chunks of about chunkSize bytes. Returns amount of records written
+def convertLog(TextFileName, BinaryFileName, isInputLog, chunkSize=1 << 20):
+
+    amountOfFields = 5 if isInputLog else 4
+    Record = getRecordStruct(amountOfFields)
+    amountOfRecords = 0
+
+    with open(TextFileName, 'r') as TextFile, open(BinaryFileName, 'wb') as BinaryFile:
+
+        BinaryFile.write(HEADER.pack(MAGIC, VERSION, amountOfFields))
+
+        while True:
+
+            lines = TextFile.readlines(chunkSize)
+
+            if not lines:
+                break
+
+            Records = [Record.pack(*map(int, line.split())) for line in lines if not line.isspace()]
+            BinaryFile.write(b"".join(Records))
+            amountOfRecords += len(Records)
+
+    return amountOfRecords
+
+
+# Returns a read-only structured NumPy array mapped over the records of a binary log file (no record is copied)
+def openBinaryLog(FileName):
+
+    import numpy as np
+
+    with open(FileName, 'rb') as BinaryFile:
+        amountOfFields = readHeader(BinaryFile, FileName)
+
+    # A record still being written at the end of the file is left out
+    RecordDtype = getRecordDtype(amountOfFields)
+    amountOfRecords = (os.path.getsize(FileName) - HEADER.size) // RecordDtype.itemsize
+
+    if amountOfRecords == 0:
+        return np.zeros(0, dtype=RecordDtype)
+
+    return np.memmap(FileName, dtype=RecordDtype, mode='r', offset=HEADER.size, shape=(amountOfRecords,))
+
+
+# Lazily reads a binary log file, about chunkSize bytes at a time, yielding each record as a tuple of ints
+def readBinaryLogEntries(FileName, chunkSize=1 << 20):
+
+    with open(FileName, 'rb') as BinaryFile:
+
+        Record = getRecordStruct(readHeader(BinaryFile, FileName))
+        chunkSize -= chunkSize % Record.size
+
+        while True:
+
+            chunk = BinaryFile.read(max(chunkSize, Record.size))
+            chunk = chunk[0:len(chunk) - (len(chunk) % Record.size)]
+
+            if not chunk:
+                break
+
+            yield from Record.iter_unpack(chunk)
+
+
+#                                                     Entry Point
+########################################################################################################################
+
+
+# Expects as arguments: $1 = amount of PEs in network. Converts every InLog<i>.txt and OutLog<i>.txt in current
+# directory into InLog<i>.bin and OutLog<i>.bin
+def main():
+
+    import sys
+    amountOfPEs = int(sys.argv[1])
+
+    for i in range(amountOfPEs):
+
+        for logName, isInputLog in (("InLog", True), ("OutLog", False)):
+
+            amountOfRecords = convertLog(logName + str(i) + ".txt", logName + str(i) + ".bin", isInputLog)
+            print("Converted " + logName + str(i) + ".txt (" + str(amountOfRecords) + " records)")
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import numpy as np
+import BinaryLogs
+from LatencyDistribution import LatencyDistribution
+
+
+#                                                  Class Definitions
+########################################################################################################################
+
+
+class ColumnarLog:
+
+    # Constructor (InputTimestamp is None for Out logs)
+    def __init__(self, TargetID, SourceID, MessageSize, OutputTimestamp, InputTimestamp=None):
+
+        self.TargetID = TargetID
+        self.SourceID = SourceID
+        self.MessageSize = MessageSize
+        self.OutputTimestamp = OutputTimestamp
+        self.InputTimestamp = InputTimestamp
+        self.isInputLog = InputTimestamp is not None
+
+    # Builds a ColumnarLog from a ( lines x fields ) int array
+    @classmethod
+    def fromArray(cls, Entries, isInputLog):
+
+        return cls(TargetID=Entries[:, 0].astype(np.int32),
+                   SourceID=Entries[:, 1].astype(np.int32),
+                   MessageSize=Entries[:, 2].astype(np.int32),
+                   OutputTimestamp=Entries[:, 3].astype(np.int64),
+                   InputTimestamp=Entries[:, 4].astype(np.int64) if isInputLog else None)
+
+    # Builds a ColumnarLog over the fields of a structured array of binary log records (see BinaryLogs.py), without
+    # copying them
+    @classmethod
+    def fromRecords(cls, Records):
+
+        return cls(TargetID=Records["TargetID"],
+                   SourceID=Records["SourceID"],
+                   MessageSize=Records["MessageSize"],
+                   OutputTimestamp=Records["OutputTimestamp"],
+                   InputTimestamp=Records["InputTimestamp"] if "InputTimestamp" in Records.dtype.names else None)
+
+    # Concatenates a list of ColumnarLog objects of the same type, keeping their order
+    @classmethod
+    def concatenate(cls, Logs, isInputLog):
+
+        if len(Logs) == 0:
+            return cls.fromArray(np.zeros((0, 5 if isInputLog else 4), dtype=np.int64), isInputLog)
+
+        return cls(TargetID=np.concatenate([Log.TargetID for Log in Logs]),
+                   SourceID=np.concatenate([Log.SourceID for Log in Logs]),
+                   MessageSize=np.concatenate([Log.MessageSize for Log in Logs]),
+                   OutputTimestamp=np.concatenate([Log.OutputTimestamp for Log in Logs]),
+                   InputTimestamp=np.concatenate([Log.InputTimestamp for Log in Logs]) if isInputLog else None)
+
+    def __len__(self):
+        return len(self.TargetID)
+
+
+#                                                  Helper Functions
+########################################################################################################################
+
+
+# Parses a whole log text file into a ColumnarLog
+def loadLog(FileName, isInputLog):
+
+    # An Input log line should look like: ( | target ID | source ID | msg size | output timestamp | input timestamp | )
+    # An Output log line should look like: ( | target ID | source ID | msg size | output timestamp | )
+    amountOfFields = 5 if isInputLog else 4
+    Values = np.fromfile(FileName, dtype=np.int64, sep=" ")
+
+    if len(Values) % amountOfFields != 0:
+        raise ValueError("Log file \"" + str(FileName) + "\" does not have " + str(amountOfFields) + " fields per line")
+
+    return ColumnarLog.fromArray(Values.reshape(-1, amountOfFields), isInputLog)
+
+
+# Maps a whole binary log file (see BinaryLogs.py) into a ColumnarLog
+def loadBinaryLog(FileName, isInputLog):
+
+    Log = ColumnarLog.fromRecords(BinaryLogs.openBinaryLog(FileName))
+
+    if Log.isInputLog != isInputLog:
+        raise ValueError("\"" + str(FileName) + "\" is not an " + ("In" if isInputLog else "Out") + " log")
+
+    return Log
+
+
+# Loads every In and Out log of the platform (from InLog<i>.bin/OutLog<i>.bin files if binaryFlag is set), returns them
+# as two platform-wide ColumnarLog objects
+def loadLogs(amountOfPEs, binaryFlag=False):
+
+    if binaryFlag:
+        InLogs = [loadBinaryLog("InLog" + str(i) + ".bin", True) for i in range(amountOfPEs)]
+        OutLogs = [loadBinaryLog("OutLog" + str(i) + ".bin", False) for i in range(amountOfPEs)]
+    else:
+        InLogs = [loadLog("InLog" + str(i) + ".txt", True) for i in range(amountOfPEs)]
+        OutLogs = [loadLog("OutLog" + str(i) + ".txt", False) for i in range(amountOfPEs)]
+
+    InLog = ColumnarLog.concatenate(InLogs, True)
+    OutLog = ColumnarLog.concatenate(OutLogs, False)
+
+    return InLog, OutLog
+
+
+# Pairs Out log entries with In log entries sharing the same ( target ID, source ID, msg size, output timestamp ) key.
+# Entries with a repeated key are paired in FIFO order, the n-th Out entry with the n-th In entry. Returns the indexes
+# of matching entries as ( Out log indexes, In log indexes )
+def matchLogs(InLog, OutLog):
+
+    amountOfOutEntries = len(OutLog)
+    amountOfEntries = amountOfOutEntries + len(InLog)
+
+    TargetID = np.concatenate((OutLog.TargetID, InLog.TargetID))
+    SourceID = np.concatenate((OutLog.SourceID, InLog.SourceID))
+    MessageSize = np.concatenate((OutLog.MessageSize, InLog.MessageSize))
+    OutputTimestamp = np.concatenate((OutLog.OutputTimestamp, InLog.OutputTimestamp))
+    isInputEntry = np.arange(amountOfEntries) >= amountOfOutEntries
+
+    # Sorts by key, then Out entries before In entries, then original position. np.lexsort uses its last key as primary
+    order = np.lexsort((np.arange(amountOfEntries), isInputEntry, OutputTimestamp, MessageSize, SourceID, TargetID))
+
+    keyChanged = np.ones(amountOfEntries, dtype=bool)
+    keyChanged[1:] = ((TargetID[order][1:] != TargetID[order][:-1]) | (SourceID[order][1:] != SourceID[order][:-1]) |
+                      (MessageSize[order][1:] != MessageSize[order][:-1]) |
+                      (OutputTimestamp[order][1:] != OutputTimestamp[order][:-1]))
+    sideChanged = keyChanged.copy()
+    sideChanged[1:] |= isInputEntry[order][1:] != isInputEntry[order][:-1]
+
+    # Position of every entry inside its key group and inside its ( key, side ) run
+    positions = np.arange(amountOfEntries)
+    groupStart = np.maximum.accumulate(np.where(keyChanged, positions, 0))
+    runStart = np.maximum.accumulate(np.where(sideChanged, positions, 0))
+    rank = positions - runStart
+
+    # Out entries come first in each group, so the n-th In entry of a group matches the entry at group start + n,
+    # as long as the group has more than n Out entries
+    groupID = np.cumsum(keyChanged) - 1
+    outEntriesInGroup = np.bincount(groupID, weights=~isInputEntry[order])
+
+    sortedInEntries = np.flatnonzero(isInputEntry[order])
+    sortedInEntries = sortedInEntries[rank[sortedInEntries] < outEntriesInGroup[groupID[sortedInEntries]]]
+
+    InIndexes = order[sortedInEntries] - amountOfOutEntries
+    OutIndexes = order[groupStart[sortedInEntries] + rank[sortedInEntries]]
+
+    return OutIndexes, InIndexes
+
+
+# Builds the LatencyDistribution of every flow. Latencies must be grouped by flow index, in sending order within a flow
+def buildDistributions(amountOfFlows, FlowIndexes, Latencies, histogramWidth):
+
+    Distributions = [LatencyDistribution(histogramWidth) for i in range(amountOfFlows)]
+
+    if len(Latencies) == 0:
+        return Distributions
+
+    Latencies = Latencies.astype(np.float64)
+    count = np.bincount(FlowIndexes, minlength=amountOfFlows)
+    mean = np.bincount(FlowIndexes, weights=Latencies, minlength=amountOfFlows) / np.maximum(count, 1)
+    M2 = np.bincount(FlowIndexes, weights=(Latencies - mean[FlowIndexes]) ** 2, minlength=amountOfFlows)
+
+    FlowStarts = np.flatnonzero(np.r_[True, FlowIndexes[1:] != FlowIndexes[:-1]])
+    FlowEnds = np.r_[FlowStarts[1:], len(FlowIndexes)] - 1
+    minLatency = np.minimum.reduceat(Latencies, FlowStarts)
+    maxLatency = np.maximum.reduceat(Latencies, FlowStarts)
+
+    # Consecutive messages are only compared within the same flow
+    sameFlow = FlowIndexes[1:] == FlowIndexes[:-1]
+    jitterSum = np.bincount(FlowIndexes[1:][sameFlow], weights=np.abs(np.diff(Latencies))[sameFlow],
+                            minlength=amountOfFlows)
+    jitterCount = np.bincount(FlowIndexes[1:][sameFlow], minlength=amountOfFlows)
+
+    # Sketch and histogram buckets are counted per ( flow, bucket ) pair
+    Sketch = Distributions[0].Sketch
+    isPositive = Latencies > 0
+    SketchBuckets = np.zeros(len(Latencies), dtype=np.int64)
+    SketchBuckets[isPositive] = np.ceil(np.log(Latencies[isPositive]) / Sketch.logGamma)
+    HistogramBuckets = (Latencies // histogramWidth).astype(np.int64)
+
+    for i, flowIndex in enumerate(FlowIndexes[FlowStarts]):
+
+        Distribution = Distributions[flowIndex]
+        Distribution.count = int(count[flowIndex])
+        Distribution.mean = float(mean[flowIndex])
+        Distribution.M2 = float(M2[flowIndex])
+        Distribution.minLatency = int(minLatency[i])
+        Distribution.maxLatency = int(maxLatency[i])
+        Distribution.lastLatency = int(Latencies[FlowEnds[i]])
+        Distribution.jitterSum = float(jitterSum[flowIndex])
+        Distribution.jitterCount = int(jitterCount[flowIndex])
+
+        FlowSlice = slice(FlowStarts[i], FlowEnds[i] + 1)
+        indexes, amounts = np.unique(SketchBuckets[FlowSlice][isPositive[FlowSlice]], return_counts=True)
+        Distribution.Sketch.addBuckets(dict(zip(indexes.tolist(), amounts.tolist())),
+                                       int(np.count_nonzero(~isPositive[FlowSlice])))
+        indexes, amounts = np.unique(HistogramBuckets[FlowSlice], return_counts=True)
+        Distribution.Histogram.Buckets = dict(zip(indexes.tolist(), amounts.tolist()))
+
+    return Distributions
+
+
+# Computes hit count, miss count, average latency and latency distribution of every ( source, target ) flow with at
+# least one sent message. Returns ( source IDs, target IDs, hit counts, miss counts, average latencies, distributions ),
+# ordered by target then source
+def computeFlowStatistics(amountOfPEs, InLog, OutLog, histogramWidth=100):
+
+    OutIndexes, InIndexes = matchLogs(InLog, OutLog)
+
+    # Flows are numbered ( target * amountOfPEs + source ), so increasing flow numbers follow the console report order.
+    # Only flows present in the Out logs are counted, instead of every one of the amountOfPEs ^ 2 possible pairs
+    Flows = OutLog.TargetID.astype(np.int64) * amountOfPEs + OutLog.SourceID
+    ActiveFlows, FlowIndexes, sentCount = np.unique(Flows, return_inverse=True, return_counts=True)
+
+    # Matched messages are grouped by flow, in sending order (every message of a flow comes from the same Out log)
+    order = np.lexsort((OutIndexes, FlowIndexes[OutIndexes]))
+    OutIndexes = OutIndexes[order]
+    InIndexes = InIndexes[order]
+    Latencies = InLog.InputTimestamp[InIndexes] - OutLog.OutputTimestamp[OutIndexes]
+
+    hitCount = np.bincount(FlowIndexes[OutIndexes], minlength=len(ActiveFlows))
+    latencySum = np.bincount(FlowIndexes[OutIndexes], weights=Latencies, minlength=len(ActiveFlows))
+
+    avgLatencies = np.zeros(len(ActiveFlows))
+    np.divide(latencySum, hitCount, out=avgLatencies, where=hitCount > 0)
+
+    Distributions = buildDistributions(len(ActiveFlows), FlowIndexes[OutIndexes], Latencies, histogramWidth)
+
+    return (ActiveFlows % amountOfPEs, ActiveFlows // amountOfPEs, hitCount, sentCount - hitCount, avgLatencies,
+            Distributions)
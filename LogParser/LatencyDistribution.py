@@ -0,0 +1,207 @@
+import math
+
+
+#                                                  Class Definitions
+########################################################################################################################
+
+
+class LatencySketch:
+
+    # Constructor. Quantiles are estimated within relativeAccuracy of their true value, in bounded memory: values are
+    # counted in logarithmically sized buckets (https://arxiv.org/abs/1908.10693), at most maxBuckets of them
+    def __init__(self, relativeAccuracy=0.01, maxBuckets=2048):
+
+        self.relativeAccuracy = relativeAccuracy
+        self.maxBuckets = maxBuckets
+        self.gamma = (1 + relativeAccuracy) / (1 - relativeAccuracy)
+        self.logGamma = math.log(self.gamma)
+        self.Buckets = dict()  # Maps bucket index to amount of values in ( gamma ^ (index - 1), gamma ^ index ]
+        self.zeroCount = 0  # Amount of values <= 0
+        self.count = 0
+
+    # Returns index of the bucket containing given (positive) value
+    def getBucketIndex(self, value):
+        return math.ceil(math.log(value) / self.logGamma)
+
+    # Returns the value representing every value counted in given bucket
+    def getBucketValue(self, index):
+        return 2 * (self.gamma ** index) / (self.gamma + 1)
+
+    def add(self, value, amount=1):
+
+        if value <= 0:
+            self.zeroCount += amount
+        else:
+            index = self.getBucketIndex(value)
+            self.Buckets[index] = self.Buckets.get(index, 0) + amount
+
+        self.count += amount
+
+        if len(self.Buckets) > self.maxBuckets:
+            self.collapse()
+
+    # Adds amount of values counted in given buckets, as a { bucket index : amount } dict
+    def addBuckets(self, Buckets, zeroCount=0):
+
+        for index, amount in Buckets.items():
+            self.Buckets[index] = self.Buckets.get(index, 0) + amount
+            self.count += amount
+
+        self.zeroCount += zeroCount
+        self.count += zeroCount
+
+        if len(self.Buckets) > self.maxBuckets:
+            self.collapse()
+
+    # Merges lowest buckets together, so only maxBuckets remain (only the lowest quantiles lose accuracy)
+    def collapse(self):
+
+        indexes = sorted(self.Buckets)
+        amountToMerge = len(indexes) - self.maxBuckets + 1
+
+        mergedAmount = sum(self.Buckets.pop(index) for index in indexes[0:amountToMerge])
+        self.Buckets[indexes[amountToMerge - 1]] = mergedAmount
+
+    def merge(self, Other):
+        self.addBuckets(Other.Buckets, Other.zeroCount)
+
+    # Returns estimate of the q-th quantile (0 <= q <= 1), or None if no value was added. The quantile is the value of
+    # nearest rank ceil(q * count), so tail quantiles of few values are their largest value rather than one below it
+    def getQuantile(self, q):
+
+        if self.count == 0:
+            return None
+
+        rank = max(1, math.ceil(q * self.count))
+
+        if rank <= self.zeroCount:
+            return 0
+
+        cumulativeCount = self.zeroCount
+        for index in sorted(self.Buckets):
+
+            cumulativeCount += self.Buckets[index]
+
+            if cumulativeCount >= rank:
+                return self.getBucketValue(index)
+
+        return self.getBucketValue(max(self.Buckets))
+
+
+class LatencyHistogram:
+
+    # Constructor. Values are counted in fixed buckets of bucketWidth ns, bucket i holding values in [ i * bucketWidth,
+    # (i + 1) * bucketWidth ). Only non-empty buckets are stored
+    def __init__(self, bucketWidth=100):
+
+        self.bucketWidth = bucketWidth
+        self.Buckets = dict()
+
+    def add(self, value, amount=1):
+
+        index = int(value // self.bucketWidth)
+        self.Buckets[index] = self.Buckets.get(index, 0) + amount
+
+    def merge(self, Other):
+
+        if Other.bucketWidth != self.bucketWidth:
+            raise ValueError("Can't merge histograms with different bucket widths")
+
+        for index, amount in Other.Buckets.items():
+            self.Buckets[index] = self.Buckets.get(index, 0) + amount
+
+    # Returns ( lower bound, amount ) tuples of every non-empty bucket, in increasing order
+    def getBuckets(self):
+        return [(index * self.bucketWidth, self.Buckets[index]) for index in sorted(self.Buckets)]
+
+
+class LatencyDistribution:
+
+    # Constructor
+    def __init__(self, histogramWidth=100):
+
+        self.Sketch = LatencySketch()
+        self.Histogram = LatencyHistogram(histogramWidth)
+        self.count = 0
+        self.mean = 0
+        self.M2 = 0  # Sum of squared differences from the mean (Welford's algorithm)
+        self.minLatency = None
+        self.maxLatency = None
+
+        # Jitter is the mean absolute difference between the latencies of consecutive messages
+        self.lastLatency = None
+        self.jitterSum = 0
+        self.jitterCount = 0
+
+    def add(self, latency):
+
+        self.Sketch.add(latency)
+        self.Histogram.add(latency)
+
+        self.count += 1
+        delta = latency - self.mean
+        self.mean += delta / self.count
+        self.M2 += delta * (latency - self.mean)
+
+        self.minLatency = latency if self.minLatency is None else min(self.minLatency, latency)
+        self.maxLatency = latency if self.maxLatency is None else max(self.maxLatency, latency)
+
+        if self.lastLatency is not None:
+            self.jitterSum += abs(latency - self.lastLatency)
+            self.jitterCount += 1
+
+        self.lastLatency = latency
+
+    # Merges another distribution into this one. Consecutive messages are only compared within each distribution
+    def merge(self, Other):
+
+        if Other.count == 0:
+            return
+
+        self.Sketch.merge(Other.Sketch)
+        self.Histogram.merge(Other.Histogram)
+
+        # Parallel variance update (Chan et al.)
+        totalCount = self.count + Other.count
+        delta = Other.mean - self.mean
+        self.M2 += Other.M2 + delta * delta * self.count * Other.count / totalCount
+        self.mean += delta * Other.count / totalCount
+        self.count = totalCount
+
+        self.minLatency = Other.minLatency if self.minLatency is None else min(self.minLatency, Other.minLatency)
+        self.maxLatency = Other.maxLatency if self.maxLatency is None else max(self.maxLatency, Other.maxLatency)
+
+        self.jitterSum += Other.jitterSum
+        self.jitterCount += Other.jitterCount
+        self.lastLatency = Other.lastLatency
+
+    # Returns estimate of the q-th latency quantile, clamped to the exact minimum and maximum latencies
+    def getQuantile(self, q):
+
+        estimate = self.Sketch.getQuantile(q)
+
+        if estimate is None:
+            return None
+
+        return min(max(estimate, self.minLatency), self.maxLatency)
+
+    def getStdDev(self):
+        return math.sqrt(self.M2 / self.count) if self.count > 0 else None
+
+    def getJitter(self):
+        return self.jitterSum / self.jitterCount if self.jitterCount > 0 else None
+
+    # Returns a dict with every summary value of the distribution (for JSON/CSV export)
+    def toDict(self):
+
+        return {
+            "Count": self.count,
+            "MinLatency": self.minLatency,
+            "P50": self.getQuantile(0.5),
+            "P90": self.getQuantile(0.9),
+            "P99": self.getQuantile(0.99),
+            "P999": self.getQuantile(0.999),
+            "MaxLatency": self.maxLatency,
+            "StdDev": self.getStdDev(),
+            "Jitter": self.getJitter()
+        }
@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+
+
+#                                                  Class Definitions
+########################################################################################################################
+
+
+class LogCache:
+
+    # Constructor. Cached objects are pickled into Directory, the least recently used ones being evicted once they add
+    # up to more than maxBytes. Directory/Manifest.json tracks every cached object and the content hash of every log
+    # file seen so far
+    def __init__(self, Directory, maxBytes=1 << 30):
+
+        self.Directory = Directory
+        self.maxBytes = maxBytes
+        self.ManifestFileName = os.path.join(Directory, "Manifest.json")
+
+        os.makedirs(Directory, exist_ok=True)
+
+        try:
+            with open(self.ManifestFileName, 'r') as ManifestFile:
+                Manifest = json.load(ManifestFile)
+        except (OSError, ValueError):
+            Manifest = dict()
+
+        # Maps log file path to its { "Size", "ModifiedTime", "Hash" }
+        self.Files = Manifest.get("Files", dict())
+
+        # Maps cache key to its { "FileName", "Size", "LastUsed" }
+        self.Entries = Manifest.get("Entries", dict())
+
+    # Returns SHA-256 hash of a file's content. The hash is only recomputed if the file size or modification time
+    # changed since it was last hashed
+    def getFileHash(self, FileName):
+
+        path = os.path.abspath(FileName)
+        FileStatus = os.stat(path)
+        Known = self.Files.get(path)
+
+        if (Known is not None and Known["Size"] == FileStatus.st_size and
+                Known["ModifiedTime"] == FileStatus.st_mtime_ns):
+            return Known["Hash"]
+
+        Hash = hashlib.sha256()
+        with open(path, 'rb') as File:
+            for chunk in iter(lambda: File.read(1 << 20), b""):
+                Hash.update(chunk)
+
+        self.Files[path] = {"Size": FileStatus.st_size, "ModifiedTime": FileStatus.st_mtime_ns,
+                            "Hash": Hash.hexdigest()}
+        return Hash.hexdigest()
+
+    # Returns a cache key for given kind of object, built from the content of given files and any other parameters
+    def getKey(self, kind, FileNames, *Parameters):
+
+        Hash = hashlib.sha256()
+
+        for FileName in FileNames:
+            Hash.update(self.getFileHash(FileName).encode())
+
+        Hash.update(repr(Parameters).encode())
+
+        return kind + "-" + Hash.hexdigest()
+
+    # Returns object cached under given key, or None if there is none
+    def load(self, key):
+
+        Entry = self.Entries.get(key)
+
+        if Entry is None:
+            return None
+
+        try:
+            with open(os.path.join(self.Directory, Entry["FileName"]), 'rb') as CacheFile:
+                CachedObject = pickle.load(CacheFile)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            del self.Entries[key]
+            return None
+
+        Entry["LastUsed"] = time.time()
+        return CachedObject
+
+    # Caches object under given key, then evicts least recently used objects until the cache fits in maxBytes
+    def store(self, key, CachedObject):
+
+        FileName = key + ".pickle"
+        path = os.path.join(self.Directory, FileName)
+
+        with open(path + ".tmp", 'wb') as CacheFile:
+            pickle.dump(CachedObject, CacheFile, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+        self.Entries[key] = {"FileName": FileName, "Size": os.path.getsize(path), "LastUsed": time.time()}
+        self.evict()
+
+    def evict(self):
+
+        totalSize = sum(Entry["Size"] for Entry in self.Entries.values())
+
+        for key in sorted(self.Entries, key=lambda key: self.Entries[key]["LastUsed"]):
+
+            if totalSize <= self.maxBytes:
+                break
+
+            Entry = self.Entries.pop(key)
+            totalSize -= Entry["Size"]
+
+            try:
+                os.remove(os.path.join(self.Directory, Entry["FileName"]))
+            except OSError:
+                pass
+
+    # Returns parsed entries of a log file, calling parse(FileName) only if they are not cached yet
+    def getLogEntries(self, FileName, parse):
+
+        key = self.getKey("Entries", [FileName])
+        Entries = self.load(key)
+
+        if Entries is None:
+            Entries = parse(FileName)
+            self.store(key, Entries)
+
+        return Entries
+
+    # Writes manifest back to disk, forgetting log files that no longer exist
+    def save(self):
+
+        self.evict()
+        self.Files = {path: Known for path, Known in self.Files.items() if os.path.exists(path)}
+
+        with open(self.ManifestFileName + ".tmp", 'w') as ManifestFile:
+            json.dump({"Files": self.Files, "Entries": self.Entries}, ManifestFile, indent=4)
+        os.replace(self.ManifestFileName + ".tmp", self.ManifestFileName)
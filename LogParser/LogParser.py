@@ -1,3 +1,10 @@
+from collections import deque
+import heapq
+import time
+import json
+import csv
+from LatencyDistribution import LatencyDistribution
+
 
 #                                                  Class Definitions
 ########################################################################################################################
@@ -23,6 +30,19 @@ class Message:
         except IndexError:
             self.isInputEntry = False
 
+    # Builds a Message from a tuple of already parsed log fields (as read from a binary log)
+    @classmethod
+    def fromEntry(cls, Entry):
+
+        NewMessage = cls.__new__(cls)
+        NewMessage.TargetID, NewMessage.SourceID, NewMessage.MessageSize, NewMessage.OutputTimestamp = Entry[0:4]
+        NewMessage.isInputEntry = len(Entry) > 4
+
+        if NewMessage.isInputEntry:
+            NewMessage.InputTimestamp = Entry[4]
+
+        return NewMessage
+
     # Overloads operator " = " ( Compares 2 messages )
     def __eq__(self, comp):
         if (self.TargetID == comp.TargetID and self.SourceID == comp.SourceID
@@ -72,48 +92,765 @@ class Log:
         return tempString
 
 
+class InLogIndex:
+
+    # Constructor
+    def __init__(self):
+
+        # Maps a ( target ID, source ID, msg size, output timestamp ) key to the input timestamp of its In log entry. If
+        # the same key is logged more than once, the value is a deque of input timestamps, consumed in FIFO order
+        self.Entries = dict()
+
+    # Adds a Message object (from an In log) to index
+    def addEntry(self, Message):
+        pushFIFO(self.Entries, (Message.TargetID, Message.SourceID, Message.MessageSize, Message.OutputTimestamp),
+                 Message.InputTimestamp)
+
+    # Adds every entry of a Log object to index
+    def addLog(self, Log):
+
+        for Entry in Log.Entries:
+            self.addEntry(Entry)
+
+    # Removes and returns the input timestamp of the oldest In log entry matching given Message (None if there is none)
+    def popMatch(self, Message):
+        return popFIFO(self.Entries, (Message.TargetID, Message.SourceID, Message.MessageSize, Message.OutputTimestamp))
+
+    # Same as popMatch, for a ( target ID, source ID, msg size, output timestamp ) tuple
+    def popKey(self, key):
+        return popFIFO(self.Entries, key)
+
+    def __len__(self):
+        return sum(len(value) if isinstance(value, deque) else 1 for value in self.Entries.values())
+
+
+class StreamMatcher:
+
+    # Constructor. If orderedFlag is set, entries are consumed in timestamp order (see streamLogs), so an In log entry
+    # whose Out log entry wasn't consumed before it never matches, and is counted as unmatched instead of being kept
+    def __init__(self, Statistics, debugFlag=0, orderedFlag=False):
+
+        # Only entries still waiting for their counterpart are kept, keyed by ( target ID, source ID, msg size, output
+        # timestamp ). Out log entries store their line number, In log entries store their input timestamp
+        self.PendingOutEntries = dict()
+        self.PendingInEntries = dict()
+        self.amountOfUnmatchedInEntries = 0
+        self.Statistics = Statistics
+        self.debugFlag = debugFlag
+        self.orderedFlag = orderedFlag
+
+    # Consumes an Out log entry, given as a ( target ID, source ID, msg size, output timestamp ) tuple
+    def addOutEntry(self, Entry, lineNumber):
+
+        inputTimestamp = popFIFO(self.PendingInEntries, Entry)
+
+        if inputTimestamp is None:
+            pushFIFO(self.PendingOutEntries, Entry, lineNumber)
+        else:
+            self.addHit(Entry, inputTimestamp, lineNumber)
+
+    # Consumes an In log entry, given as a ( target ID, source ID, msg size, output timestamp, input timestamp ) tuple
+    def addInEntry(self, Entry):
+
+        key = Entry[0:4]
+        lineNumber = popFIFO(self.PendingOutEntries, key)
+
+        if lineNumber is None and self.orderedFlag:
+            self.addUnmatchedInEntry(key)
+        elif lineNumber is None:
+            pushFIFO(self.PendingInEntries, key, Entry[4])
+        else:
+            self.addHit(key, Entry[4], lineNumber)
+
+    def addUnmatchedInEntry(self, key):
+
+        self.amountOfUnmatchedInEntries += 1
+
+        if self.debugFlag == 1:
+            print("No match found for message received by ID = " + str(key[0]) + " from " + str(key[1]) +
+                  " with size " + str(key[2]) + " sent at " + str(key[3]))
+
+    def addHit(self, key, inputTimestamp, lineNumber):
+
+        currentLatency = inputTimestamp - key[3]
+
+        if self.debugFlag == 1:
+            print("Found match for message " + str(lineNumber) + " sent by ID = " + str(key[1]) + " to target " +
+                  str(key[0]) + " with size " + str(key[2]) + " with latency = " + str(currentLatency))
+
+        self.Statistics.addHit(key[1], key[0], currentLatency)
+
+    # Every Out log entry still pending once all logs have been read is a lost message. In log entries still pending
+    # match no Out log entry, and are only reported
+    def finish(self):
+
+        for key, inputTimestamps in self.PendingInEntries.items():
+            for inputTimestamp in (inputTimestamps if isinstance(inputTimestamps, deque) else (inputTimestamps,)):
+                self.addUnmatchedInEntry(key)
+
+        self.PendingInEntries = dict()
+
+        if self.amountOfUnmatchedInEntries > 0:
+            print(str(self.amountOfUnmatchedInEntries) + " In log entries match no Out log entry, and are ignored")
+
+        for key, lineNumbers in self.PendingOutEntries.items():
+
+            for lineNumber in (lineNumbers if isinstance(lineNumbers, deque) else (lineNumbers,)):
+
+                self.Statistics.addMiss(key[1], key[0])
+
+                if self.debugFlag == 1:
+                    print("No match found for message" + str(lineNumber) + " sent by ID = " + str(key[1]) +
+                          " to target " + str(key[0]) + " with size " + str(key[2]))
+
+        self.PendingOutEntries = dict()
+
+    def __len__(self):
+        return sum(len(value) if isinstance(value, deque) else 1 for value in self.PendingOutEntries.values())
+
+
+class LogFollower:
+
+    # Constructor. The log file doesn't need to exist yet
+    def __init__(self, FileName):
+
+        self.FileName = FileName
+        self.offset = 0  # Amount of bytes read so far
+        self.partialData = b""  # End of a line (or record) still being written
+        self.lineNumber = 0
+        self.Record = None  # Record struct, once the header of a binary log has been read
+
+    # Returns every entry appended to the log file since last call, as ( line number, tuple of ints ) tuples
+    def readNewEntries(self):
+
+        try:
+            with open(self.FileName, 'rb') as LogFile:
+                LogFile.seek(self.offset)
+                chunk = LogFile.read()
+        except FileNotFoundError:
+            return []
+
+        self.offset += len(chunk)
+        data = self.partialData + chunk
+
+        if self.FileName.endswith(".bin"):
+            Entries = self.parseRecords(data)
+        else:
+            lines = data.split(b"\n")
+            self.partialData = lines.pop()
+            Entries = [tuple(map(int, line.split())) for line in lines if line.strip()]
+
+        NumberedEntries = list(enumerate(Entries, self.lineNumber))
+        self.lineNumber += len(Entries)
+
+        return NumberedEntries
+
+    # Parses every complete binary log record in data (see BinaryLogs.py), keeping the rest for next call
+    def parseRecords(self, data):
+
+        import io
+        import BinaryLogs
+
+        if self.Record is None:
+
+            if len(data) < BinaryLogs.HEADER.size:
+                self.partialData = data
+                return []
+
+            self.Record = BinaryLogs.getRecordStruct(BinaryLogs.readHeader(io.BytesIO(data), self.FileName))
+            data = data[BinaryLogs.HEADER.size:]
+
+        end = len(data) - len(data) % self.Record.size
+        self.partialData = data[end:]
+
+        return list(self.Record.iter_unpack(data[0:end]))
+
+
+class FlowStatistics:
+
+    # Constructor
+    def __init__(self, histogramWidth=100):
+
+        self.hitCount = 0
+        self.missCount = 0
+        self.avgLatency = 0
+        self.avgLatencyCounter = 0
+        self.Distribution = LatencyDistribution(histogramWidth)
+
+
+class PlatformStatistics:
+
+    # Constructor
+    def __init__(self, histogramWidth=100):
+
+        # Maps a ( source ID, target ID ) pair to the FlowStatistics of that flow. Only pairs that exchanged at least
+        # one message are stored, so memory and reporting time follow the amount of live flows, not amountOfPEs ^ 2
+        self.Flows = dict()
+        self.histogramWidth = histogramWidth  # Width of latency histogram buckets, in ns
+
+    # Returns statistics of given flow, creating them on first use
+    def getFlow(self, src, tgt):
+
+        Flow = self.Flows.get((src, tgt))
+
+        if Flow is None:
+            Flow = FlowStatistics(self.histogramWidth)
+            self.Flows[(src, tgt)] = Flow
+
+        return Flow
+
+    # Registers a delivered message
+    def addHit(self, src, tgt, latency):
+
+        Flow = self.getFlow(src, tgt)
+
+        # Update average latency value (https://blog.demofox.org/2016/08/23/incremental-averaging/)
+        Flow.avgLatencyCounter += 1
+        Flow.avgLatency += (latency - Flow.avgLatency) / Flow.avgLatencyCounter
+        Flow.hitCount += 1
+        Flow.Distribution.add(latency)
+
+    # Registers a lost message
+    def addMiss(self, src, tgt):
+        self.getFlow(src, tgt).missCount += 1
+
+    # Registers the totals of a whole flow at once (merged with previous totals of the same flow, if any)
+    def addFlow(self, src, tgt, hits, misses, avgLatency, Distribution=None):
+
+        Flow = self.getFlow(src, tgt)
+
+        if Flow.avgLatencyCounter == 0:
+            Flow.avgLatency = avgLatency
+        elif hits > 0:
+            Flow.avgLatency += (avgLatency - Flow.avgLatency) * hits / (Flow.avgLatencyCounter + hits)
+
+        Flow.avgLatencyCounter += hits
+        Flow.hitCount += hits
+        Flow.missCount += misses
+
+        if Distribution is not None:
+            Flow.Distribution.merge(Distribution)
+
+    # Adds totals of every flow of another PlatformStatistics object
+    def merge(self, Other):
+
+        for (src, tgt), Flow in Other.Flows.items():
+            self.addFlow(src, tgt, Flow.hitCount, Flow.missCount, Flow.avgLatency, Flow.Distribution)
+
+    # Returns ( source ID, target ID ) pairs of every live flow, ordered by target then source
+    def getFlowKeys(self):
+        return sorted(self.Flows, key=lambda FlowKey: (FlowKey[1], FlowKey[0]))
+
+    # Returns totals of every live flow, as ( src, tgt, hits, misses, avgLatency, Distribution ) tuples
+    def getFlows(self):
+
+        return [(src, tgt, Flow.hitCount, Flow.missCount, Flow.avgLatency, Flow.Distribution)
+                for (src, tgt), Flow in self.Flows.items()]
+
+    # Returns latency distribution of every delivered message in platform
+    def getPlatformDistribution(self):
+
+        PlatformDistribution = LatencyDistribution(self.histogramWidth)
+
+        for FlowKey in self.getFlowKeys():
+            PlatformDistribution.merge(self.Flows[FlowKey].Distribution)
+
+        return PlatformDistribution
+
+    def printSummary(self):
+
+        FlowKeys = self.getFlowKeys()
+
+        # Prints out amount of successfully delivered messages
+        print("\n\tSuccessfully Delivered Messages")
+        for source, target in FlowKeys:
+            Flow = self.Flows[(source, target)]
+            if Flow.hitCount + Flow.missCount > 0:
+                print("Messages successfully delivered from " + str(source) + " to " + str(target) + ": " +
+                      str(Flow.hitCount) + "/" + str(Flow.hitCount + Flow.missCount))
+
+        # Prints out average latency values
+        print("\n\tAverage Latency Values:")
+        for source, target in FlowKeys:
+            Flow = self.Flows[(source, target)]
+            if Flow.avgLatency != 0:
+                print("Average latency from PE ID " + str(source) + " to PE ID " + str(target) + " = " +
+                      str(Flow.avgLatency) + " ns")
+
+        # Prints out tail latency values
+        print("\n\tLatency Distribution (p50 / p90 / p99 / p99.9 / max / jitter):")
+        for source, target in FlowKeys:
+            Distribution = self.Flows[(source, target)].Distribution
+            if Distribution.count > 0:
+                print("Latency from PE ID " + str(source) + " to PE ID " + str(target) + " = " +
+                      formatDistribution(Distribution) + " ns")
+
+        PlatformDistribution = self.getPlatformDistribution()
+        if PlatformDistribution.count > 0:
+            print("Latency over whole platform = " + formatDistribution(PlatformDistribution) + " ns")
+
+        print("")
+
+    # Returns every statistic, per flow and platform-wide, as a JSON-serializable dict
+    def toDict(self):
+
+        FlowDicts = []
+
+        for source, target in self.getFlowKeys():
+
+            Flow = self.Flows[(source, target)]
+            FlowDict = {"Source": source, "Target": target, "Sent": Flow.hitCount + Flow.missCount,
+                        "Delivered": Flow.hitCount, "Lost": Flow.missCount, "AverageLatency": Flow.avgLatency}
+            FlowDict.update(Flow.Distribution.toDict())
+            FlowDict["Histogram"] = Flow.Distribution.Histogram.getBuckets()
+            FlowDicts.append(FlowDict)
+
+        PlatformDistribution = self.getPlatformDistribution()
+        PlatformDict = {"Sent": sum(Flow["Sent"] for Flow in FlowDicts),
+                        "Delivered": sum(Flow["Delivered"] for Flow in FlowDicts),
+                        "Lost": sum(Flow["Lost"] for Flow in FlowDicts),
+                        "AverageLatency": PlatformDistribution.mean if PlatformDistribution.count > 0 else None}
+        PlatformDict.update(PlatformDistribution.toDict())
+        PlatformDict["Histogram"] = PlatformDistribution.Histogram.getBuckets()
+
+        return {"LatencyUnit": "ns", "HistogramBucketWidth": self.histogramWidth, "Platform": PlatformDict,
+                "Flows": FlowDicts}
+
+    def exportJSON(self, FileName):
+
+        with open(FileName, 'w') as JSONFile:
+            JSONFile.write(json.dumps(self.toDict(), indent=4))
+
+    # Writes one row per flow, plus a last row for the whole platform (Source and Target left empty). Histograms are
+    # only exported to JSON
+    def exportCSV(self, FileName):
+
+        StatisticsDict = self.toDict()
+        Columns = ["Source", "Target", "Sent", "Delivered", "Lost", "AverageLatency", "MinLatency", "P50", "P90", "P99",
+                   "P999", "MaxLatency", "StdDev", "Jitter"]
+
+        with open(FileName, 'w', newline="") as CSVFile:
+
+            Writer = csv.DictWriter(CSVFile, fieldnames=Columns, extrasaction="ignore")
+            Writer.writeheader()
+            Writer.writerows(StatisticsDict["Flows"])
+            Writer.writerow(StatisticsDict["Platform"])
+
+
+#                                                  Helper Functions
+########################################################################################################################
+
+
+# Formats p50 / p90 / p99 / p99.9 / max / jitter values of a LatencyDistribution
+def formatDistribution(Distribution):
+
+    Values = [Distribution.getQuantile(0.5), Distribution.getQuantile(0.9), Distribution.getQuantile(0.99),
+              Distribution.getQuantile(0.999), Distribution.maxLatency, Distribution.getJitter()]
+
+    return " / ".join("-" if value is None else str(round(value, 1)) for value in Values)
+
+
+# Stores value under key in a dict of FIFO queues (a single value is stored as is, a repeated key becomes a deque)
+def pushFIFO(Entries, key, value):
+
+    storedValue = Entries.get(key)
+
+    if storedValue is None:
+        Entries[key] = value
+    elif isinstance(storedValue, deque):
+        storedValue.append(value)
+    else:
+        Entries[key] = deque((storedValue, value))
+
+
+# Removes and returns the oldest value stored under key in a dict of FIFO queues (None if there is none)
+def popFIFO(Entries, key):
+
+    storedValue = Entries.get(key)
+
+    if storedValue is None:
+        return None
+
+    if isinstance(storedValue, deque):
+
+        value = storedValue.popleft()
+
+        if len(storedValue) == 0:
+            del Entries[key]
+
+        return value
+
+    del Entries[key]
+    return storedValue
+
+
+# Returns name of log file of PE i, logName being either "InLog" or "OutLog"
+def getLogFileName(logName, i, binaryFlag=False):
+    return logName + str(i) + (".bin" if binaryFlag else ".txt")
+
+
+# Lazily reads a log file in chunks of about chunkSize bytes, yielding each line (or record, for binary logs) as a tuple
+# of ints
+def readLogEntries(FileName, chunkSize=1 << 16):
+
+    if FileName.endswith(".bin"):
+        import BinaryLogs
+        yield from BinaryLogs.readBinaryLogEntries(FileName, chunkSize)
+        return
+
+    with open(FileName, 'r') as LogFile:
+
+        while True:
+
+            lines = LogFile.readlines(chunkSize)
+
+            if not lines:
+                break
+
+            for line in lines:
+
+                logEntry = line.split()
+
+                if logEntry:
+                    yield tuple(map(int, logEntry))
+
+
+# Parses a whole log file into a list of tuples of ints
+def parseLogEntries(FileName):
+    return list(readLogEntries(FileName))
+
+
+# Matches all logs without loading them, by merging every log in timestamp order. Out log entries are ordered by their
+# output timestamp and In log entries by their input timestamp, so a message is only held from the moment it is sent
+# until it is received, and an In log entry is never held. Every log file being read at once, a chunk of each (of
+# chunkSize bytes) is held in memory
+def streamLogs(amountOfPEs, Statistics, debugFlag=0, chunkSize=1 << 16, binaryFlag=False):
+
+    Matcher = StreamMatcher(Statistics, debugFlag, orderedFlag=True)
+
+    def outEvents(i):
+        for lineNumber, Entry in enumerate(readLogEntries(getLogFileName("OutLog", i, binaryFlag), chunkSize)):
+            yield Entry[3], 0, lineNumber, Entry
+
+    def inEvents(i):
+        for Entry in readLogEntries(getLogFileName("InLog", i, binaryFlag), chunkSize):
+            yield Entry[4], 1, 0, Entry
+
+    Events = [outEvents(i) for i in range(amountOfPEs)] + [inEvents(i) for i in range(amountOfPEs)]
+
+    for timestamp, isInputEntry, lineNumber, Entry in heapq.merge(*Events, key=lambda Event: Event[0:2]):
+
+        if isInputEntry:
+            Matcher.addInEntry(Entry)
+        else:
+            Matcher.addOutEntry(Entry, lineNumber)
+
+    Matcher.finish()
+
+
+# Parses Out log i, grouping its entries by target ID as ( source ID, msg size, output timestamp, line number ) tuples
+def loadOutLogShard(i, binaryFlag=False):
+
+    Shard = dict()
+
+    for lineNumber, Entry in enumerate(readLogEntries(getLogFileName("OutLog", i, binaryFlag))):
+        Shard.setdefault(Entry[0], []).append((Entry[1], Entry[2], Entry[3], lineNumber))
+
+    return Shard
+
+
+# Matches every Out log entry sent to given target against its In log. OutEntries must be ordered by source PE, then by
+# line number, so every flow is accumulated in the same order as in the serial path. Returns the flow totals
+def matchInLogShard(target, OutEntries, debugFlag=0, histogramWidth=100, binaryFlag=False):
+
+    Index = InLogIndex()
+    Statistics = PlatformStatistics(histogramWidth)
+
+    for Entry in readLogEntries(getLogFileName("InLog", target, binaryFlag)):
+        pushFIFO(Index.Entries, Entry[0:4], Entry[4])
+
+    for src, size, outputTimestamp, lineNumber in OutEntries:
+
+        inputTimestamp = Index.popKey((target, src, size, outputTimestamp))
+
+        if inputTimestamp is not None:
+
+            currentLatency = inputTimestamp - outputTimestamp
+
+            if debugFlag == 1:
+                print("Found match for message " + str(lineNumber) + " sent by ID = " + str(src) + " to target " +
+                      str(target) + " with size " + str(size) + " with latency = " + str(currentLatency))
+
+            Statistics.addHit(src, target, currentLatency)
+
+        else:
+
+            Statistics.addMiss(src, target)
+
+            if debugFlag == 1:
+                print("No match found for message" + str(lineNumber) + " sent by ID = " + str(src) + " to target " +
+                      str(target) + " with size " + str(size))
+
+    return Statistics.getFlows()
+
+
+# Matches all logs on a pool of jobs processes. Out logs are parsed one shard per file and regrouped by target, then
+# each In log is matched against every Out log entry sent to its PE, one shard per file. A flow only ever lands in the
+# shard of its target, so partial results are merged without changing any value computed by the serial path
+def matchLogsInParallel(amountOfPEs, Statistics, jobs, debugFlag=0, binaryFlag=False):
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as Pool:
+
+        OutEntries = [[] for i in range(amountOfPEs)]
+        for Shard in Pool.map(loadOutLogShard, range(amountOfPEs), [binaryFlag] * amountOfPEs):
+            for target, Entries in Shard.items():
+                OutEntries[target].extend(Entries)
+
+        for Flows in Pool.map(matchInLogShard, range(amountOfPEs), OutEntries, [debugFlag] * amountOfPEs,
+                              [Statistics.histogramWidth] * amountOfPEs, [binaryFlag] * amountOfPEs):
+            for src, tgt, hits, misses, avgLatency, Distribution in Flows:
+                Statistics.addFlow(src, tgt, hits, misses, avgLatency, Distribution)
+
+
+# Matches logs while the simulation is still writing them. New lines are read from every log file each pollInterval
+# seconds and matched as they come, and a snapshot of delivery and latency statistics is printed every interval seconds.
+# Stops once no log grew for idleTimeout seconds (if given) or on Ctrl+C. Messages still in flight then count as lost
+def followLogs(amountOfPEs, Statistics, debugFlag=0, interval=10, idleTimeout=None, pollInterval=0.5, binaryFlag=False):
+
+    OutFollowers = [LogFollower(getLogFileName("OutLog", i, binaryFlag)) for i in range(amountOfPEs)]
+    InFollowers = [LogFollower(getLogFileName("InLog", i, binaryFlag)) for i in range(amountOfPEs)]
+
+    # Matches of the current interval are kept apart, then merged into Statistics at every snapshot
+    WindowStatistics = PlatformStatistics(Statistics.histogramWidth)
+    Matcher = StreamMatcher(WindowStatistics, debugFlag)
+    startTime = lastSnapshotTime = lastEntryTime = time.monotonic()
+    amountOfSentMessages = 0
+
+    try:
+
+        while True:
+
+            amountOfNewEntries = 0
+
+            for Follower in OutFollowers:
+                for lineNumber, Entry in Follower.readNewEntries():
+                    Matcher.addOutEntry(Entry, lineNumber)
+                    amountOfNewEntries += 1
+                    amountOfSentMessages += 1
+
+            for Follower in InFollowers:
+                for lineNumber, Entry in Follower.readNewEntries():
+                    Matcher.addInEntry(Entry)
+                    amountOfNewEntries += 1
+
+            currentTime = time.monotonic()
+
+            if amountOfNewEntries > 0:
+                lastEntryTime = currentTime
+
+            if currentTime - lastSnapshotTime >= interval:
+
+                printSnapshot(currentTime - startTime, currentTime - lastSnapshotTime, Statistics, WindowStatistics,
+                              amountOfSentMessages, len(Matcher))
+                Statistics.merge(WindowStatistics)
+                WindowStatistics = PlatformStatistics(Statistics.histogramWidth)
+                Matcher.Statistics = WindowStatistics
+                lastSnapshotTime = currentTime
+
+            if idleTimeout is not None and currentTime - lastEntryTime >= idleTimeout:
+                print("\nNo log grew for " + str(idleTimeout) + " s, stopping")
+                break
+
+            if amountOfNewEntries == 0:
+                time.sleep(pollInterval)
+
+    except KeyboardInterrupt:
+        print("\nInterrupted, stopping")
+
+    Statistics.merge(WindowStatistics)
+
+    if len(Matcher) > 0:
+        print(str(len(Matcher)) + " messages still in flight are counted as lost")
+
+    Matcher.Statistics = Statistics
+    Matcher.finish()
+
+
+# Prints a one line summary of matches so far, followed by the latency distribution of messages delivered during the
+# last windowLength seconds
+def printSnapshot(elapsedTime, windowLength, Statistics, WindowStatistics, amountOfSentMessages, amountInFlight):
+
+    amountOfDeliveredMessages = sum(Flow.hitCount for Flow in Statistics.Flows.values())
+    amountOfWindowMessages = sum(Flow.hitCount for Flow in WindowStatistics.Flows.values())
+
+    print("[" + str(round(elapsedTime)) + " s] Sent: " + str(amountOfSentMessages) + " ; Delivered: " +
+          str(amountOfDeliveredMessages + amountOfWindowMessages) + " ; In flight: " + str(amountInFlight) +
+          " ; Last " + str(round(windowLength)) + " s: " + str(amountOfWindowMessages) + " delivered, latency " +
+          "(p50 / p90 / p99 / p99.9 / max / jitter) = " +
+          formatDistribution(WindowStatistics.getPlatformDistribution()) + " ns")
+
+
 #                                                     Entry Point
 ########################################################################################################################
 
 
-# Expects as arguments: $1 = amount of PEs in network ; $2 = Debug flag
+# Expects as arguments: $1 = amount of PEs in network ; $2 = Debug flag ; [--stream | --columnar | --follow] ;
+#                       [--interval s] ; [--idle-timeout s] ; [--chunk-size bytes] ; [--jobs N] ; [--binary] ;
+#                       [--histogram-width ns] ; [--json file] ; [--csv file] ; [--cache directory] ; [--cache-size MB]
 def main():
 
     # Sets argument values
-    import sys
-    amountOfPEs = int(sys.argv[1])
-    debugFlag = int(sys.argv[2])
+    import argparse
+    parser = argparse.ArgumentParser(description="Matches Injector Out logs against Receiver In logs")
+    parser.add_argument("amountOfPEs", type=int, help="amount of PEs in network")
+    parser.add_argument("debugFlag", type=int, help="1 prints out every log entry and match")
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument("--stream", action="store_true",
+                         help="read logs lazily, holding only messages still in flight in memory")
+    backend.add_argument("--columnar", action="store_true",
+                         help="load logs into NumPy arrays and match them with vectorized operations")
+    backend.add_argument("--follow", action="store_true",
+                         help="match logs while the simulation is still writing them, printing periodic snapshots")
+    parser.add_argument("--interval", type=float, default=10,
+                        help="seconds between two snapshots in --follow mode")
+    parser.add_argument("--idle-timeout", type=float, dest="idleTimeout",
+                        help="stop --follow mode once no log grew for given amount of seconds (default: until Ctrl+C)")
+    parser.add_argument("--chunk-size", type=int, default=1 << 16, dest="chunkSize",
+                        help="amount of bytes read from each log file at a time in --stream mode (every log file is "
+                             "read at once, so 2 x amountOfPEs chunks are held in memory)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="amount of processes loading and matching logs (one shard per PE log file)")
+    parser.add_argument("--binary", action="store_true", dest="binaryFlag",
+                        help="read InLog<i>.bin/OutLog<i>.bin binary logs (see BinaryLogs.py) instead of text logs")
+    parser.add_argument("--histogram-width", type=int, default=100, dest="histogramWidth",
+                        help="width of latency histogram buckets, in ns")
+    parser.add_argument("--json", dest="JSONFileName", help="also write statistics to given JSON file")
+    parser.add_argument("--csv", dest="CSVFileName", help="also write statistics to given CSV file")
+    parser.add_argument("--cache", dest="cacheDirectory",
+                        help="keep parsed logs and statistics in given directory, reused while logs are unchanged")
+    parser.add_argument("--cache-size", type=int, default=1024, dest="cacheSize",
+                        help="maximum size of --cache directory, in MB (least recently used entries are evicted)")
+    args = parser.parse_args()
+    amountOfPEs = args.amountOfPEs
+    debugFlag = args.debugFlag
+
+    if args.jobs > 1 and (args.stream or args.columnar or args.follow):
+        parser.error("--jobs is only supported by the default back end")
+
+    if args.follow and args.cacheDirectory is not None:
+        parser.error("--cache can't be used with --follow, as logs are still being written")
+
+    Statistics = PlatformStatistics(args.histogramWidth)
+    Cache = None
+    statisticsKey = None
+
+    if args.cacheDirectory is not None:
+
+        from LogCache import LogCache
+        Cache = LogCache(args.cacheDirectory, args.cacheSize << 20)
+
+        # Statistics of unchanged logs are reused as is, unless every entry and match must be printed out
+        LogFileNames = [getLogFileName(logName, i, args.binaryFlag) for logName in ("InLog", "OutLog")
+                        for i in range(amountOfPEs)]
+        backend = "stream" if args.stream else "columnar" if args.columnar else "default"
+        statisticsKey = Cache.getKey("Statistics", LogFileNames, backend, args.histogramWidth)
+        CachedStatistics = Cache.load(statisticsKey) if debugFlag != 1 else None
+
+        if CachedStatistics is not None:
+            reportStatistics(CachedStatistics, args, Cache)
+            return
+
+    if args.follow:
+        followLogs(amountOfPEs, Statistics, debugFlag, args.interval, args.idleTimeout, binaryFlag=args.binaryFlag)
+        reportStatistics(Statistics, args)
+        return
+
+    if args.jobs > 1:
+        matchLogsInParallel(amountOfPEs, Statistics, args.jobs, debugFlag, args.binaryFlag)
+        reportStatistics(Statistics, args, Cache, statisticsKey)
+        return
+
+    if args.stream:
+        streamLogs(amountOfPEs, Statistics, debugFlag, args.chunkSize, args.binaryFlag)
+        reportStatistics(Statistics, args, Cache, statisticsKey)
+        return
+
+    if args.columnar:
+
+        try:
+            import ColumnarLogs
+        except ImportError:
+            ColumnarLogs = None
+            print("Warning: --columnar requires NumPy to be installed, matching logs with the default back end")
+
+        if ColumnarLogs is not None:
+
+            InLog, OutLog = ColumnarLogs.loadLogs(amountOfPEs, args.binaryFlag)
+            for src, tgt, hits, misses, avgLatency, Distribution in zip(*ColumnarLogs.computeFlowStatistics(
+                    amountOfPEs, InLog, OutLog, args.histogramWidth)):
+                Statistics.addFlow(int(src), int(tgt), int(hits), int(misses), float(avgLatency), Distribution)
+
+            reportStatistics(Statistics, args, Cache, statisticsKey)
+            return
 
     # Inits variables
     InLogs = [None for i in range(amountOfPEs)]
     OutLogs = [None for i in range(amountOfPEs)]
-    avgLatencies = [[0 for i in range(amountOfPEs)] for j in range(amountOfPEs)]
-    avgLatenciesCounters = [[0 for i in range(amountOfPEs)] for j in range(amountOfPEs)]
-    missCount = [[0 for i in range(amountOfPEs)] for j in range(amountOfPEs)]
-    hitCount = [[0 for i in range(amountOfPEs)] for j in range(amountOfPEs)]
 
-    # Builds Log objects from text files
-    for i in range(amountOfPEs):
+    if Cache is not None:
+
+        # Builds Log objects from cached entries, parsing only logs that are not cached yet
+        for i in range(amountOfPEs):
+
+            InLogs[i] = Log("Input")
+            OutLogs[i] = Log("Output")
+
+            for Entry in Cache.getLogEntries(getLogFileName("InLog", i, args.binaryFlag), parseLogEntries):
+                InLogs[i].addEntry(Message.fromEntry(Entry))
+
+            for Entry in Cache.getLogEntries(getLogFileName("OutLog", i, args.binaryFlag), parseLogEntries):
+                OutLogs[i].addEntry(Message.fromEntry(Entry))
+
+    elif args.binaryFlag:
+
+        # Builds Log objects from binary files
+        for i in range(amountOfPEs):
+
+            InLogs[i] = Log("Input")
+            OutLogs[i] = Log("Output")
+
+            for Entry in readLogEntries(getLogFileName("InLog", i, True)):
+                InLogs[i].addEntry(Message.fromEntry(Entry))
 
-        # Open log text files
-        InLogFile = open("InLog" + str(i) + ".txt", 'r')
-        OutLogFile = open("OutLog" + str(i) + ".txt", 'r')
+            for Entry in readLogEntries(getLogFileName("OutLog", i, True)):
+                OutLogs[i].addEntry(Message.fromEntry(Entry))
 
-        # Add log object to container
-        InLogs[i] = Log("Input")
-        OutLogs[i] = Log("Output")
+    else:
 
-        # Add entries (as Message objects) to Input log
-        for inLine in InLogFile.readlines():
-            InLogs[i].addEntry(Message(inLine))
+        # Builds Log objects from text files
+        for i in range(amountOfPEs):
+
+            # Open log text files
+            InLogFile = open("InLog" + str(i) + ".txt", 'r')
+            OutLogFile = open("OutLog" + str(i) + ".txt", 'r')
+
+            # Add log object to container
+            InLogs[i] = Log("Input")
+            OutLogs[i] = Log("Output")
+
+            # Add entries (as Message objects) to Input log
+            for inLine in InLogFile.readlines():
+                InLogs[i].addEntry(Message(inLine))
 
-        # Add entries (as Message objects) to Output log
-        for outLine in OutLogFile.readlines():
-            OutLogs[i].addEntry(Message(outLine))
+            # Add entries (as Message objects) to Output log
+            for outLine in OutLogFile.readlines():
+                OutLogs[i].addEntry(Message(outLine))
 
-        # Close files
-        InLogFile.close()
-        OutLogFile.close()
+            # Close files
+            InLogFile.close()
+            OutLogFile.close()
 
     # Prints out Log objects if debug flag is active
     if debugFlag == 1:
@@ -124,6 +861,11 @@ def main():
             print("\t\tOut log " + str(i) + "\n")
             print(OutLogs[i])
 
+    # Indexes every In log once, so each Out log entry is matched by a single lookup
+    InLogIndexes = [InLogIndex() for i in range(amountOfPEs)]
+    for i in range(amountOfPEs):
+        InLogIndexes[i].addLog(InLogs[i])
+
     # Tries to find an In log entry match for every Out log entry
     for i in range(amountOfPEs):
 
@@ -133,60 +875,49 @@ def main():
         for j in range(len(currentOutLog.Entries)):
 
             currentOutEntry = currentOutLog.Entries[j]
-            currentTarget = currentOutEntry.TargetID
-            currentInLog = InLogs[currentTarget]
-            foundFlag = False
-
-            # Loop through all entries of current In log, compares each of them to current message in current Out log
-            for k in range(len(currentInLog.Entries)):
-
-                currentInEntry = currentInLog.Entries[k]
+            currentInputTimestamp = InLogIndexes[currentOutEntry.TargetID].popMatch(currentOutEntry)
 
-                if currentOutEntry == currentInEntry:
+            if currentInputTimestamp is not None:
 
-                    # Found match for current message
-                    currentLatency = currentInEntry.InputTimestamp - currentOutEntry.OutputTimestamp
+                # Found match for current message
+                currentLatency = currentInputTimestamp - currentOutEntry.OutputTimestamp
 
-                    if debugFlag == 1:
-                        print("Found match for message " + str(j) + " sent by ID = " +
-                            str(currentOutEntry.SourceID) + " to target " + str(currentOutEntry.TargetID) +
-                            " with size " + str(currentOutEntry.MessageSize) + " with latency = " + str(currentLatency))
-                    foundFlag = True
+                if debugFlag == 1:
+                    print("Found match for message " + str(j) + " sent by ID = " +
+                        str(currentOutEntry.SourceID) + " to target " + str(currentOutEntry.TargetID) +
+                        " with size " + str(currentOutEntry.MessageSize) + " with latency = " + str(currentLatency))
 
-                    # Update average latency value (https://blog.demofox.org/2016/08/23/incremental-averaging/)
-                    src = currentOutEntry.SourceID
-                    tgt = currentOutEntry.TargetID
-                    avgLatenciesCounters[src][tgt] += 1
-                    avgLatencies[src][tgt] += (currentLatency - avgLatencies[src][tgt]) / avgLatenciesCounters[src][tgt]
-                    hitCount[src][tgt] += 1
+                Statistics.addHit(currentOutEntry.SourceID, currentOutEntry.TargetID, currentLatency)
 
-                    break
+            else:
 
-            if not foundFlag:
-                missCount[currentOutEntry.SourceID][currentOutEntry.TargetID] += 1
+                Statistics.addMiss(currentOutEntry.SourceID, currentOutEntry.TargetID)
 
                 if debugFlag == 1:
                     print("No match found for message" + str(j) + " sent by ID = " + str(currentOutEntry.SourceID) +
                           " to target " + str(currentOutEntry.TargetID) + " with size " + str(currentOutEntry.MessageSize))
 
-    # Prints out amount of successfully delivered messages
-    print("\n\tSuccessfully Delivered Messages")
-    for target in range(amountOfPEs):
-        for source in range(amountOfPEs):
-            if hitCount[source][target] + missCount[source][target] > 0:
-                print("Messages successfully delivered from " + str(source) + " to " + str(target) + ": " +
-                      str(hitCount[source][target]) + "/" + str(hitCount[source][target] + missCount[source][target]))
+    reportStatistics(Statistics, args, Cache, statisticsKey)
+
+
+# Prints out statistics summary, then exports statistics to the files given as arguments. Statistics are also cached
+# under statisticsKey, if given
+def reportStatistics(Statistics, args, Cache=None, statisticsKey=None):
+
+    Statistics.printSummary()
+
+    if args.JSONFileName is not None:
+        Statistics.exportJSON(args.JSONFileName)
+
+    if args.CSVFileName is not None:
+        Statistics.exportCSV(args.CSVFileName)
 
-    # Prints out average latency values
-    print("\n\tAverage Latency Values:")
-    for target in range(amountOfPEs):
-        for source in range(amountOfPEs):
-            if avgLatencies[source][target] != 0:
-                print("Average latency from PE ID " + str(source) + " to PE ID " + str(target) + " = " + str(
-                      avgLatencies[source][target]) + " ns")
+    if Cache is not None:
 
+        if statisticsKey is not None:
+            Cache.store(statisticsKey, Statistics)
 
-    print("")
+        Cache.save()
 
 # Forces entry point
 if __name__ == "__main__":
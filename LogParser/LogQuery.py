@@ -0,0 +1,265 @@
+import os
+import mmap
+from array import array
+from collections import deque
+from LogParser import Message
+
+
+#                                                  Class Definitions
+########################################################################################################################
+
+
+class LazyLog:
+
+    # Constructor (the file is only opened, mapped and indexed when first touched)
+    def __init__(self, FileName, isInputLog):
+
+        self.FileName = FileName
+        self.isInputLog = isInputLog
+        self.File = None
+        self.Map = None
+        self.LineOffsets = None
+
+        # Field lines are ordered by: input timestamp for In logs, output timestamp for Out logs
+        self.timestampField = 4 if isInputLog else 3
+
+    # Maps log file into memory and builds its line offset index
+    def open(self):
+
+        if self.LineOffsets is not None:
+            return
+
+        self.File = open(self.FileName, 'rb')
+
+        if os.path.getsize(self.FileName) == 0:
+            self.LineOffsets = array('q', [0])
+            return
+
+        self.Map = mmap.mmap(self.File.fileno(), 0, access=mmap.ACCESS_READ)
+        self.LineOffsets = self.indexLines()
+
+    # Returns start offset of every line, followed by the end offset of the last one
+    def indexLines(self):
+
+        try:
+            import numpy as np
+            NewLines = np.frombuffer(self.Map, dtype=np.uint8) == ord("\n")
+            LineOffsets = array('q', (np.flatnonzero(NewLines) + 1).tolist())
+            del NewLines
+        except ImportError:
+            LineOffsets = array('q')
+            position = self.Map.find(b"\n")
+            while position != -1:
+                LineOffsets.append(position + 1)
+                position = self.Map.find(b"\n", position + 1)
+
+        # A last line without a trailing new line still counts
+        if len(LineOffsets) == 0 or LineOffsets[-1] != len(self.Map):
+            LineOffsets.append(len(self.Map))
+
+        LineOffsets.insert(0, 0)
+        return LineOffsets
+
+    def close(self):
+
+        if self.Map is not None:
+            self.Map.close()
+
+        if self.File is not None:
+            self.File.close()
+
+        self.File = None
+        self.Map = None
+        self.LineOffsets = None
+
+    def __len__(self):
+
+        self.open()
+        return len(self.LineOffsets) - 1
+
+    # Returns raw bytes of line i
+    def getLine(self, i):
+
+        self.open()
+        return self.Map[self.LineOffsets[i]:self.LineOffsets[i + 1]]
+
+    # Returns line i as a Message object
+    def getEntry(self, i):
+        return Message(self.getLine(i).decode())
+
+    # Returns the timestamp lines are ordered by (input timestamp for In logs, output timestamp for Out logs) of line i,
+    # None if the line has too few fields (e.g. a blank line)
+    def getTimestamp(self, i):
+
+        Fields = self.getLine(i).split()
+
+        return int(Fields[self.timestampField]) if len(Fields) > self.timestampField else None
+
+    # Returns index of the first line with a timestamp >= given timestamp, parsing only log2(lines) of them. Lines with
+    # too few fields are skipped, the next line being parsed instead
+    def findFirstLine(self, timestamp):
+
+        low = 0
+        high = len(self)
+
+        while low < high:
+
+            middle = (low + high) // 2
+
+            line = middle
+            lineTimestamp = self.getTimestamp(line)
+            while lineTimestamp is None and line + 1 < high:
+                line += 1
+                lineTimestamp = self.getTimestamp(line)
+
+            # Lines from middle to the next one with a timestamp are skipped along with it
+            if lineTimestamp is not None and lineTimestamp < timestamp:
+                low = line + 1
+            else:
+                high = middle
+
+        return low
+
+    # Returns Message objects of every line with a timestamp in [ startTime, endTime ] (None meaning unbounded), for
+    # which the given field (0 = target ID, 1 = source ID) is equal to given ID, if any
+    def getEntries(self, startTime=None, endTime=None, field=None, ID=None):
+
+        Entries = []
+        IDBytes = str(ID).encode() if ID is not None else None
+
+        for i in range(self.findFirstLine(startTime) if startTime is not None else 0, len(self)):
+
+            Fields = self.getLine(i).split()
+
+            if len(Fields) == 0:
+                continue
+
+            if endTime is not None and int(Fields[self.timestampField]) > endTime:
+                break
+
+            if IDBytes is None or Fields[field] == IDBytes:
+                Entries.append(Message(self.getLine(i).decode()))
+
+        return Entries
+
+
+class LogQuery:
+
+    # Constructor. Log files of each PE are only opened when a query touches them
+    def __init__(self, Directory="."):
+
+        self.Directory = Directory
+        self.InLogs = dict()
+        self.OutLogs = dict()
+
+    def getInLog(self, PE):
+
+        if PE not in self.InLogs:
+            self.InLogs[PE] = LazyLog(os.path.join(self.Directory, "InLog" + str(PE) + ".txt"), True)
+
+        return self.InLogs[PE]
+
+    def getOutLog(self, PE):
+
+        if PE not in self.OutLogs:
+            self.OutLogs[PE] = LazyLog(os.path.join(self.Directory, "OutLog" + str(PE) + ".txt"), False)
+
+        return self.OutLogs[PE]
+
+    # Returns messages sent by source PE (to target PE, if given) with an output timestamp in [ startTime, endTime ]
+    def getSentMessages(self, source, target=None, startTime=None, endTime=None):
+        return self.getOutLog(source).getEntries(startTime, endTime, 0, target)
+
+    # Returns messages received by target PE (from source PE, if given) with an input timestamp in [ startTime, endTime ]
+    def getReceivedMessages(self, target, source=None, startTime=None, endTime=None):
+        return self.getInLog(target).getEntries(startTime, endTime, 1, source)
+
+    # Returns every message sent from source PE to target PE with an output timestamp in [ startTime, endTime ], as
+    # ( Out log Message, In log Message ) tuples. The In log Message is None for messages that never arrived. Only the
+    # Out log of source and the In log of target are read, the latter starting at the first message received after
+    # startTime and stopping as soon as every sent message is matched. A message that never arrived makes the scan read
+    # the In log up to its end, unless maxLatency (in ns) is given: messages not received within maxLatency of the last
+    # sent one are then taken as lost, and the scan stops at input timestamps past that
+    def getFlowMessages(self, source, target, startTime=None, endTime=None, maxLatency=None):
+
+        SentMessages = self.getSentMessages(source, target, startTime, endTime)
+
+        # Maps ( msg size, output timestamp ) to indexes of sent messages still waiting for a match, in FIFO order
+        PendingMessages = dict()
+        for i, SentMessage in enumerate(SentMessages):
+            PendingMessages.setdefault((SentMessage.MessageSize, SentMessage.OutputTimestamp), deque()).append(i)
+
+        ReceivedMessages = [None for i in range(len(SentMessages))]
+        amountOfPendingMessages = len(SentMessages)
+
+        InLog = self.getInLog(target)
+        sourceBytes = str(source).encode()
+
+        # Out log lines are ordered by output timestamp, so the last sent message was sent last
+        lastInputTime = SentMessages[-1].OutputTimestamp + maxLatency \
+            if maxLatency is not None and len(SentMessages) > 0 else None
+
+        for i in range(InLog.findFirstLine(startTime) if startTime is not None else 0, len(InLog)):
+
+            if amountOfPendingMessages == 0:
+                break
+
+            Fields = InLog.getLine(i).split()
+
+            if len(Fields) < 5:
+                continue
+
+            if lastInputTime is not None and int(Fields[4]) > lastInputTime:
+                break
+
+            if Fields[1] != sourceBytes:
+                continue
+
+            Indexes = PendingMessages.get((int(Fields[2]), int(Fields[3])))
+
+            if Indexes:
+                ReceivedMessages[Indexes.popleft()] = InLog.getEntry(i)
+                amountOfPendingMessages -= 1
+
+        return list(zip(SentMessages, ReceivedMessages))
+
+    def close(self):
+
+        for Log in list(self.InLogs.values()) + list(self.OutLogs.values()):
+            Log.close()
+
+
+#                                                     Entry Point
+########################################################################################################################
+
+
+# Expects as arguments: $1 = source PE ; $2 = target PE ; [$3 = start time] ; [$4 = end time] ; [$5 = max latency]
+# (in ns)
+def main():
+
+    import sys
+    source = int(sys.argv[1])
+    target = int(sys.argv[2])
+    startTime = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    endTime = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    maxLatency = int(sys.argv[5]) if len(sys.argv) > 5 else None
+
+    Query = LogQuery()
+
+    for SentMessage, ReceivedMessage in Query.getFlowMessages(source, target, startTime, endTime, maxLatency):
+
+        if ReceivedMessage is not None:
+            print("Message sent by ID = " + str(source) + " to target " + str(target) + " with size " +
+                  str(SentMessage.MessageSize) + " at " + str(SentMessage.OutputTimestamp) + " ns, received at " +
+                  str(ReceivedMessage.InputTimestamp) + " ns (latency = " +
+                  str(ReceivedMessage.InputTimestamp - SentMessage.OutputTimestamp) + " ns)")
+        else:
+            print("Message sent by ID = " + str(source) + " to target " + str(target) + " with size " +
+                  str(SentMessage.MessageSize) + " at " + str(SentMessage.OutputTimestamp) + " ns, never received")
+
+    Query.close()
+
+
+# Forces entry point
+if __name__ == "__main__":
+    main()
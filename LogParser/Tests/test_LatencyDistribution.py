@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from LatencyDistribution import LatencySketch, LatencyDistribution
+
+
+class LatencyQuantileTest(unittest.TestCase):
+
+    # Quantiles are estimates within the relative accuracy of the sketch (1 %)
+    def assertEstimate(self, estimate, value, relativeAccuracy=0.01):
+        self.assertLessEqual(abs(estimate - value), relativeAccuracy * value)
+
+    def test_tail_quantiles_of_two_values_are_max(self):
+
+        Distribution = LatencyDistribution()
+        for latency in (12, 28):
+            Distribution.add(latency)
+
+        self.assertEstimate(Distribution.getQuantile(0.5), 12)
+        for q in (0.9, 0.99, 0.999):
+            self.assertEstimate(Distribution.getQuantile(q), Distribution.maxLatency)
+
+    def test_nearest_rank_quantiles(self):
+
+        Sketch = LatencySketch()
+        for latency in range(1, 101):
+            Sketch.add(latency)
+
+        self.assertEstimate(Sketch.getQuantile(0.5), 50)
+        self.assertEstimate(Sketch.getQuantile(0.9), 90)
+        self.assertEstimate(Sketch.getQuantile(0.99), 99)
+        self.assertEstimate(Sketch.getQuantile(1), 100)
+        self.assertEstimate(Sketch.getQuantile(0), 1)
+
+    def test_p99_of_single_outlier_is_max(self):
+
+        Distribution = LatencyDistribution()
+        for latency in [20] * 99 + [500]:
+            Distribution.add(latency)
+
+        self.assertEstimate(Distribution.getQuantile(0.99), 20)
+        self.assertEstimate(Distribution.getQuantile(0.999), Distribution.maxLatency)
+
+    def test_zero_latencies(self):
+
+        Sketch = LatencySketch()
+        for latency in (0, 0, 10):
+            Sketch.add(latency)
+
+        self.assertEqual(Sketch.getQuantile(0.5), 0)
+        self.assertEstimate(Sketch.getQuantile(0.99), 10)
+
+
+# Forces entry point
+if __name__ == "__main__":
+    unittest.main()